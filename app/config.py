@@ -4,13 +4,71 @@ from typing import Optional
 
 class Settings(BaseSettings):
     # Database
-    DATABASE_URL: str
-    DB_NAME: str
+    DATABASE_URL: str = "sqlite:///./test.db"
+    DB_NAME: str = "test.db"
+    
+    # Database engine profile (пул соединений)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite PRAGMA, применяются при каждом новом соединении
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # отрицательное значение - размер в KiB
+    SQLITE_BUSY_TIMEOUT: int = 5000  # мс
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    
+    # Итог корзины: True - читать денормализованные carts.total/item_count,
+    # False - считать SUM() по cart_items на каждый запрос
+    CART_DENORMALIZED_TOTALS: bool = True
+    CART_ID_CACHE_SIZE: int = 10000  # user_id -> cart_id в памяти процесса
+    # Число избранного: True - вести user_favorite_counts при добавлении/удалении
+    # и читать счётчик одной строкой по первичному ключу, False - SELECT COUNT(*)
+    FAVORITES_COUNTER_TABLE: bool = True
+    
+    # Read-through кэш каталога (app/utils/cache.py)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_SIZE: int = 1024  # записей
+    CACHE_TTL: int = 60  # с
+    CACHE_STALE_TTL: int = 30  # с, сколько отдавать просроченную горячую запись
+    CACHE_HOT_HITS: int = 3  # попаданий, после которых ключ считается горячим
+    # Множества избранного пользователя для флагов is_favorited (зритель каталога с токеном доступа)
+    FAVORITE_SET_CACHE_SIZE: int = 1000  # пользователей
+    FAVORITE_SET_CACHE_TTL: int = 30  # с
+    
+    # Чат поддержки: очередь исходящих сообщений на WebSocket-подключение,
+    # при переполнении медленный клиент отключается (app/utils/chat_hub.py)
+    CHAT_WS_QUEUE_SIZE: int = 100
+    # Холодный архив чата (app/services/chat_archive_service.py): сообщения старше
+    # CHAT_ARCHIVE_AFTER_DAYS переносятся в сжатые сегменты chat_archive пачками
+    # по CHAT_ARCHIVE_BATCH_SIZE - одна транзакция на пачку. Фоновая архивация
+    # включается явно (CHAT_ARCHIVE_ENABLED=true): перенесённые сообщения пропадают из
+    # /chat/user/{user_id}/conversation и доступны через /chat/user/{user_id}/archive
+    CHAT_ARCHIVE_ENABLED: bool = False
+    CHAT_ARCHIVE_AFTER_DAYS: int = 90
+    CHAT_ARCHIVE_BATCH_SIZE: int = 500
+    CHAT_ARCHIVE_INTERVAL: int = 3600  # с, период фоновой архивации
+    
+    # bcrypt в пуле процессов (app/utils/password_hasher.py): одновременно не больше
+    # PASSWORD_HASH_WORKERS вызовов, ожидающих - до PASSWORD_HASH_MAX_QUEUE, дальше 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    # Частота попыток входа (app/utils/rate_limit.py), сверх - 429 с Retry-After
+    LOGIN_ATTEMPTS_PER_EMAIL: int = 5
+    LOGIN_ATTEMPTS_PER_IP: int = 30
+    LOGIN_THROTTLE_WINDOW: int = 60  # с
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Справочник ролей в памяти; при нескольких воркерах записи других воркеров
+    # подхватываются фоновым перечитыванием
+    ROLE_REGISTRY_REFRESH_INTERVAL: int = 60  # с
     
     # API
     API_HOST: str = "0.0.0.0"
@@ -35,12 +93,43 @@ class Settings(BaseSettings):
     
     @property
     def get_db_url(self):
-        # Если используете SQLite через SQLAlchemy
+        # DATABASE_URL с асинхронным драйвером: для SQLite меняется только схема,
+        # путь (в том числе :memory: и абсолютный) остаётся как есть
         if self.DATABASE_URL.startswith("sqlite://"):
-            # Преобразуем формат для SQLAlchemy
-            return f"sqlite+aiosqlite:///{self.DATABASE_URL.replace('sqlite:///', '')}"
+            return self.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
         return self.DATABASE_URL
 
+    @property
+    def is_sqlite(self) -> bool:
+        return self.DATABASE_URL.startswith("sqlite")
+
+    @property
+    def engine_options(self) -> dict:
+        """Параметры пула для create_engine / create_async_engine"""
+        options = {
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+        }
+        if ":memory:" not in self.DATABASE_URL:
+            options.update(
+                pool_size=self.DB_POOL_SIZE,
+                max_overflow=self.DB_MAX_OVERFLOW,
+                pool_timeout=self.DB_POOL_TIMEOUT,
+            )
+        return options
+
+    @property
+    def sqlite_pragmas(self) -> dict:
+        """PRAGMA-профиль SQLite в порядке применения"""
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+            "temp_store": self.SQLITE_TEMP_STORE,
+        }
+
     @property
     def auth_data(self):
         return {"secret_key": self.SECRET_KEY, "algorithm": self.ALGORITHM}
@@ -0,0 +1,19 @@
+"""
+Перенос сообщений чата старше CHAT_ARCHIVE_AFTER_DAYS (или указанного числа дней)
+в сжатый архив chat_archive - то же, что делает фоновая задача приложения.
+Запуск: python -m app.database.archive_chat [дней]
+"""
+
+import sys
+
+from app.services.chat_archive_service import archive_chat_messages
+
+
+def main(days: int = None) -> int:
+    archived = archive_chat_messages(days)
+    print(f"chat_archive: {archived} сообщений перенесено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,49 @@
+"""
+Бэкфилл денормализованных таблиц, которые Base.metadata.create_all создаёт пустыми:
+rating_summary (из review) и user_favorite_counts (из favorite). Миграции Alembic
+заполняют их сами; при запуске без миграций приложение на старте пересобирает
+пустую таблицу, если исходные данные уже есть.
+Запуск (пересобрать обе таблицы): python -m app.database.backfill
+"""
+
+import logging
+import sys
+from typing import Dict
+
+from app.config import settings
+from app.database.database import SessionLocal
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.rating_summary_repository import RatingSummaryRepository
+from app.repositories.review_repository import ReviewRepository
+from app.services.favorite_service import FavoriteService
+from app.services.review_service import ReviewService
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_counter_tables(force: bool = False) -> Dict[str, int]:
+    """Пересобрать пустые (или, с force, все) таблицы; возвращает {таблица: число строк}"""
+    rebuilt = {}
+    with SessionLocal() as db:
+        rating_summary_repository = RatingSummaryRepository(db)
+        if force or rating_summary_repository.needs_backfill():
+            review_service = ReviewService(ReviewRepository(db), rating_summary_repository)
+            rebuilt["rating_summary"] = review_service.rebuild_rating_summaries()
+
+        favorite_repository = FavoriteRepository(db)
+        if settings.FAVORITES_COUNTER_TABLE and (force or favorite_repository.user_counts_need_backfill()):
+            rebuilt["user_favorite_counts"] = FavoriteService(favorite_repository).rebuild_user_counts()
+
+    for table, rows in rebuilt.items():
+        logger.info("%s: %s rows rebuilt", table, rows)
+    return rebuilt
+
+
+def main() -> int:
+    for table, rows in backfill_counter_tables(force=True).items():
+        print(f"{table}: {rows} строк пересобрано")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,56 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-import os
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Generator
 from dotenv import load_dotenv
+from app.config import settings
 
 # Загружаем переменные окружения
 load_dotenv()
 
 # Получаем настройки базы данных из переменных окружения
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "sqlite:///./test.db"  # Значение по умолчанию для SQLite
-)
+DATABASE_URL = settings.DATABASE_URL
+
+
+# Тот же URL с асинхронным драйвером - его же использует alembic (migrations/env.py)
+ASYNC_DATABASE_URL = settings.get_db_url
 
 # Создаем движок базы данных
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    **settings.engine_options
 )
 
 # Создаем фабрику сессий
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Асинхронный движок и фабрика сессий для async-обработчиков
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **settings.engine_options)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Применяет PRAGMA-профиль из настроек к новому соединению SQLite"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in settings.sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+if settings.is_sqlite:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+async_session_maker = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Базовый класс для моделей
 Base = declarative_base()
@@ -45,6 +74,76 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Зависимость для получения асинхронной сессии базы данных.
+    
+    Использование:
+    ```
+    async def some_endpoint(db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(select(SomeModel))
+    ```
+    """
+    async with async_session_maker() as db:
+        yield db
+
+
+# Флаг в Session.info: внутри единицы работы репозитории делают только flush,
+# а единственный commit выполняет владелец транзакции
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+def in_unit_of_work(db) -> bool:
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Generator[Session, None, None]:
+    """
+    Объединяет несколько операций репозиториев в одну транзакцию.
+    
+    Использование:
+    ```
+    with unit_of_work(db):
+        repository.create(...)
+        repository.update(...)
+    # один commit здесь
+    ```
+    """
+    if in_unit_of_work(db):
+        # Вложенный вызов - коммитит внешняя единица работы
+        yield db
+        return
+    
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """Асинхронный вариант unit_of_work для AsyncSession"""
+    if in_unit_of_work(db):
+        yield db
+        return
+    
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+
+
 def create_tables():
     """Создает все таблицы в базе данных"""
     Base.metadata.create_all(bind=engine)
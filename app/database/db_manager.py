@@ -1,18 +1,26 @@
-from app.database.database import async_session_maker
-from app.repositories.roles import RolesRepository
-from app.repositories.users import UsersRepository
+from typing import AsyncGenerator
+from app.database.database import async_session_maker, UNIT_OF_WORK_KEY
+from app.repositories.cart_repository import CartRepository
+from app.repositories.cart_item_repository import CartItemRepository
+from app.repositories.product_repository import AsyncProductRepository
 
 
 class DBManager:
+    """
+    Единица работы на запрос: репозитории внутри только делают flush,
+    изменения фиксируются одним вызовом commit(), а незафиксированные
+    откатываются при выходе.
+    """
+
     def __init__(self, session_factory: async_session_maker): # type: ignore
         self.session_factory = session_factory
 
     async def __aenter__(self):
         self.session = self.session_factory()
-        # TODO Добавить сюда созданные репозитории
-        # Пример:
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
+        self.session.info[UNIT_OF_WORK_KEY] = True
+        self.carts = CartRepository(self.session)
+        self.cart_items = CartItemRepository(self.session)
+        self.products = AsyncProductRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
@@ -21,3 +29,13 @@ class DBManager:
 
     async def commit(self):
         await self.session.commit()
+
+
+
+async def get_db_manager() -> AsyncGenerator[DBManager, None]:
+    """
+    Зависимость FastAPI: DBManager на время запроса.
+    Обработчик обязан вызвать `await db.commit()` перед возвратом ответа.
+    """
+    async with DBManager(async_session_maker) as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Пересборка rating_summary по таблице review: бэкфилл после миграции
+или восстановление после ручных правок отзывов в БД.
+Запуск: python -m app.database.rebuild_rating_summary
+"""
+
+import sys
+
+from app.database.database import SessionLocal
+from app.repositories.rating_summary_repository import RatingSummaryRepository
+from app.repositories.review_repository import ReviewRepository
+from app.services.review_service import ReviewService
+
+
+def main() -> int:
+    with SessionLocal() as db:
+        summaries = ReviewService(ReviewRepository(db), RatingSummaryRepository(db)).rebuild_rating_summaries()
+    print(f"rating_summary: {summaries} сводок пересобрано")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,43 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from app.database.database import get_db
-from app.models.users import UserModel
+from app.repositories.cart_item_repository import SyncCartItemRepository
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.rating_summary_repository import RatingSummaryRepository
+from app.repositories.review_repository import ReviewRepository
+from app.services.favorite_service import FavoriteService
+from app.services.review_service import ReviewService
+from app.services.viewer_state_service import ViewerStateService
+from app.utils.tokens import TokenUser, get_token_user
 
 
-# Зависимость для получения текущего пользователя из заголовка
-def get_current_user(user_id: int = None, db: Session = Depends(get_db)) -> UserModel:
+# Зависимость для получения текущего пользователя из токена доступа
+def get_current_user(request: Request) -> TokenUser:
     """
-    Получает текущего пользователя. 
-    В реальной системе нужно получать из JWT токена.
-    Пока для тестирования передаем user_id в запросе.
+    Получает текущего пользователя из заголовка Authorization: Bearer <token>
+    (выдаётся POST /users/authenticate). Подпись и срок проверяются в процессе,
+    без запросов к БД; без токена или с недействительным токеном - 401.
     """
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User ID required"
-        )
-    
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
+    return get_token_user(request)
+
+
+def get_optional_user(request: Request) -> Optional[TokenUser]:
+    """
+    Пользователь из токена доступа, если он передан; без заголовка Authorization - None.
+    Недействительный токен - 401, как и в get_current_user.
+    """
+    if "Authorization" not in request.headers:
+        return None
+    return get_token_user(request)
 
 
-def require_admin(current_user: UserModel = Depends(get_current_user)) -> UserModel:
+def require_admin(current_user: TokenUser = Depends(get_current_user)) -> TokenUser:
     """
     Зависимость для проверки, что пользователь - администратор.
     Используется для защиты админ-маршрутов.
     """
-    if current_user.role.name.lower() != "admin":
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
@@ -39,13 +45,17 @@ def require_admin(current_user: UserModel = Depends(get_current_user)) -> UserMo
     return current_user
 
 
-def require_user(current_user: UserModel = Depends(get_current_user)) -> UserModel:
+def require_user(current_user: TokenUser = Depends(get_current_user)) -> TokenUser:
     """
     Зависимость для проверки, что пользователь авторизован (любая роль).
     """
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
     return current_user
+
+
+def get_viewer_state_service(db: Session = Depends(get_db)) -> ViewerStateService:
+    """Флаги is_favorited/in_cart зрителя для списков каталога (зритель - из токена доступа)"""
+    return ViewerStateService(FavoriteService(FavoriteRepository(db)), SyncCartItemRepository(db))
+
+
+def get_review_service(db: Session = Depends(get_db)) -> ReviewService:
+    return ReviewService(ReviewRepository(db), RatingSummaryRepository(db))
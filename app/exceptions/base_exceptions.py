@@ -45,12 +45,12 @@ class NotFoundException(BaseAPIException):
 class ValidationException(BaseAPIException):
     """Исключение для ошибок валидации"""
     
-    def __init__(self, detail: str = "Validation error", errors: list = None):
+    def __init__(self, detail: str = "Validation error", errors: list = None, error_code: str = None):
         self.errors = errors or []
         
         super().__init__(
             status_code=400,
-            error_code="validation_error",
+            error_code=error_code or "validation_error",
             detail=detail
         )
 
@@ -65,6 +65,17 @@ class BadRequestException(BaseAPIException):
         )
         self.extra = extra or {}
 
+class ConflictException(BaseAPIException):
+    """Исключение для конфликта с текущим состоянием ресурса"""
+    
+    def __init__(self, detail: str = "Conflict", error_code: str = None, extra: dict = None):
+        super().__init__(
+            status_code=409,
+            error_code=error_code or "conflict",
+            detail=detail
+        )
+        self.extra = extra or {}
+
 # ===================================
 
 class APIException(HTTPException):
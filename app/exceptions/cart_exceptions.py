@@ -1,5 +1,5 @@
 # app/exceptions/cart_exceptions.py
-from .base_exceptions import NotFoundException, ValidationException, BadRequestException
+from .base_exceptions import NotFoundException, ValidationException, BadRequestException, ConflictException
 
 
 class CartNotFoundException(NotFoundException):
@@ -27,6 +27,18 @@ class CartItemNotFoundException(NotFoundException):
         super().__init__(resource_name="CartItem", resource_id=str(cart_item_id))
 
 
+class CartItemConflictException(ConflictException):
+    """Исключение, когда позицию корзины непрерывно меняют параллельные запросы"""
+    
+    def __init__(self, attempts: int, cart_item_id: int = None):
+        subject = f"CartItem with ID {cart_item_id}" if cart_item_id else "Cart item"
+        super().__init__(
+            detail=f"{subject} is being modified concurrently, retry the request",
+            error_code="cart_item_conflict",
+            extra={"cart_item_id": cart_item_id, "attempts": attempts}
+        )
+
+
 class CartValidationException(ValidationException):
     """Исключение для ошибок валидации корзины"""
     
@@ -1,4 +1,4 @@
-from .base_exceptions import NotFoundException, ValidationException
+from .base_exceptions import NotFoundException, ValidationException, ConflictException
 
 
 class ChatMessageNotFoundException(NotFoundException):
@@ -12,4 +12,15 @@ class ChatValidationException(ValidationException):
     """Исключение для ошибок валидации чата"""
     
     def __init__(self, detail: str = "Chat validation error", errors: list = None):
-        super().__init__(detail=detail, errors=errors, error_code="CHAT_VALIDATION_ERROR")
\ No newline at end of file
+        super().__init__(detail=detail, errors=errors, error_code="CHAT_VALIDATION_ERROR")
+
+
+class ChatArchiveConflictException(ConflictException):
+    """Пачку сообщений одновременно архивирует другой процесс"""
+    
+    def __init__(self, user_id: int, expected: int, deleted: int):
+        super().__init__(
+            detail=f"Chat archive batch for user {user_id} changed concurrently",
+            error_code="CHAT_ARCHIVE_CONFLICT",
+            extra={"user_id": user_id, "expected": expected, "deleted": deleted}
+        )
\ No newline at end of file
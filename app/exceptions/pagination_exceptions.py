@@ -0,0 +1,11 @@
+from app.exceptions.base_exceptions import BadRequestException
+
+
+class InvalidCursorException(BadRequestException):
+    """Исключение: курсор пагинации поврежден или не подходит к сортировке"""
+    
+    def __init__(self, detail: str = None):
+        if detail is None:
+            detail = "Некорректный курсор пагинации"
+            
+        super().__init__(detail=detail, error_code="invalid_cursor")
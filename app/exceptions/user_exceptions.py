@@ -1,3 +1,4 @@
+import math
 from app.exceptions.base_exceptions import BaseAPIException
 
 class UserNotFoundException(BaseAPIException):
@@ -58,4 +59,40 @@ class InsufficientPermissionsException(BaseAPIException):
             status_code=403,
             error_code="insufficient_permissions",
             detail=detail
+        )
+
+class InvalidTokenException(BaseAPIException):
+    """Исключение: токен доступа отсутствует, недействителен или истёк"""
+    
+    def __init__(self, detail: str = None):
+        if detail is None:
+            detail = "Требуется токен доступа (Authorization: Bearer)"
+            
+        super().__init__(
+            status_code=401,
+            error_code="invalid_token",
+            detail=detail,
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+class TooManyLoginAttemptsException(BaseAPIException):
+    """Исключение: превышена частота попыток входа для email или IP"""
+    
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=429,
+            error_code="too_many_login_attempts",
+            detail="Слишком много попыток входа, повторите позже",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+class PasswordHashingBusyException(BaseAPIException):
+    """Исключение: очередь пула хеширования паролей заполнена"""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            error_code="password_hashing_busy",
+            detail="Сервис входа перегружен, повторите позже",
+            headers={"Retry-After": "1"}
         )
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Enum as SQLEnum
+from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Enum as SQLEnum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from .carts import CartModel
@@ -7,6 +7,20 @@ from .carts import CartModel
 
 class CartItemModel(Base):
     __tablename__ = "cart_items"
+    __table_args__ = (
+        Index("ix_cart_items_cart_id", "cart_id"),
+        # Одна строка на товар в корзине: (cart_id, item_type, item_id) с item_id в колонке
+        # своего типа. Цель ON CONFLICT для атомарного увеличения количества
+        *(
+            Index(
+                f"ux_cart_items_cart_{item_type}", "cart_id", f"{item_type}_id",
+                unique=True,
+                sqlite_where=text(f"{item_type}_id IS NOT NULL"),
+                postgresql_where=text(f"{item_type}_id IS NOT NULL")
+            )
+            for item_type in ("product", "listing", "author_listing")
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     cart_id: Mapped[int] = mapped_column(ForeignKey("carts.id"), nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List
-from sqlalchemy import ForeignKey, Integer, DateTime
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Integer, DateTime, Float, Index
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 from app.database.database import Base
 
 if TYPE_CHECKING:
@@ -9,12 +9,20 @@ if TYPE_CHECKING:
 
 class CartModel(Base):
     __tablename__ = "carts"
+    __table_args__ = (
+        # Одна корзина на пользователя; на этот индекс опирается upsert в CartRepository
+        Index("ix_carts_user_id", "user_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Денормализованные итоги: меняются в той же транзакции, что и cart_items
+    total: Mapped[float] = mapped_column(Float, nullable=False, default=0, server_default="0")
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     # Связи
     items: Mapped[List["CartItemModel"]] = relationship("CartItemModel", back_populates="cart", cascade="all, delete-orphan")
-    user = relationship("UserModel", backref="cart")
\ No newline at end of file
+    # Корзина удаляется вместе с пользователем (carts.user_id NOT NULL)
+    user = relationship("UserModel", backref=backref("cart", cascade="all, delete-orphan"))
\ No newline at end of file
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, DateTime, LargeBinary, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class ChatArchiveSegmentModel(Base):
+    """
+    Сегмент холодного архива чата: до CHAT_ARCHIVE_BATCH_SIZE сообщений одного диалога,
+    перенесённых из chat_massage, - JSON, сжатый zlib (app/repositories/chat_archive_repository.py).
+    """
+    __tablename__ = "chat_archive"
+    __table_args__ = (
+        # Чтение архива диалога от новых сегментов к старым
+        Index("ix_chat_archive_user_id_last_message_id", "user_id", "last_message_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    first_message_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_message_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
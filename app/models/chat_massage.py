@@ -1,12 +1,17 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Text, Boolean
+from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class ChatMessageModel(Base):
     __tablename__ = "chat_massage"
+    __table_args__ = (
+        Index("ix_chat_massage_user_id_sent_at", "user_id", "sent_at", "id"),
+        # Архивация: поиск самых старых сообщений по всем диалогам (ChatArchiveService)
+        Index("ix_chat_massage_sent_at", "sent_at"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -1,16 +1,27 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Float, ForeignKey, Integer, DateTime
+from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class FavoriteModel(Base):
     __tablename__ = "favorite"
+    __table_args__ = (
+        Index("ix_favorite_user_id_added_at", "user_id", "added_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     products_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"), nullable=True)
     listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("listing.id"), nullable=True)
     author_listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("author_listing.id"), nullable=True)
-    added_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    added_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class UserFavoriteCountModel(Base):
+    """Денормализованное число избранного пользователя (FAVORITES_COUNTER_TABLE)"""
+    __tablename__ = "user_favorite_counts"
+    
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
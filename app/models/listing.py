@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL
+from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -10,6 +10,11 @@ if TYPE_CHECKING:
     
 class ListingModel(Base):
     __tablename__ = "listing"
+    __table_args__ = (
+        Index("ix_listing_status_id", "status", "id"),
+        Index("ix_listing_game_topic_id", "game_topic", "id"),
+        Index("ix_listing_user_id_id", "user_id", "id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -1,11 +1,20 @@
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Integer, DECIMAL, Boolean, Text
+from sqlalchemy import String, Integer, DECIMAL, Boolean, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class ProductModel(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_category_id", "category", "id"),
+        # Частичный индекс под WHERE is_active = 1 ORDER BY id (витрина, filter_page)
+        Index(
+            "ix_products_active_id", "id",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
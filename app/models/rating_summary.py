@@ -0,0 +1,33 @@
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+RATINGS = (1, 2, 3, 4, 5)
+
+
+class RatingSummaryModel(Base):
+    """
+    Сводка отзывов по товару/объявлению: число, сумма и гистограмма оценок 1-5.
+    Ведётся ReviewService в одной транзакции с отзывом; пересобирается командой
+    python -m app.database.rebuild_rating_summary, пустая - на старте приложения
+    (app/database/backfill.py)
+    """
+    __tablename__ = "rating_summary"
+
+    item_type: Mapped[str] = mapped_column(String(20), primary_key=True)  # 'product', 'listing', 'author_listing'
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    @property
+    def average(self) -> float:
+        return round(self.rating_sum / self.count, 2) if self.count else 0.0
+
+    @property
+    def histogram(self) -> dict:
+        return {rating: getattr(self, f"rating_{rating}") for rating in RATINGS}
@@ -1,12 +1,30 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Integer, Boolean, Text
+from sqlalchemy import String, DateTime, ForeignKey, Integer, Boolean, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class ReviewModel(Base):
     __tablename__ = "review"
+    __table_args__ = (
+        Index("ix_review_user_id_id", "user_id", "id"),
+        Index("ix_review_rating_id", "rating", "id"),
+        Index("ix_review_is_verified_id", "is_verified", "id"),
+        # Ленты отзывов товара/объявления (ReviewRepository.get_item_page): равенство по
+        # ссылке (+ is_verified), затем порядок (created_at, id) без сортировки; rating в
+        # хвосте индекса - фильтр по диапазону оценок проверяется без чтения строк таблицы.
+        # Каждый отзыв ссылается на один тип товара: частичные индексы не хранят строки с NULL
+        *(
+            Index(
+                f"ix_review_{column}{suffix}", column, *verified, "created_at", "id", "rating",
+                sqlite_where=text(f"{column} IS NOT NULL"),
+                postgresql_where=text(f"{column} IS NOT NULL")
+            )
+            for column in ("products_id", "listing_id", "author_listing_id")
+            for suffix, verified in (("_created_at", ()), ("_verified_created_at", ("is_verified",)))
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Float, ForeignKey
+from sqlalchemy import String, Float, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -10,6 +10,12 @@ if TYPE_CHECKING:
 
 class UserModel(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Префиксный поиск по имени в админке с keyset-пагинацией по (name, id);
+        # для email хватает уникального индекса
+        Index("ix_users_name_id", "name", "id"),
+    )
+    
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
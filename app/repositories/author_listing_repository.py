@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
 from app.models.author_listing import AuthorListingModel
+from app.models.cart_items import CartItemModel
 from app.repositories.repository import BaseRepository
 
 class AuthorListingRepository(BaseRepository[AuthorListingModel]):
+    nullify_on_delete = (CartItemModel.author_listing_id,)
+    
     def __init__(self, db: Session):
         super().__init__(AuthorListingModel, db)
     
@@ -1,15 +1,19 @@
 
-from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
+from typing import TypeVar, Type, List, Optional, Dict, Any, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import asc, desc
 from app.database.database import Base
+from app.repositories import repository
 
 ModelType = TypeVar("ModelType", bound=Base)
 
-class BaseRepository(Generic[ModelType]):
+class BaseRepository(repository.BaseRepository[ModelType]):
+    """
+    Старая сигнатура (db, model) поверх repository.BaseRepository: сохранение
+    с учётом единицы работы (_save) и keyset-пагинация (get_page) - оттуда.
+    """
     def __init__(self, db: Session, model: Type[ModelType]):
-        self.db = db
-        self.model = model
+        super().__init__(model, db)
 
     def get(self, id: Any) -> Optional[ModelType]:
         """Получить запись по ID"""
@@ -73,8 +77,7 @@ class BaseRepository(Generic[ModelType]):
         
         db_obj = self.model(**obj_in_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._save(db_obj)
         return db_obj
 
     def update(self, id: Any, obj_in: Union[Dict[str, Any], ModelType]) -> Optional[ModelType]:
@@ -92,8 +95,7 @@ class BaseRepository(Generic[ModelType]):
             if hasattr(db_obj, field) and value is not None:
                 setattr(db_obj, field, value)
         
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._save(db_obj)
         return db_obj
 
     def delete(self, id: Any) -> bool:
@@ -103,7 +105,7 @@ class BaseRepository(Generic[ModelType]):
             return False
         
         self.db.delete(db_obj)
-        self.db.commit()
+        self._save()
         return True
 
     def count(self, **filters) -> int:
@@ -1,23 +1,177 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from app.models.cart_items import CartItemModel
-from app.repositories.repository import BaseRepository
+from app.models.carts import CartModel
+from app.repositories.repository import AsyncBaseRepository, BaseRepository
 
 
-class CartItemRepository(BaseRepository[CartItemModel]):
-    def __init__(self, db: Session):
+class CartItemRepository(AsyncBaseRepository[CartItemModel]):
+    def __init__(self, db: AsyncSession):
         super().__init__(CartItemModel, db)
     
-    def get_by_cart_id(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[CartItemModel]:
-        return self.db.query(self.model)\
-            .filter(self.model.cart_id == cart_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+    async def get_by_cart_id(
+        self,
+        cart_id: int,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        refresh: bool = False
+    ) -> List[CartItemModel]:
+        """limit=None - все элементы; refresh=True перечитывает уже загруженные в сессию объекты"""
+        query = select(self.model).filter(self.model.cart_id == cart_id).order_by(self.model.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        if refresh:
+            query = query.execution_options(populate_existing=True)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
+    async def get_by_cart_id_detailed(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[CartItemModel]:
+        """
+        Элементы корзины вместе с товарами: один SELECT по cart_items и не больше
+        трёх SELECT ... WHERE id IN (...) - по одному на products, listing, author_listing
+        """
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.cart_id == cart_id)
+            .options(
+                selectinload(self.model.product),
+                selectinload(self.model.listing),
+                selectinload(self.model.author_listing)
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def delete_by_cart(self, cart_id: int) -> int:
+        """Удалить все элементы корзины одним DELETE ... WHERE cart_id = ?"""
+        result = await self.db.execute(
+            delete(self.model)
+            .where(self.model.cart_id == cart_id)
+            .execution_options(synchronize_session="fetch")
+        )
+        await self._save()
+        return result.rowcount
+    
+    async def get_fresh(self, item_id: int) -> Optional[CartItemModel]:
+        """Строка из БД, а не из identity map сессии"""
+        return await self.db.get(self.model, item_id, populate_existing=True)
+    
+    async def set_quantity_if(self, item_id: int, quantity: int, expected: int) -> Optional[CartItemModel]:
+        """
+        UPDATE ... SET quantity = :quantity WHERE id = ? AND quantity = :expected RETURNING.
+        None - строку удалили или её количество уже изменил параллельный запрос:
+        разница для итогов корзины, посчитанная от expected, была бы неверной.
+        """
+        result = await self.db.scalars(
+            update(self.model)
+            .where(self.model.id == item_id, self.model.quantity == expected)
+            .values(quantity=quantity)
+            .returning(self.model),
+            execution_options={"populate_existing": True}
+        )
+        cart_item = result.first()
+        if cart_item is not None:
+            await self._save()
+        return cart_item
+    
+    async def delete_returning_amount(self, item_id: int) -> Optional[Tuple[int, float]]:
+        """
+        DELETE ... RETURNING cart_id, price * quantity: сумма берётся из удаляемой строки,
+        а не из прочитанной раньше копии. None - строки уже нет.
+        """
+        row = (await self.db.execute(
+            delete(self.model)
+            .where(self.model.id == item_id)
+            .returning(self.model.cart_id, self.model.price * self.model.quantity)
+        )).first()
+        if row is None:
+            return None
+        await self._save()
+        return row[0], row[1]
+    
+    async def get_totals(self, cart_id: int) -> Tuple[float, int]:
+        """Итог и число позиций корзины одним SELECT SUM(price * quantity), COUNT(*)"""
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(self.model.price * self.model.quantity), 0),
+                func.count(self.model.id)
+            ).where(self.model.cart_id == cart_id)
+        )
+        total, item_count = result.one()
+        return round(float(total), 2), item_count
     
-    def get_by_cart_and_item(self, cart_id: int, item_type: str, item_id: int) -> Optional[CartItemModel]:
+    async def add_quantity(
+        self,
+        cart_id: int,
+        item_type: str,
+        item_id: int,
+        quantity: int,
+        price: float
+    ) -> Optional[Tuple[CartItemModel, bool]]:
+        """
+        Добавить товар или увеличить его количество; возвращает (позиция, создана ли она).
+        INSERT ... ON CONFLICT (cart_id, <item_type>_id) DO NOTHING RETURNING вернул строку -
+        позицию создал этот вызов; иначе она уже есть и количество увеличивает
+        UPDATE ... SET quantity = quantity + :quantity RETURNING. Без чтения строки в Python
+        параллельные добавления не теряют обновлений и не создают дубликатов, а признак
+        создания берётся из самих операторов. None - позицию удалили между операторами
+        (возможно в PostgreSQL), вызов можно повторить. Цена уже лежащей в корзине позиции не меняется.
+        """
+        item_column = getattr(self.model, f"{item_type}_id")
+        statement = self._dialect_insert({
+            "cart_id": cart_id,
+            "item_type": item_type,
+            f"{item_type}_id": item_id,
+            "quantity": quantity,
+            "price": price,
+            "created_at": datetime.utcnow()
+        })
+        statement = statement.on_conflict_do_nothing(
+            index_elements=[self.model.cart_id, item_column],
+            index_where=item_column.isnot(None)
+        ).returning(self.model)
+        
+        cart_item = (await self.db.scalars(statement, execution_options={"populate_existing": True})).first()
+        created = cart_item is not None
+        if not created:
+            cart_item = (await self.db.scalars(
+                update(self.model)
+                .where(self.model.cart_id == cart_id, item_column == item_id)
+                .values(quantity=self.model.quantity + quantity)
+                .returning(self.model),
+                execution_options={"populate_existing": True}
+            )).first()
+            if cart_item is None:
+                return None
+        
+        await self._save()
+        return cart_item, created
+    
+    async def get_by_cart_and_item(self, cart_id: int, item_type: str, item_id: int) -> Optional[CartItemModel]:
         filters = {
             "cart_id": cart_id,
             item_type + "_id": item_id  # Например: product_id=5 или listing_id=3
         }
-        return self.get_one_by(**filters)
\ No newline at end of file
+        return await self.get_one_by(**filters)
+
+
+class SyncCartItemRepository(BaseRepository[CartItemModel]):
+    """Чтения cart_items из синхронных роутеров каталога"""
+    def __init__(self, db: Session):
+        super().__init__(CartItemModel, db)
+    
+    def get_in_cart_ids(self, user_id: int, item_type: str, item_ids: Iterable[int]) -> Set[int]:
+        """
+        Какие из item_ids лежат в корзине пользователя: один SELECT
+        cart_items JOIN carts ... WHERE carts.user_id = ? AND <item_type>_id IN (...)
+        """
+        item_column = getattr(self.model, f"{item_type}_id")
+        return set(self.db.scalars(
+            select(item_column)
+            .join(CartModel, CartModel.id == self.model.cart_id)
+            .where(CartModel.user_id == user_id, item_column.in_(list(item_ids)))
+        ).all())
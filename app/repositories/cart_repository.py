@@ -1,11 +1,52 @@
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.carts import CartModel
-from app.repositories.repository import BaseRepository
+from app.repositories.repository import AsyncBaseRepository
 
-class CartRepository(BaseRepository[CartModel]):
-    def __init__(self, db: Session):
+class CartRepository(AsyncBaseRepository[CartModel]):
+    def __init__(self, db: AsyncSession):
         super().__init__(CartModel, db)
     
-    def get_by_user(self, user_id: int) -> Optional[CartModel]:
-        return self.get_one_by(user_id=user_id)
\ No newline at end of file
+    async def get_by_user(self, user_id: int) -> Optional[CartModel]:
+        return await self.get_one_by(user_id=user_id)
+    
+    async def get_or_create_by_user(self, user_id: int) -> CartModel:
+        """
+        SELECT по user_id, а если корзины нет - INSERT ... ON CONFLICT (user_id) DO UPDATE
+        ... RETURNING. Параллельные первые запросы получают одну и ту же строку вместо дубликатов.
+        """
+        cart = await self.get_by_user(user_id)
+        if cart:
+            return cart
+        
+        now = datetime.utcnow()
+        statement = self._dialect_insert({"user_id": user_id, "created_at": now, "updated_at": now})
+        # DO UPDATE без реальных изменений нужен, чтобы RETURNING вернул и уже существующую строку
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.user_id],
+            set_={"user_id": statement.excluded.user_id}
+        ).returning(self.model)
+        
+        cart = (await self.db.scalars(statement, execution_options={"populate_existing": True})).one()
+        await self._save()
+        return cart
+    
+    async def add_to_totals(self, cart_id: int, total_delta: float, count_delta: int = 0) -> Optional[CartModel]:
+        """
+        Атомарно сдвигает carts.total/item_count одним UPDATE ... RETURNING:
+        SET total = total + :delta, без чтения текущего значения в Python
+        """
+        return await self.update_returning(cart_id, {
+            "total": func.round(self.model.total + total_delta, 2),
+            "item_count": self.model.item_count + count_delta,
+            "updated_at": datetime.utcnow()
+        })
+    
+    async def set_totals(self, cart_id: int, total: float, item_count: int) -> Optional[CartModel]:
+        return await self.update_returning(cart_id, {
+            "total": total,
+            "item_count": item_count,
+            "updated_at": datetime.utcnow()
+        })
\ No newline at end of file
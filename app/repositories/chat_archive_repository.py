@@ -0,0 +1,46 @@
+import json
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.chat_archive import ChatArchiveSegmentModel
+from app.models.chat_massage import ChatMessageModel
+from app.repositories.repository import BaseRepository
+from app.schemas.chat_message_schema import ChatMessage
+
+COMPRESSION_LEVEL = 6
+
+
+def pack_messages(messages: List[ChatMessageModel]) -> bytes:
+    """Сообщения -> JSON-массив схем ChatMessage, сжатый zlib"""
+    rows = [ChatMessage.model_validate(message).model_dump(mode="json") for message in messages]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode(), COMPRESSION_LEVEL)
+
+
+def unpack_messages(payload: bytes) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(payload))
+
+
+class ChatArchiveRepository(BaseRepository[ChatArchiveSegmentModel]):
+    def __init__(self, db: Session):
+        super().__init__(ChatArchiveSegmentModel, db)
+
+    def add_segment(self, user_id: int, messages: List[ChatMessageModel]) -> ChatArchiveSegmentModel:
+        """Один сегмент из сообщений диалога, упорядоченных по (sent_at, id)"""
+        return self.create({
+            "user_id": user_id,
+            "first_message_id": messages[0].id,
+            "last_message_id": messages[-1].id,
+            "first_sent_at": messages[0].sent_at,
+            "last_sent_at": messages[-1].sent_at,
+            "message_count": len(messages),
+            "payload": pack_messages(messages),
+        })
+
+    def iter_segments(self, user_id: int, before_id: Optional[int] = None) -> Iterator[ChatArchiveSegmentModel]:
+        """Сегменты диалога от новых к старым; читаются из БД по несколько, а не все сразу"""
+        query = select(self.model).where(self.model.user_id == user_id)
+        if before_id is not None:
+            query = query.where(self.model.first_message_id < before_id)
+        query = query.order_by(self.model.last_message_id.desc()).execution_options(yield_per=4)
+        return iter(self.db.scalars(query))
@@ -1,7 +1,13 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.orm import Session
 from app.models.chat_massage import ChatMessageModel
 from app.repositories.repository import BaseRepository
 
+# Позиция сообщения в диалоге: ключ индекса ix_chat_massage_user_id_sent_at после user_id
+MessageKey = Tuple[datetime, int]
+
 class ChatMessageRepository(BaseRepository[ChatMessageModel]):
     def __init__(self, db: Session):
         super().__init__(ChatMessageModel, db)
@@ -19,4 +25,58 @@ class ChatMessageRepository(BaseRepository[ChatMessageModel]):
             .order_by(self.model.sent_at)\
             .offset(skip)\
             .limit(limit)\
-            .all()
\ No newline at end of file
+            .all()
+    
+    def get_oldest_user_before(self, cutoff: datetime) -> Optional[int]:
+        """Диалог с самым старым сообщением раньше cutoff (индекс ix_chat_massage_sent_at)"""
+        return self.db.scalar(
+            select(self.model.user_id)
+            .where(self.model.sent_at < cutoff)
+            .order_by(self.model.sent_at)
+            .limit(1)
+        )
+    
+    def get_older_than(self, user_id: int, cutoff: datetime, limit: int) -> List[ChatMessageModel]:
+        """Самые старые сообщения диалога раньше cutoff, по (sent_at, id)"""
+        return list(self.db.scalars(
+            select(self.model)
+            .where(self.model.user_id == user_id, self.model.sent_at < cutoff)
+            .order_by(self.model.sent_at, self.model.id)
+            .limit(limit)
+        ).all())
+    
+    def delete_by_ids(self, ids: List[int]) -> int:
+        """DELETE ... WHERE id IN (...); возвращает число удалённых строк"""
+        result = self.db.execute(delete(self.model).where(self.model.id.in_(ids)))
+        self._save()
+        return result.rowcount
+    
+    def get_message_key(self, user_id: int, message_id: int) -> Optional[MessageKey]:
+        """(sent_at, id) сообщения диалога по первичному ключу; None - нет такого сообщения у user_id"""
+        row = self.db.execute(
+            select(self.model.sent_at, self.model.id)
+            .where(self.model.id == message_id, self.model.user_id == user_id)
+        ).first()
+        return tuple(row) if row is not None else None
+    
+    def get_window(
+        self,
+        user_id: int,
+        limit: int = 50,
+        after: Optional[MessageKey] = None,
+        before: Optional[MessageKey] = None
+    ) -> List[ChatMessageModel]:
+        """
+        Окно диалога в хронологическом порядке по индексу (user_id, sent_at, id):
+        after - первые limit сообщений после позиции, before - последние limit
+        перед позицией, без after - последние limit сообщений диалога (хвост).
+        """
+        key = tuple_(self.model.sent_at, self.model.id)
+        query = select(self.model).where(self.model.user_id == user_id)
+        if before is not None:
+            query = query.where(key < before)
+        if after is not None:
+            query = query.where(key > after).order_by(self.model.sent_at, self.model.id)
+            return list(self.db.scalars(query.limit(limit)).all())
+        query = query.order_by(self.model.sent_at.desc(), self.model.id.desc()).limit(limit)
+        return list(reversed(self.db.scalars(query).all()))
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
+from sqlalchemy import delete, exists, func, insert, select
 from sqlalchemy.orm import Session
-from app.models.favorite import FavoriteModel
+from app.models.favorite import FavoriteModel, UserFavoriteCountModel
 from app.repositories.base_repository import BaseRepository
+from app.repositories.repository import dialect_insert
 
 class FavoriteRepository(BaseRepository[FavoriteModel]):
     def __init__(self, db: Session):
@@ -18,18 +20,20 @@ class FavoriteRepository(BaseRepository[FavoriteModel]):
             .all()
         )
     
+    def _item_conditions(self, user_id: int, **filters) -> list:
+        conditions = [FavoriteModel.user_id == user_id]
+        for field in ("products_id", "listing_id", "author_listing_id"):
+            if filters.get(field):
+                conditions.append(getattr(FavoriteModel, field) == filters[field])
+        return conditions
+    
     def get_one_by(self, user_id: int, **filters) -> Optional[FavoriteModel]:
         """Найти одну запись избранного по фильтрам"""
-        query = self.db.query(FavoriteModel).filter(FavoriteModel.user_id == user_id)
-        
-        if filters.get("products_id"):
-            query = query.filter(FavoriteModel.products_id == filters["products_id"])
-        if filters.get("listing_id"):
-            query = query.filter(FavoriteModel.listing_id == filters["listing_id"])
-        if filters.get("author_listing_id"):
-            query = query.filter(FavoriteModel.author_listing_id == filters["author_listing_id"])
-        
-        return query.first()
+        return self.db.query(FavoriteModel).filter(*self._item_conditions(user_id, **filters)).first()
+    
+    def exists_by(self, user_id: int, **filters) -> bool:
+        """SELECT EXISTS(...) по фильтрам - без загрузки строки"""
+        return self.db.scalar(select(exists().where(*self._item_conditions(user_id, **filters))))
     
     def get_by_user_and_item(self, user_id: int, item_type: str, item_id: int) -> Optional[FavoriteModel]:
         """Получить избранное пользователя для конкретного товара"""
@@ -44,9 +48,81 @@ class FavoriteRepository(BaseRepository[FavoriteModel]):
         return self.get_one_by(user_id, **filters)
     
     def user_has_favorites(self, user_id: int) -> bool:
-        """Проверить, есть ли у пользователя избранное"""
-        return (
-            self.db.query(FavoriteModel)
-            .filter(FavoriteModel.user_id == user_id)
-            .first() is not None
-        )
\ No newline at end of file
+        """Проверить, есть ли у пользователя избранное (SELECT EXISTS)"""
+        return self.exists_by(user_id)
+    
+    def get_item_refs(self, user_id: int) -> Dict[str, Set[int]]:
+        """Все id избранного пользователя по типам одним SELECT: {"product": {...}, ...}"""
+        refs = {"product": set(), "listing": set(), "author_listing": set()}
+        rows = self.db.execute(
+            select(FavoriteModel.products_id, FavoriteModel.listing_id, FavoriteModel.author_listing_id)
+            .where(FavoriteModel.user_id == user_id)
+        )
+        for products_id, listing_id, author_listing_id in rows:
+            if products_id:
+                refs["product"].add(products_id)
+            if listing_id:
+                refs["listing"].add(listing_id)
+            if author_listing_id:
+                refs["author_listing"].add(author_listing_id)
+        return refs
+    
+    def delete_returning_user_id(self, id: int) -> Optional[int]:
+        """DELETE ... RETURNING user_id: владелец удалённой записи или None, если её нет"""
+        user_id = self.db.scalar(
+            delete(FavoriteModel).where(FavoriteModel.id == id).returning(FavoriteModel.user_id)
+        )
+        if user_id is not None:
+            self._save()
+        return user_id
+    
+    def count_by_user(self, user_id: int) -> int:
+        """SELECT COUNT(*) по индексу (user_id, added_at, id)"""
+        return self.db.scalar(
+            select(func.count()).select_from(FavoriteModel).where(FavoriteModel.user_id == user_id)
+        )
+    
+    def get_user_count(self, user_id: int) -> int:
+        """Счётчик из user_favorite_counts - одна строка по первичному ключу"""
+        count = self.db.scalar(
+            select(UserFavoriteCountModel.count).where(UserFavoriteCountModel.user_id == user_id)
+        )
+        return count or 0
+    
+    def add_to_user_count(self, user_id: int, delta: int) -> None:
+        """
+        Атомарно сдвигает счётчик: INSERT ... ON CONFLICT (user_id)
+        DO UPDATE SET count = count + excluded.count
+        """
+        statement = dialect_insert(self.db, UserFavoriteCountModel, {"user_id": user_id, "count": delta})
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[UserFavoriteCountModel.user_id],
+            set_={"count": UserFavoriteCountModel.count + statement.excluded.count}
+        ))
+        self._save()
+    
+    def user_counts_need_backfill(self) -> bool:
+        """Счётчиков нет, а избранное есть - таблица создана без бэкфилла (create_all)"""
+        has_counts = self.db.scalar(select(exists().select_from(UserFavoriteCountModel)))
+        return not has_counts and self.db.scalar(select(exists().select_from(FavoriteModel)))
+    
+    def rebuild_user_counts(self) -> int:
+        """
+        Пересобрать user_favorite_counts из favorite: DELETE и один
+        INSERT ... SELECT user_id, COUNT(*) ... GROUP BY user_id. Возвращает число счётчиков.
+        """
+        self.db.execute(delete(UserFavoriteCountModel))
+        self.db.execute(insert(UserFavoriteCountModel).from_select(
+            ["user_id", "count"],
+            select(FavoriteModel.user_id, func.count()).group_by(FavoriteModel.user_id)
+        ))
+        self._save()
+        return self.db.scalar(select(func.count()).select_from(UserFavoriteCountModel))
+    
+    def set_user_count(self, user_id: int, count: int) -> None:
+        statement = dialect_insert(self.db, UserFavoriteCountModel, {"user_id": user_id, "count": count})
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[UserFavoriteCountModel.user_id],
+            set_={"count": statement.excluded.count}
+        ))
+        self._save()
\ No newline at end of file
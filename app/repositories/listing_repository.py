@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
+from app.models.cart_items import CartItemModel
 from app.models.listing import ListingModel
 from app.repositories.repository import BaseRepository
 
 class ListingRepository(BaseRepository[ListingModel]):
+    nullify_on_delete = (CartItemModel.listing_id,)
+    
     def __init__(self, db: Session):
         super().__init__(ListingModel, db)
     
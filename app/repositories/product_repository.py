@@ -1,8 +1,12 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.models.cart_items import CartItemModel
 from app.models.products import ProductModel
-from app.repositories.repository import BaseRepository
+from app.repositories.repository import AsyncBaseRepository, BaseRepository
 
 class ProductRepository(BaseRepository[ProductModel]):
+    nullify_on_delete = (CartItemModel.product_id,)
+    
     def __init__(self, db: Session):
         super().__init__(ProductModel, db)
     
@@ -11,4 +15,11 @@ class ProductRepository(BaseRepository[ProductModel]):
             .filter(self.model.category == category)\
             .offset(skip)\
             .limit(limit)\
-            .all()
\ No newline at end of file
+            .all()
+
+
+class AsyncProductRepository(AsyncBaseRepository[ProductModel]):
+    nullify_on_delete = (CartItemModel.product_id,)
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(ProductModel, db)
\ No newline at end of file
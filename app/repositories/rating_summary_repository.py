@@ -0,0 +1,74 @@
+from typing import Dict, Optional
+from sqlalchemy import case, delete, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models.rating_summary import RATINGS, RatingSummaryModel
+from app.models.review import ReviewModel
+from app.repositories.repository import BaseRepository, dialect_insert
+
+# item_type сводки -> колонка ссылки в review
+REVIEW_TARGET_COLUMNS: Dict[str, str] = {
+    "product": "products_id",
+    "listing": "listing_id",
+    "author_listing": "author_listing_id",
+}
+
+
+class RatingSummaryRepository(BaseRepository[RatingSummaryModel]):
+    def __init__(self, db: Session):
+        super().__init__(RatingSummaryModel, db)
+
+    def get_summary(self, item_type: str, item_id: int) -> Optional[RatingSummaryModel]:
+        """Одна строка по первичному ключу (item_type, item_id)"""
+        return self.db.get(self.model, (item_type, item_id))
+
+    def apply(self, item_type: str, item_id: int, rating: int, sign: int = 1) -> None:
+        """
+        Учесть (sign=1) или убрать (sign=-1) одну оценку одним
+        INSERT ... ON CONFLICT (item_type, item_id) DO UPDATE SET count = count + excluded.count, ...
+        """
+        statement = dialect_insert(self.db, self.model, {
+            "item_type": item_type,
+            "item_id": item_id,
+            "count": sign,
+            "rating_sum": sign * rating,
+            f"rating_{rating}": sign,
+        })
+        bucket = getattr(self.model, f"rating_{rating}")
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[self.model.item_type, self.model.item_id],
+            set_={
+                "count": self.model.count + statement.excluded.count,
+                "rating_sum": self.model.rating_sum + statement.excluded.rating_sum,
+                bucket.key: bucket + getattr(statement.excluded, bucket.key),
+            }
+        ))
+        self._save()
+
+    def needs_backfill(self) -> bool:
+        """Сводок нет, а отзывы есть - таблица создана без бэкфилла (create_all)"""
+        has_summaries = self.db.scalar(select(exists().select_from(self.model)))
+        return not has_summaries and self.db.scalar(select(exists().select_from(ReviewModel)))
+
+    def rebuild(self) -> int:
+        """
+        Пересобрать все сводки из review: DELETE и по одному
+        INSERT ... SELECT ... GROUP BY на каждый тип. Возвращает число сводок.
+        """
+        self.db.execute(delete(self.model))
+        columns = ["item_type", "item_id", "count", "rating_sum"] + [f"rating_{rating}" for rating in RATINGS]
+        for item_type, column_name in REVIEW_TARGET_COLUMNS.items():
+            target = getattr(ReviewModel, column_name)
+            self.db.execute(insert(self.model).from_select(
+                columns,
+                select(
+                    literal(item_type),
+                    target,
+                    func.count(),
+                    func.sum(ReviewModel.rating),
+                    *(func.sum(case((ReviewModel.rating == rating, 1), else_=0)) for rating in RATINGS)
+                )
+                .where(target.isnot(None))
+                .group_by(target)
+            ))
+        self._save()
+        return self.db.scalar(select(func.count()).select_from(self.model))
@@ -1,11 +1,26 @@
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
-from app.database.database import Base
+from sqlalchemy import asc, delete, desc, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.database.database import Base, in_unit_of_work
+from app.utils.pagination import apply_cursor, build_page
 
 ModelType = TypeVar("ModelType", bound=Base) # type: ignore
 
+
+def dialect_insert(db, model, values: Dict[str, Any]):
+    """INSERT диалекта БД сессии - с поддержкой on_conflict_do_update (PostgreSQL/SQLite)"""
+    insert_for_dialect = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    return insert_for_dialect(model).values(**values)
+
+
 class BaseRepository(Generic[ModelType]):
+    # Внешние ключи других таблиц на эту модель, которые ORM-удаление (delete())
+    # обнуляло через связи; DELETE ... RETURNING обнуляет их сам в той же транзакции
+    nullify_on_delete: Tuple[Any, ...] = ()
+
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
@@ -13,6 +28,15 @@ class BaseRepository(Generic[ModelType]):
     def get(self, id: int) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
+    def _save(self, db_obj: Optional[ModelType] = None) -> None:
+        """commit + refresh, либо только flush внутри единицы работы"""
+        if in_unit_of_work(self.db):
+            self.db.flush()
+            return
+        self.db.commit()
+        if db_obj is not None:
+            self.db.refresh(db_obj)
+
     def get_all(
         self, 
         skip: int = 0, 
@@ -32,11 +56,25 @@ class BaseRepository(Generic[ModelType]):
         
         return query.offset(skip).limit(limit).all()
 
+    def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset-пагинация по (order_by, id): возвращает страницу и next_cursor"""
+        query = apply_cursor(
+            select(self.model).filter_by(**filters),
+            self.model, cursor, limit, order_by, order_direction
+        )
+        return build_page(list(self.db.scalars(query).all()), limit, order_by)
+
     def create(self, obj_in: Dict[str, Any]) -> ModelType:
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._save(db_obj)
         return db_obj
 
     def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
@@ -48,8 +86,7 @@ class BaseRepository(Generic[ModelType]):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._save(db_obj)
         return db_obj
 
     def delete(self, id: int) -> bool:
@@ -58,11 +95,228 @@ class BaseRepository(Generic[ModelType]):
             return False
         
         self.db.delete(db_obj)
-        self.db.commit()
+        self._save()
+        return True
+
+    def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        """
+        Обновить запись одним UPDATE ... RETURNING без предварительного SELECT.
+        Возвращает None, если строка с таким id не найдена.
+        """
+        values = {field: value for field, value in obj_in.items() if field in self.model.__table__.c}
+        if not values:
+            return self.get(id)
+        
+        db_obj = self.db.scalars(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model),
+            execution_options={"populate_existing": True}
+        ).first()
+        if db_obj is None:
+            return None
+        
+        self._save()
+        return db_obj
+
+    def _nullify_references(self, ids: List[int]) -> None:
+        for column in self.nullify_on_delete:
+            self.db.execute(update(column.table).where(column.in_(ids)).values({column.name: None}))
+
+    def delete_returning(self, id: int) -> bool:
+        """Удалить запись одним DELETE ... RETURNING; False, если строка не найдена"""
+        self._nullify_references([id])
+        deleted_id = self.db.scalars(
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        ).first()
+        if deleted_id is None:
+            return False
+        
+        self._save()
         return True
 
     def filter_by(self, **filters) -> List[ModelType]:
         return self.db.query(self.model).filter_by(**filters).all()
 
+    def filter_page(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelType]:
+        """filter_by с OFFSET/LIMIT в SQL и стабильным порядком по id"""
+        return self.db.query(self.model)\
+            .filter_by(**filters)\
+            .order_by(self.model.id)\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+
+    def count(self, **filters) -> int:
+        return self.db.scalar(select(func.count()).select_from(self.model).filter_by(**filters))
+
     def get_one_by(self, **filters) -> Optional[ModelType]:
-        return self.db.query(self.model).filter_by(**filters).first()
\ No newline at end of file
+        return self.db.query(self.model).filter_by(**filters).first()
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """Асинхронный вариант BaseRepository для работы через AsyncSession"""
+
+    nullify_on_delete: Tuple[Any, ...] = ()
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self.db.get(self.model, id)
+
+    def _dialect_insert(self, values: Dict[str, Any]):
+        return dialect_insert(self.db, self.model, values)
+
+    async def _save(self, db_obj: Optional[ModelType] = None) -> None:
+        if in_unit_of_work(self.db):
+            await self.db.flush()
+            return
+        await self.db.commit()
+        if db_obj is not None:
+            await self.db.refresh(db_obj)
+
+    async def get_all(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        order_direction: str = "asc"
+    ) -> List[ModelType]:
+        query = select(self.model)
+        
+        if order_by:
+            column = getattr(self.model, order_by, None)
+            if column:
+                if order_direction.lower() == "desc":
+                    query = query.order_by(desc(column))
+                else:
+                    query = query.order_by(asc(column))
+        
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        query = apply_cursor(
+            select(self.model).filter_by(**filters),
+            self.model, cursor, limit, order_by, order_direction
+        )
+        result = await self.db.scalars(query)
+        return build_page(list(result.all()), limit, order_by)
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        db_obj = self.model(**obj_in)
+        self.db.add(db_obj)
+        await self._save(db_obj)
+        return db_obj
+
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = await self.get(id)
+        if not db_obj:
+            return None
+            
+        for field, value in obj_in.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        
+        await self._save(db_obj)
+        return db_obj
+
+    async def delete(self, id: int) -> bool:
+        db_obj = await self.get(id)
+        if not db_obj:
+            return False
+        
+        await self.db.delete(db_obj)
+        await self._save()
+        return True
+
+    async def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        values = {field: value for field, value in obj_in.items() if field in self.model.__table__.c}
+        if not values:
+            return await self.get(id)
+        
+        result = await self.db.scalars(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model),
+            execution_options={"populate_existing": True}
+        )
+        db_obj = result.first()
+        if db_obj is None:
+            return None
+        
+        await self._save()
+        return db_obj
+
+    async def _nullify_references(self, ids: List[int]) -> None:
+        for column in self.nullify_on_delete:
+            await self.db.execute(update(column.table).where(column.in_(ids)).values({column.name: None}))
+
+    async def delete_returning(self, id: int) -> bool:
+        await self._nullify_references([id])
+        result = await self.db.scalars(
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        )
+        if result.first() is None:
+            return False
+        
+        await self._save()
+        return True
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Вставка пачкой (executemany / insertmanyvalues), возвращает id в порядке rows"""
+        if not rows:
+            return []
+        result = await self.db.scalars(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True),
+            rows
+        )
+        return list(result.all())
+
+    async def existing_ids(self, ids: List[int]) -> List[int]:
+        if not ids:
+            return []
+        result = await self.db.scalars(select(self.model.id).where(self.model.id.in_(ids)))
+        return list(result.all())
+
+    async def bulk_update(self, rows: List[Dict[str, Any]]) -> None:
+        """UPDATE по первичному ключу одним executemany; каждая строка должна содержать id"""
+        if rows:
+            await self.db.execute(update(self.model), rows)
+
+    async def bulk_delete(self, ids: List[int]) -> None:
+        if ids:
+            await self._nullify_references(ids)
+            await self.db.execute(
+                delete(self.model)
+                .where(self.model.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+
+    async def filter_by(self, **filters) -> List[ModelType]:
+        result = await self.db.execute(select(self.model).filter_by(**filters))
+        return list(result.scalars().all())
+
+    async def filter_page(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelType]:
+        result = await self.db.execute(
+            select(self.model).filter_by(**filters).order_by(self.model.id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def count(self, **filters) -> int:
+        return await self.db.scalar(select(func.count()).select_from(self.model).filter_by(**filters))
+
+    async def get_one_by(self, **filters) -> Optional[ModelType]:
+        result = await self.db.execute(select(self.model).filter_by(**filters).limit(1))
+        return result.scalars().first()
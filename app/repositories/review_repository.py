@@ -1,6 +1,9 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.review import ReviewModel
 from app.repositories.repository import BaseRepository
+from app.utils.pagination import apply_cursor, build_page
 
 class ReviewRepository(BaseRepository[ReviewModel]):
     def __init__(self, db: Session):
@@ -25,4 +28,31 @@ class ReviewRepository(BaseRepository[ReviewModel]):
             .filter(self.model.rating >= min_rating, self.model.rating <= max_rating)\
             .offset(skip)\
             .limit(limit)\
-            .all()
\ No newline at end of file
+            .all()
+    
+    def get_item_page(
+        self,
+        column: str,
+        item_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        verified_only: bool = False,
+        min_rating: int = 1,
+        max_rating: int = 5
+    ) -> Tuple[List[ReviewModel], Optional[str]]:
+        """
+        Лента отзывов одного товара/объявления, новые первыми: keyset по (created_at, id).
+        Идёт по индексу ix_review_<column>[_verified]_created_at без сортировки.
+        """
+        query = select(self.model).where(getattr(self.model, column) == item_id)
+        if verified_only:
+            query = query.where(self.model.is_verified == True)
+        if (min_rating, max_rating) != (1, 5):
+            query = query.where(self.model.rating.between(min_rating, max_rating))
+        query = apply_cursor(query, self.model, cursor, limit, "created_at", "desc")
+        return build_page(list(self.db.scalars(query).all()), limit, "created_at")
+    
+    def average_rating(self, **filters) -> float:
+        """SELECT AVG(rating) по фильтрам - без загрузки строк"""
+        average = self.db.scalar(select(func.avg(self.model.rating)).filter_by(**filters))
+        return round(float(average), 2) if average is not None else 0.0
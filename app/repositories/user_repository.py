@@ -1,7 +1,10 @@
-from typing import Optional
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.users import UserModel
-from app.repositories.repository import BaseRepository
+from app.repositories.repository import AsyncBaseRepository, BaseRepository
+from app.utils.pagination import apply_cursor, build_page
 from app.schemas.user_schema import UserCreate
 
 class UserRepository(BaseRepository[UserModel]):
@@ -9,4 +12,43 @@ class UserRepository(BaseRepository[UserModel]):
         super().__init__(UserModel, db)
     
     def get_by_email(self, email: str) -> Optional[UserModel]:
-        return self.get_one_by(email=email)
\ No newline at end of file
+        return self.get_one_by(email=email)
+
+
+def prefix_range(column, prefix: str) -> Tuple[Any, Any]:
+    """
+    Условие "column начинается с prefix" диапазоном [prefix, prefix + U+10FFFF):
+    идёт по B-tree индексу, в отличие от LIKE 'prefix%' (в SQLite LIKE регистронезависим
+    и индекс с обычной сортировкой не использует). Сравнение регистрозависимое.
+    """
+    return column >= prefix, column < prefix + "\U0010ffff"
+
+
+class AsyncUserRepository(AsyncBaseRepository[UserModel]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(UserModel, db)
+    
+    async def search_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        email_prefix: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        skip: int = 0
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Страница пользователей для админки одним запросом: только колонки списка
+        (без hashed_password и загрузки role), keyset-пагинация по (email, id) при
+        поиске по email, по (name, id) при поиске по имени, иначе по id.
+        """
+        order_by = "email" if email_prefix else "name" if name_prefix else "id"
+        query = select(UserModel.id, UserModel.name, UserModel.email, UserModel.role_id)
+        if email_prefix:
+            query = query.where(*prefix_range(UserModel.email, email_prefix))
+        if name_prefix:
+            query = query.where(*prefix_range(UserModel.name, name_prefix))
+        query = apply_cursor(query, UserModel, cursor, limit, order_by)
+        if skip and not cursor:
+            query = query.offset(skip)
+        rows = (await self.db.execute(query)).all()
+        return build_page(list(rows), limit, order_by)
\ No newline at end of file
@@ -1,53 +1,113 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+import json
+from typing import Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
+from app.dependencies import get_current_user
 from app.models.products import ProductModel
 from app.models.orders import OrderModel
 from app.models.users import UserModel
-from app.schemas.product_schema import Product, ProductCreate, ProductUpdate
+from app.schemas.product_schema import (
+    Product,
+    ProductCreate,
+    ProductUpdate,
+    ProductBulkUpdate,
+    ProductBulkResult
+)
 from app.schemas.order_schema import OrderResponse
-from app.repositories.product_repository import ProductRepository
-from app.services.product_service import ProductService
+from app.repositories.product_repository import AsyncProductRepository
+from app.repositories.user_repository import AsyncUserRepository
+from app.services.cart_service import user_cart_ids
+from app.services.product_service import AsyncProductService
+from app.utils.cache import catalog_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.pagination import set_next_cursor
+from app.utils.role_registry import ADMIN_ROLE, role_registry
+from app.utils.tokens import TokenUser
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def get_product_service(db: Session = Depends(get_db)) -> ProductService:
-    product_repository = ProductRepository(db)
-    return ProductService(product_repository)
+def get_product_service(db: AsyncSession = Depends(get_async_db)) -> AsyncProductService:
+    product_repository = AsyncProductRepository(db)
+    return AsyncProductService(product_repository)
 
 
-def check_admin(user_id: int = Query(...), db: Session = Depends(get_db)):
-    """Проверить что пользователь админ"""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    if user.role_id != 2:  # role_id 2 = admin
+def get_user_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db)
+
+
+async def check_admin(current_user: TokenUser = Depends(get_current_user)) -> TokenUser:
+    """Проверить что пользователь админ (по роли в токене доступа, без запроса к БД)"""
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return user
+    return current_user
+
+
+async def read_bulk_rows(request: Request) -> Tuple[List[Tuple[int, Any]], List[dict]]:
+    """
+    Читает тело пакетного запроса: JSON-массив или NDJSON (Content-Type: application/x-ndjson).
+    Возвращает пары (номер строки, значение) и ошибки разбора отдельных строк NDJSON.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    rows, errors = [], []
+    
+    if "ndjson" in content_type or "jsonl" in content_type:
+        lines = [line for line in body.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                rows.append((index, json.loads(line)))
+            except ValueError as e:
+                errors.append({"index": index, "error": f"Invalid JSON: {e}"})
+        return rows, errors
+    
+    try:
+        payload = json.loads(body or b"[]")
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+    return list(enumerate(payload)), errors
+
+
+def validate_bulk_rows(rows: List[Tuple[int, Any]], schema, errors: List[dict], **dump_options):
+    """Валидирует каждую строку схемой; невалидные строки добавляются в errors"""
+    valid = []
+    for index, raw in rows:
+        try:
+            valid.append((index, schema.model_validate(raw).dict(**dump_options)))
+        except ValidationError as e:
+            errors.append({"index": index, "error": e.errors(include_url=False, include_context=False)})
+    return valid
+
+
+def merge_bulk_errors(result: dict, errors: List[dict]) -> dict:
+    result["errors"] = sorted(errors + result["errors"], key=lambda error: error["index"])
+    return result
 
 
 # ===== ПОЛУЧЕНИЕ ОБЩЕЙ ИНФОРМАЦИИ =====
 
 @router.get("/dashboard")
 async def admin_dashboard(
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    admin_user: TokenUser = Depends(check_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Получить генеральную информацию для дашборда админа.
     """
-    products_count = db.query(ProductModel).count()
-    users_count = db.query(UserModel).count()
-    admin_count = db.query(UserModel).filter(UserModel.role_id == 2).count()
+    products_count = await db.scalar(select(func.count()).select_from(ProductModel))
+    users_count = await db.scalar(select(func.count()).select_from(UserModel))
+    admin_role_id = role_registry.id_by_name(ADMIN_ROLE)
+    admin_count = await db.scalar(
+        select(func.count()).select_from(UserModel).where(UserModel.role_id == admin_role_id)
+    ) if admin_role_id is not None else 0
     
     return {
         "total_products": products_count,
@@ -56,47 +116,128 @@ async def admin_dashboard(
     }
 
 
+@router.get("/cache/stats")
+async def admin_cache_stats(
+    admin_user: TokenUser = Depends(check_admin)
+):
+    """
+    Счётчики кэша каталога: hits, misses, stale_hits, evictions, invalidations.
+    """
+    return catalog_cache.stats()
+
+
+@router.get("/password-hashing/stats")
+async def admin_password_hashing_stats(
+    admin_user: TokenUser = Depends(check_admin)
+):
+    """
+    Пул bcrypt: queued (глубина очереди сейчас), max_queued, in_flight, completed,
+    rejected (503 при заполненной очереди), avg_wait_ms, avg_hash_ms.
+    """
+    return password_hasher.stats()
+
+
 # ===== УПРАВЛЕНИЕ ТОВАРАМИ =====
 
 @router.post("/products", response_model=Product)
 async def admin_create_product(
     product_data: ProductCreate,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db),
-    product_service: ProductService = Depends(get_product_service)
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """
     Создать новый товар (только для админа).
     """
-    return product_service.create(product_data.dict())
+    return await product_service.create(product_data.dict())
+
+
+@router.post("/products/bulk", response_model=ProductBulkResult)
+async def admin_bulk_create_products(
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=5000),
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """
+    Пакетное создание товаров (только для админа).
+    Тело - JSON-массив ProductCreate или NDJSON; ошибки возвращаются построчно.
+    """
+    rows, errors = await read_bulk_rows(request)
+    valid = validate_bulk_rows(rows, ProductCreate, errors)
+    result = await product_service.bulk_create(valid, chunk_size)
+    return merge_bulk_errors(result, errors)
+
+
+@router.put("/products/bulk", response_model=ProductBulkResult)
+async def admin_bulk_update_products(
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=5000),
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """
+    Пакетное обновление товаров (только для админа).
+    Каждая строка - поля ProductUpdate плюс обязательный id.
+    """
+    rows, errors = await read_bulk_rows(request)
+    valid = validate_bulk_rows(rows, ProductBulkUpdate, errors, exclude_unset=True)
+    result = await product_service.bulk_update(valid, chunk_size)
+    return merge_bulk_errors(result, errors)
+
+
+@router.delete("/products/bulk", response_model=ProductBulkResult)
+async def admin_bulk_delete_products(
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=5000),
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
+):
+    """
+    Пакетное удаление товаров (только для админа).
+    Каждая строка - id товара или объект {"id": ...}.
+    """
+    rows, errors = await read_bulk_rows(request)
+    ids = []
+    for index, raw in rows:
+        product_id = raw.get("id") if isinstance(raw, dict) else raw
+        if isinstance(product_id, int) and not isinstance(product_id, bool):
+            ids.append((index, product_id))
+        else:
+            errors.append({"index": index, "error": "Expected a product id"})
+    result = await product_service.bulk_delete(ids, chunk_size)
+    return merge_bulk_errors(result, errors)
 
 
 @router.get("/products", response_model=List[Product])
 async def admin_get_products(
-    user_id: int = Query(...),
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    admin_user: UserModel = Depends(check_admin),
-    product_service: ProductService = Depends(get_product_service)
+    cursor: Optional[str] = Query(None),
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """
     Получить все товары (только для админа).
+    С параметром cursor используется keyset-пагинация (заголовок X-Next-Cursor).
     """
-    return product_service.get_all(skip, limit)
+    if cursor is not None:
+        products, next_cursor = await product_service.get_page(cursor, limit)
+        set_next_cursor(response, next_cursor)
+        return products
+    return await product_service.get_all(skip, limit)
 
 
 @router.get("/products/{product_id}", response_model=Product)
 async def admin_get_product(
     product_id: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    product_service: ProductService = Depends(get_product_service)
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """
     Получить детали товара (только для админа).
     """
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,34 +250,31 @@ async def admin_get_product(
 async def admin_update_product(
     product_id: int,
     product_data: ProductUpdate,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    product_service: ProductService = Depends(get_product_service)
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """
     Обновить товар (только для админа).
     """
-    product = product_service.get(product_id)
+    product = await product_service.update_returning(product_id, product_data.dict(exclude_unset=True))
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    
-    return product_service.update(product_id, product_data.dict(exclude_unset=True))
+    return product
 
 
 @router.delete("/products/{product_id}")
 async def admin_delete_product(
     product_id: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    product_service: ProductService = Depends(get_product_service)
+    admin_user: TokenUser = Depends(check_admin),
+    product_service: AsyncProductService = Depends(get_product_service)
 ):
     """
     Удалить товар (только для админа).
     """
-    success = product_service.delete(product_id)
+    success = await product_service.delete_returning(product_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -149,16 +287,23 @@ async def admin_delete_product(
 
 @router.get("/users", response_model=List[dict])
 async def admin_get_users(
-    user_id: int = Query(...),
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    email: Optional[str] = Query(None, min_length=1, description="Префикс email"),
+    name: Optional[str] = Query(None, min_length=1, description="Префикс имени"),
+    admin_user: TokenUser = Depends(check_admin),
+    user_repository: AsyncUserRepository = Depends(get_user_repository)
 ):
     """
     Получить всех пользователей (только для админа).
+    Один SELECT на страницу при любом limit: keyset-пагинация (следующая страница -
+    заголовок X-Next-Cursor), поиск по префиксу email или имени идёт по индексу,
+    имя роли - из справочника ролей.
     """
-    users = db.query(UserModel).offset(skip).limit(limit).all()
+    users, next_cursor = await user_repository.search_page(cursor, limit, email, name, skip)
+    set_next_cursor(response, next_cursor)
     
     return [
         {
@@ -166,7 +311,7 @@ async def admin_get_users(
             "name": user.name,
             "email": user.email,
             "role_id": user.role_id,
-            "role_name": user.role.name if user.role else "Unknown"
+            "role_name": role_registry.name(user.role_id) or "Unknown"
         }
         for user in users
     ]
@@ -175,14 +320,13 @@ async def admin_get_users(
 @router.get("/users/{user_id_param}", response_model=dict)
 async def admin_get_user(
     user_id_param: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    admin_user: TokenUser = Depends(check_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Получить детали пользователя (только для админа).
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id_param).first()
+    user = await db.get(UserModel, user_id_param)
     
     if not user:
         raise HTTPException(
@@ -195,21 +339,20 @@ async def admin_get_user(
         "name": user.name,
         "email": user.email,
         "role_id": user.role_id,
-        "role_name": user.role.name if user.role else "Unknown"
+        "role_name": role_registry.name(user.role_id) or "Unknown"
     }
 
 
 @router.delete("/users/{user_id_param}")
 async def admin_delete_user(
     user_id_param: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    admin_user: TokenUser = Depends(check_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Удалить пользователя (только для админа).
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id_param).first()
+    user = await db.get(UserModel, user_id_param)
     
     if not user:
         raise HTTPException(
@@ -217,7 +360,9 @@ async def admin_delete_user(
             detail="User not found"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    # Корзина удалена вместе с пользователем - кэшированный id больше не действителен
+    user_cart_ids.pop(user_id_param)
     
     return {"message": f"User {user.name} deleted successfully"}
@@ -1,10 +1,15 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db
-from app.schemas import AuthorListing, AuthorListingCreate, AuthorListingUpdate
+from app.schemas import AuthorListing, AuthorListingCreate, AuthorListingUpdate, AuthorListingForViewer, AuthorListingDetail
+from app.dependencies import get_optional_user, get_review_service, get_viewer_state_service
+from app.services.review_service import ReviewService
+from app.services.viewer_state_service import ViewerStateService
+from app.utils.tokens import TokenUser
 from app.services.author_listing_service import AuthorListingService
 from app.repositories.author_listing_repository import AuthorListingRepository
+from app.utils.pagination import set_next_cursor, set_total_count
 
 router = APIRouter(prefix="/author-listings", tags=["author-listings"])
 
@@ -12,33 +17,60 @@ def get_author_listing_service(db: Session = Depends(get_db)) -> AuthorListingSe
     author_listing_repository = AuthorListingRepository(db)
     return AuthorListingService(author_listing_repository)
 
-@router.get("/", response_model=List[AuthorListing])
+@router.get("/", response_model=List[AuthorListingForViewer])
 def get_author_listings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
     topic: str = None,
     active_only: bool = True,
-    author_listing_service: AuthorListingService = Depends(get_author_listing_service)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    author_listing_service: AuthorListingService = Depends(get_author_listing_service),
+    viewer_state_service: ViewerStateService = Depends(get_viewer_state_service),
+    viewer: Optional[TokenUser] = Depends(get_optional_user)
 ):
+    filters = {}
     if user_id:
-        return author_listing_service.get_by_user(user_id, skip, limit)
+        filters["user_id"] = user_id
+    elif topic:
+        filters["topics_games"] = topic
+    elif active_only:
+        filters["status"] = "active"
+    
+    if include_total:
+        set_total_count(response, author_listing_service.count(**filters))
+    
+    if cursor is not None:
+        listings, next_cursor = author_listing_service.get_page(cursor, limit, **filters)
+        set_next_cursor(response, next_cursor)
+    elif user_id:
+        listings = author_listing_service.get_by_user(user_id, skip, limit)
     elif topic:
-        return author_listing_service.get_by_topic(topic, skip, limit)
+        listings = author_listing_service.get_by_topic(topic, skip, limit)
     elif active_only:
-        return author_listing_service.get_active_listings(skip, limit)
+        listings = author_listing_service.get_active_listings(skip, limit)
     else:
-        return author_listing_service.get_all(skip, limit)
+        listings = author_listing_service.get_all(skip, limit)
+    
+    # С токеном доступа к каждому объявлению добавляются is_favorited/in_cart его владельца
+    if viewer is not None:
+        return viewer_state_service.annotate(viewer.id, "author_listing", listings, AuthorListingForViewer)
+    return listings
 
-@router.get("/{listing_id}", response_model=AuthorListing)
+@router.get("/{listing_id}", response_model=AuthorListingDetail)
 def get_author_listing(
     listing_id: int,
-    author_listing_service: AuthorListingService = Depends(get_author_listing_service)
+    author_listing_service: AuthorListingService = Depends(get_author_listing_service),
+    review_service: ReviewService = Depends(get_review_service)
 ):
     listing = author_listing_service.get(listing_id)
     if not listing:
         raise HTTPException(status_code=404, detail="Author listing not found")
-    return listing
+    return AuthorListingDetail.model_validate(listing, from_attributes=True).model_copy(
+        update={"rating_summary": review_service.get_rating_summary("author_listing", listing_id)}
+    )
 
 @router.post("/", response_model=AuthorListing)
 def create_author_listing(
@@ -53,18 +85,17 @@ def update_author_listing(
     listing_data: AuthorListingUpdate,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    listing = author_listing_service.get(listing_id)
+    listing = author_listing_service.update_returning(listing_id, listing_data.dict(exclude_unset=True))
     if not listing:
         raise HTTPException(status_code=404, detail="Author listing not found")
-    
-    return author_listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
+    return listing
 
 @router.delete("/{listing_id}")
 def delete_author_listing(
     listing_id: int,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    success = author_listing_service.delete(listing_id)
+    success = author_listing_service.delete_returning(listing_id)
     if not success:
         raise HTTPException(status_code=404, detail="Author listing not found")
     return {"message": "Author listing deleted successfully"}
\ No newline at end of file
@@ -1,65 +1,66 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.schemas.cart_schema import Cart, CartItem, CartItemCreate, CartItemUpdate
+from app.database.db_manager import DBManager, get_db_manager
+from app.schemas.cart_schema import (
+    Cart,
+    CartItem,
+    CartItemCreate,
+    CartItemUpdate,
+    CartBulkUpdate,
+    CartState
+)
 from app.services.cart_service import CartService
-from app.repositories.cart_repository import CartRepository
-from app.repositories.cart_item_repository import CartItemRepository
-from app.models.products import ProductModel
-from app.models.listing import ListingModel
-from app.models.author_listing import AuthorListingModel
+from app.utils.tokens import get_token_user
 
 router = APIRouter(prefix="/carts", tags=["carts"])
 
-def get_cart_service(db: Session = Depends(get_db)) -> CartService:
-    cart_repository = CartRepository(db)
-    cart_item_repository = CartItemRepository(db)
-    return CartService(cart_repository, cart_item_repository)
+def get_cart_service(db: DBManager = Depends(get_db_manager)) -> CartService:
+    return CartService(db.carts, db.cart_items)
 
-# Получаем корзину текущего пользователя (из сессии или JWT токена)
-async def get_current_user_id(request: Request):
-    # В реальном приложении здесь должна быть аутентификация
-    # Например, через JWT токен или сессию
-    # Пока используем заглушку
-    user_id = request.headers.get("X-User-Id")
-    if not user_id:
-        # Для демо - используем 1, но в реальности нужно требовать авторизацию
-        raise HTTPException(status_code=401, detail="User not authenticated")
-    return int(user_id)
+# Получаем корзину текущего пользователя по токену доступа
+async def get_current_user_id(request: Request) -> int:
+    """id пользователя из Authorization: Bearer <token>; проверка без запросов к БД, иначе 401"""
+    return get_token_user(request).id
 
 @router.get("/my", response_model=Cart)
 async def get_my_cart(
     request: Request,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Получить корзину текущего пользователя"""
     user_id = await get_current_user_id(request)
-    return cart_service.get_or_create_user_cart(user_id)
+    cart = await cart_service.get_or_create_user_cart(user_id)
+    await db.commit()
+    return cart
 
 @router.get("/my/items", response_model=List[CartItem])
 async def get_my_cart_items(
     request: Request,
     skip: int = 0,
     limit: int = 100,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Получить элементы корзины текущего пользователя"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
-    return cart_service.get_cart_items(cart.id, skip, limit)
+    cart_id = await cart_service.get_user_cart_id(user_id)
+    items = await cart_service.get_cart_items(cart_id, skip, limit)
+    await db.commit()
+    return items
 
 @router.get("/my/items/detailed")
 async def get_my_cart_items_detailed(
     request: Request,
-    db: Session = Depends(get_db),
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Получить элементы корзины с полными данными о товарах"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart_id = await cart_service.get_user_cart_id(user_id)
     
-    items = cart_service.get_cart_items(cart.id)
+    # Товары подгружаются пакетно (selectinload), а не отдельным запросом на элемент
+    items = await cart_service.get_cart_items_detailed(cart_id)
     
     # Обогащаем данные информацией о товарах
     detailed_items = []
@@ -80,44 +81,42 @@ async def get_my_cart_items_detailed(
             "category": ""
         }
         
-        # Загружаем полные данные товара в зависимости от типа
-        if item.item_type == 'product' and item.product_id:
-            product = db.query(ProductModel).filter(ProductModel.id == item.product_id).first()
-            if product:
-                item_data["title"] = product.title
-                item_data["description"] = product.description or ""
-                item_data["image_url"] = product.image_url or "https://via.placeholder.com/120x90?text=Product"
-                item_data["category"] = product.category
+        if item.item_type == 'product' and item.product:
+            product = item.product
+            item_data["title"] = product.title
+            item_data["description"] = product.description or ""
+            item_data["image_url"] = product.image_url or "https://via.placeholder.com/120x90?text=Product"
+            item_data["category"] = product.category
         
-        elif item.item_type == 'listing' and item.listing_id:
-            listing = db.query(ListingModel).filter(ListingModel.id == item.listing_id).first()
-            if listing:
-                item_data["title"] = listing.title
-                item_data["description"] = listing.game_topic
-                item_data["image_url"] = listing.image_url or "https://via.placeholder.com/120x90?text=Listing"
-                item_data["category"] = "Listing"
+        elif item.item_type == 'listing' and item.listing:
+            listing = item.listing
+            item_data["title"] = listing.title
+            item_data["description"] = listing.game_topic
+            item_data["image_url"] = listing.image_url or "https://via.placeholder.com/120x90?text=Listing"
+            item_data["category"] = "Listing"
         
-        elif item.item_type == 'author_listing' and item.author_listing_id:
-            author_listing = db.query(AuthorListingModel).filter(AuthorListingModel.id == item.author_listing_id).first()
-            if author_listing:
-                item_data["title"] = author_listing.title
-                item_data["description"] = ""
-                item_data["image_url"] = author_listing.image_url or "https://via.placeholder.com/120x90?text=Author+Listing"
-                item_data["category"] = "Author Publication"
+        elif item.item_type == 'author_listing' and item.author_listing:
+            author_listing = item.author_listing
+            item_data["title"] = author_listing.title
+            item_data["description"] = ""
+            item_data["image_url"] = author_listing.image_url or "https://via.placeholder.com/120x90?text=Author+Listing"
+            item_data["category"] = "Author Publication"
         
         detailed_items.append(item_data)
     
+    await db.commit()
     return detailed_items
 
 @router.post("/my/items", response_model=CartItem)
 async def add_item_to_my_cart(
     request: Request,
     item_data: CartItemCreate,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Добавить товар в корзину текущего пользователя"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart_id = await cart_service.get_user_cart_id(user_id)
     
     # Логируем полученные данные для отладки
     print("=== ДАННЫЕ ОТ ФРОНТЕНДА ===")
@@ -159,7 +158,7 @@ async def add_item_to_my_cart(
     
     # Подготавливаем данные для сервиса
     item_dict = {
-        'cart_id': cart.id,
+        'cart_id': cart_id,
         'item_type': item_data.item_type.value if hasattr(item_data.item_type, 'value') else item_data.item_type,
         id_field: item_id,
         'item_id': item_id,
@@ -172,66 +171,101 @@ async def add_item_to_my_cart(
     print("===========================")
     
     # Передаем в сервис
-    return cart_service.add_item_to_cart(cart.id, item_dict)
+    cart_item = await cart_service.add_item_to_cart(cart_id, item_dict)
+    await db.commit()
+    return cart_item
+
+@router.post("/my/items/bulk", response_model=CartState)
+async def bulk_update_my_cart(
+    request: Request,
+    changes: CartBulkUpdate,
+    db: DBManager = Depends(get_db_manager),
+    cart_service: CartService = Depends(get_cart_service)
+):
+    """
+    Пакетно изменить корзину одним запросом и одной транзакцией:
+    add - новые позиции, update - количества (0 удаляет), remove - id позиций.
+    Возвращает новое состояние корзины с итогами.
+    """
+    user_id = await get_current_user_id(request)
+    cart_id = await cart_service.get_user_cart_id(user_id)
+    
+    state = await cart_service.apply_bulk_changes(
+        cart_id,
+        additions=[item.dict() for item in changes.add],
+        updates=[change.dict() for change in changes.update],
+        removals=changes.remove
+    )
+    await db.commit()
+    return state
 
 @router.put("/my/items/{item_id}", response_model=CartItem)
 async def update_my_cart_item(
     request: Request,
     item_id: int,
     item_data: CartItemUpdate,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Обновить товар в корзине текущего пользователя"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart_id = await cart_service.get_user_cart_id(user_id)
     
     # Проверяем, что товар принадлежит корзине пользователя
-    item = cart_service.cart_item_repository.get(item_id)
-    if not item or item.cart_id != cart.id:
+    item = await cart_service.cart_item_repository.get(item_id)
+    if not item or item.cart_id != cart_id:
         raise HTTPException(status_code=404, detail="Cart item not found")
     
-    return cart_service.update_cart_item_quantity(item_id, item_data.quantity or 1)
+    updated_item = await cart_service.update_cart_item_quantity(item_id, item_data.quantity or 1)
+    await db.commit()
+    return updated_item
 
 @router.delete("/my/items/{item_id}")
 async def remove_item_from_my_cart(
     request: Request,
     item_id: int,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Удалить товар из корзины текущего пользователя"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart_id = await cart_service.get_user_cart_id(user_id)
     
     # Проверяем, что товар принадлежит корзине пользователя
-    item = cart_service.cart_item_repository.get(item_id)
-    if not item or item.cart_id != cart.id:
+    item = await cart_service.cart_item_repository.get(item_id)
+    if not item or item.cart_id != cart_id:
         raise HTTPException(status_code=404, detail="Cart item not found")
     
-    success = cart_service.remove_item_from_cart(item_id)
+    success = await cart_service.remove_item_from_cart(item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Cart item not found")
+    await db.commit()
     return {"message": "Item removed from cart"}
 
 @router.delete("/my/clear")
 async def clear_my_cart(
     request: Request,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
     """Очистить корзину текущего пользователя"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart_id = await cart_service.get_user_cart_id(user_id)
     
-    cart_service.clear_cart(cart.id)
+    await cart_service.clear_cart(cart_id)
+    await db.commit()
     return {"message": "Cart cleared successfully"}
 
 @router.get("/my/total")
 async def get_my_cart_total(
     request: Request,
+    db: DBManager = Depends(get_db_manager),
     cart_service: CartService = Depends(get_cart_service)
 ):
-    """Получить общую стоимость корзины"""
+    """Получить общую стоимость и число позиций корзины"""
     user_id = await get_current_user_id(request)
-    cart = cart_service.get_or_create_user_cart(user_id)
+    cart = await cart_service.get_or_create_user_cart(user_id)
     
-    total = cart_service.get_cart_total(cart.id)
-    return {"total": total}
+    totals = await cart_service.get_cart_total(cart.id, cart)
+    await db.commit()
+    return totals
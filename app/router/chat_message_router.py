@@ -1,17 +1,33 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from starlette.websockets import WebSocketState
+from app.database.database import SessionLocal, get_db
 from app.schemas import ChatMessage, ChatMessageCreate, ChatMessageUpdate
+from app.services.chat_archive_service import ChatArchiveService
 from app.services.chat_message_service import ChatMessageService
+from app.repositories.chat_archive_repository import ChatArchiveRepository
 from app.repositories.chat_message_repository import ChatMessageRepository
+from app.utils.chat_hub import ChatSubscription, chat_hub
+from app.utils.pagination import set_next_cursor
+from app.exceptions.chat_exceptions import ChatMessageNotFoundException
+from app.exceptions.user_exceptions import InvalidTokenException
+from app.utils.tokens import decode_access_token, get_bearer_token
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+BACKFILL_PAGE_SIZE = 100
+
 def get_chat_message_service(db: Session = Depends(get_db)) -> ChatMessageService:
     chat_message_repository = ChatMessageRepository(db)
     return ChatMessageService(chat_message_repository)
 
+def get_chat_archive_service(db: Session = Depends(get_db)) -> ChatArchiveService:
+    return ChatArchiveService(ChatMessageRepository(db), ChatArchiveRepository(db))
+
 @router.get("/user/{user_id}", response_model=List[ChatMessage])
 def get_user_messages(
     user_id: int,
@@ -24,12 +40,148 @@ def get_user_messages(
 @router.get("/user/{user_id}/conversation", response_model=List[ChatMessage])
 def get_conversation(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    tail: bool = False,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
+    """
+    История диалога по возрастанию времени. after_id - только сообщения после
+    указанного (дочитка при повторном открытии), before_id - более ранние (прокрутка
+    вверх), tail=true - последние limit сообщений без подсчёта и OFFSET.
+    Все три режима идут по индексу (user_id, sent_at, id); страница короче limit -
+    дальше сообщений нет.
+    """
+    if cursor is not None:
+        messages, next_cursor = chat_message_service.get_conversation_page(user_id, cursor, limit)
+        set_next_cursor(response, next_cursor)
+        return messages
+    if tail or after_id is not None or before_id is not None:
+        return chat_message_service.get_conversation_window(user_id, limit, after_id, before_id)
     return chat_message_service.get_conversation(user_id, skip, limit)
 
+@router.get("/user/{user_id}/archive", response_model=List[ChatMessage])
+def get_archived_messages(
+    user_id: int,
+    before_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    chat_archive_service: ChatArchiveService = Depends(get_chat_archive_service)
+):
+    """
+    Архив диалога (сообщения старше CHAT_ARCHIVE_AFTER_DAYS) по возрастанию времени:
+    последние limit архивных сообщений перед before_id. Сегменты распаковываются
+    по запросу; страница короче limit - архив прочитан до начала.
+    """
+    return chat_archive_service.get_archived_messages(user_id, before_id, limit)
+
+@router.websocket("/ws/{user_id}")
+async def chat_websocket(
+    websocket: WebSocket,
+    user_id: int,
+    after_id: Optional[int] = None,
+    token: Optional[str] = None
+):
+    """
+    Push сообщений диалога user_id: сообщения пользователя и ответы поддержки
+    (is_from_user=False) приходят по мере отправки - через POST /chat/ или этот сокет -
+    JSON-объектами схемы ChatMessage.
+    after_id - id последнего полученного сообщения при переподключении: сначала
+    приходят только пропущенные сообщения, затем новые, без повторов.
+    Входящий кадр - JSON полей ChatMessageCreate без user_id: сообщение сохраняется
+    и рассылается всем подключениям диалога, включая отправителя.
+    Токен доступа - параметр token (браузерный WebSocket не передаёт заголовки) или
+    Authorization: Bearer; диалог открыт его владельцу и администратору, остальным
+    подключение закрывается с кодом 1008.
+    """
+    await websocket.accept()
+    if not _can_open_chat(websocket, user_id, token):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # Подписка до дочитки: сообщения, отправленные во время неё, ждут в очереди
+    subscription = chat_hub.subscribe(user_id)
+    pusher = None
+    try:
+        skip_through_id = None
+        if after_id is not None:
+            skip_through_id = await _send_missed_messages(websocket, user_id, after_id)
+        pusher = asyncio.create_task(_push_messages(websocket, subscription, skip_through_id))
+        while websocket.application_state == WebSocketState.CONNECTED:
+            try:
+                payload = json.loads(await websocket.receive_text())
+                message_data = ChatMessageCreate.model_validate({**payload, "user_id": user_id})
+            except (ValueError, TypeError) as e:
+                # Битый JSON или ошибка валидации: отвечаем ошибкой, подключение остаётся
+                await websocket.send_json({"error": str(e)})
+                continue
+            await run_in_threadpool(_save_message, user_id, message_data.model_dump())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        chat_hub.unsubscribe(subscription)
+        if pusher is not None:
+            pusher.cancel()
+
+def _can_open_chat(websocket: WebSocket, user_id: int, token: Optional[str]) -> bool:
+    try:
+        token_user = decode_access_token(token if token is not None else get_bearer_token(websocket))
+    except InvalidTokenException:
+        return False
+    return token_user.id == user_id or token_user.is_admin
+
+async def _send_missed_messages(websocket: WebSocket, user_id: int, after_id: int) -> int:
+    """Сообщения после after_id страницами; возвращает id последнего отправленного"""
+    last_id = after_id
+    while True:
+        try:
+            messages = await run_in_threadpool(_load_window, user_id, last_id)
+        except ChatMessageNotFoundException:
+            # Опорное сообщение удалено: отдаём хвост диалога, повторы клиент отсеет по id
+            messages = await run_in_threadpool(_load_window, user_id, None)
+        for message in messages:
+            await websocket.send_text(message.model_dump_json())
+        if messages:
+            last_id = messages[-1].id
+        if len(messages) < BACKFILL_PAGE_SIZE:
+            return last_id
+
+async def _push_messages(
+    websocket: WebSocket,
+    subscription: ChatSubscription,
+    skip_through_id: Optional[int] = None
+) -> None:
+    try:
+        while True:
+            payload = await subscription.get()
+            if payload is None:
+                # Очередь переполнена: клиент переподключится с after_id и дочитает пропущенное
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            if skip_through_id is not None:
+                # Сообщение, опубликованное во время дочитки, могло уже уйти в ней
+                if json.loads(payload)["id"] <= skip_through_id:
+                    continue
+                skip_through_id = None
+            await websocket.send_text(payload)
+    except (WebSocketDisconnect, RuntimeError):
+        # Клиент отключился во время отправки; подписку снимет chat_websocket
+        pass
+
+def _load_window(user_id: int, after_id: Optional[int]) -> List[ChatMessage]:
+    with SessionLocal() as db:
+        messages = ChatMessageService(ChatMessageRepository(db)).get_conversation_window(
+            user_id, BACKFILL_PAGE_SIZE, after_id
+        )
+        return [ChatMessage.model_validate(message) for message in messages]
+
+def _save_message(user_id: int, message_data: dict) -> None:
+    # Своя короткая сессия на сообщение: простаивающее подключение не держит сессию БД
+    with SessionLocal() as db:
+        ChatMessageService(ChatMessageRepository(db)).send_message(user_id, message_data)
+
 @router.get("/{message_id}", response_model=ChatMessage)
 def get_message(
     message_id: int,
@@ -53,18 +205,17 @@ def update_message(
     message_data: ChatMessageUpdate,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    message = chat_message_service.get(message_id)
+    message = chat_message_service.update_returning(message_id, message_data.dict(exclude_unset=True))
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
-    
-    return chat_message_service.update(message_id, message_data.dict(exclude_unset=True))
+    return message
 
 @router.delete("/{message_id}")
 def delete_message(
     message_id: int,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    success = chat_message_service.delete(message_id)
+    success = chat_message_service.delete_returning(message_id)
     if not success:
         raise HTTPException(status_code=404, detail="Message not found")
     return {"message": "Message deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.schemas.favorite_schema import Favorite, FavoriteCreate
 from app.services.favorite_service import FavoriteService
 from app.repositories.favorite_repository import FavoriteRepository
+from app.utils.pagination import set_next_cursor
 from app.exceptions.favorite_exceptions import (
     FavoriteNotFoundException,
     FavoriteAlreadyExistsException,
@@ -21,12 +22,34 @@ def get_favorite_service(db: Session = Depends(get_db)) -> FavoriteService:
 @router.get("/user/{user_id}", response_model=List[Favorite])
 def get_user_favorites(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
+    if cursor is not None:
+        favorites, next_cursor = favorite_service.get_user_favorites_page(user_id, cursor, limit)
+        set_next_cursor(response, next_cursor)
+        return favorites
     return favorite_service.get_user_favorites(user_id, skip, limit)
 
+@router.get("/user/{user_id}/count")
+def get_user_favorites_count(
+    user_id: int,
+    favorite_service: FavoriteService = Depends(get_favorite_service)
+):
+    """Количество избранного пользователя: строка счётчика или SELECT COUNT(*)"""
+    return {"user_id": user_id, "count": favorite_service.get_user_favorites_count(user_id)}
+
+@router.get("/user/{user_id}/exists")
+def check_user_favorites_exist(
+    user_id: int,
+    favorite_service: FavoriteService = Depends(get_favorite_service)
+):
+    """Есть ли у пользователя избранное: строка счётчика или SELECT EXISTS"""
+    return {"user_id": user_id, "has_favorites": favorite_service.user_has_favorites(user_id)}
+
 @router.post("/", response_model=Favorite)
 def add_to_favorites(
     favorite_data: FavoriteCreate,
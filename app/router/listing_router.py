@@ -1,11 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db
 # Исправленный импорт - из модуля listing_schema
-from app.schemas.listing_schema import Listing, ListingCreate, ListingUpdate
+from app.schemas.listing_schema import Listing, ListingCreate, ListingUpdate, ListingForViewer, ListingDetail
+from app.dependencies import get_optional_user, get_review_service, get_viewer_state_service
+from app.services.review_service import ReviewService
+from app.services.viewer_state_service import ViewerStateService
+from app.utils.tokens import TokenUser
 from app.services.listing_service import ListingService
 from app.repositories.listing_repository import ListingRepository
+from app.utils.pagination import set_next_cursor, set_total_count
 from app.exceptions.listing_exceptions import (
     ListingNotFoundException,
     ListingValidationException,
@@ -18,33 +23,60 @@ def get_listing_service(db: Session = Depends(get_db)) -> ListingService:
     listing_repository = ListingRepository(db)
     return ListingService(listing_repository)
 
-@router.get("/", response_model=List[Listing])
+@router.get("/", response_model=List[ListingForViewer])
 def get_listings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
     game_topic: str = None,
     active_only: bool = True,
-    listing_service: ListingService = Depends(get_listing_service)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    listing_service: ListingService = Depends(get_listing_service),
+    viewer_state_service: ViewerStateService = Depends(get_viewer_state_service),
+    viewer: Optional[TokenUser] = Depends(get_optional_user)
 ):
+    filters = {}
     if user_id:
-        return listing_service.get_by_user(user_id, skip, limit)
+        filters["user_id"] = user_id
+    elif game_topic:
+        filters["game_topic"] = game_topic
+    elif active_only:
+        filters["status"] = "active"
+    
+    if include_total:
+        set_total_count(response, listing_service.count(**filters))
+    
+    if cursor is not None:
+        listings, next_cursor = listing_service.get_page(cursor, limit, **filters)
+        set_next_cursor(response, next_cursor)
+    elif user_id:
+        listings = listing_service.get_by_user(user_id, skip, limit)
     elif game_topic:
-        return listing_service.get_by_game_topic(game_topic, skip, limit)
+        listings = listing_service.get_by_game_topic(game_topic, skip, limit)
     elif active_only:
-        return listing_service.get_active_listings(skip, limit)
+        listings = listing_service.get_active_listings(skip, limit)
     else:
-        return listing_service.get_all(skip, limit)
+        listings = listing_service.get_all(skip, limit)
+    
+    # С токеном доступа к каждому объявлению добавляются is_favorited/in_cart его владельца
+    if viewer is not None:
+        return viewer_state_service.annotate(viewer.id, "listing", listings, ListingForViewer)
+    return listings
 
-@router.get("/{listing_id}", response_model=Listing)
+@router.get("/{listing_id}", response_model=ListingDetail)
 def get_listing(
     listing_id: int,
-    listing_service: ListingService = Depends(get_listing_service)
+    listing_service: ListingService = Depends(get_listing_service),
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    try:
-        return listing_service.get(listing_id)
-    except ListingNotFoundException as e:
-        raise e
+    listing = listing_service.get(listing_id)
+    if not listing:
+        raise ListingNotFoundException(listing_id)
+    return ListingDetail.model_validate(listing, from_attributes=True).model_copy(
+        update={"rating_summary": review_service.get_rating_summary("listing", listing_id)}
+    )
 
 @router.post("/", response_model=Listing)
 def create_listing(
@@ -63,8 +95,10 @@ def update_listing(
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        listing = listing_service.get(listing_id)
-        return listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
+        listing = listing_service.update_returning(listing_id, listing_data.dict(exclude_unset=True))
+        if not listing:
+            raise ListingNotFoundException(listing_id=listing_id)
+        return listing
     except ListingNotFoundException as e:
         raise e
     except Exception as e:
@@ -76,7 +110,9 @@ def delete_listing(
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        success = listing_service.delete(listing_id)
+        success = listing_service.delete_returning(listing_id)
+        if not success:
+            raise ListingNotFoundException(listing_id=listing_id)
         return {"message": "Listing deleted successfully"}
     except ListingNotFoundException as e:
         raise e
@@ -88,8 +124,9 @@ def update_listing_status(
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        listing = listing_service.get(listing_id)
-        listing_service.update(listing_id, {"status": status})
+        listing = listing_service.update_returning(listing_id, {"status": status})
+        if not listing:
+            raise ListingNotFoundException(listing_id=listing_id)
         return {"message": f"Listing status updated to {status}"}
     except ListingNotFoundException as e:
         raise e
\ No newline at end of file
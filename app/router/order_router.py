@@ -1,10 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.schemas import Order, OrderCreate, OrderUpdate
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -14,12 +15,24 @@ def get_order_service(db: Session = Depends(get_db)) -> OrderService:
 
 @router.get("/", response_model=List[Order])
 def get_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
     status: str = None,
+    cursor: Optional[str] = None,
     order_service: OrderService = Depends(get_order_service)
 ):
+    if cursor is not None:
+        filters = {}
+        if user_id:
+            filters["user_id"] = user_id
+        elif status:
+            filters["status"] = status
+        orders, next_cursor = order_service.get_page(cursor, limit, **filters)
+        set_next_cursor(response, next_cursor)
+        return orders
+    
     if user_id:
         return order_service.get_by_user(user_id, skip, limit)
     elif status:
@@ -50,18 +63,17 @@ def update_order(
     order_data: OrderUpdate,
     order_service: OrderService = Depends(get_order_service)
 ):
-    order = order_service.get(order_id)
+    order = order_service.update_returning(order_id, order_data.dict(exclude_unset=True))
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    
-    return order_service.update(order_id, order_data.dict(exclude_unset=True))
+    return order
 
 @router.delete("/{order_id}")
 def delete_order(
     order_id: int,
     order_service: OrderService = Depends(get_order_service)
 ):
-    success = order_service.delete(order_id)
+    success = order_service.delete_returning(order_id)
     if not success:
         raise HTTPException(status_code=404, detail="Order not found")
     return {"message": "Order deleted successfully"}
@@ -72,9 +84,7 @@ def update_order_status(
     status: str,
     order_service: OrderService = Depends(get_order_service)
 ):
-    order = order_service.get(order_id)
+    order = order_service.update_status(order_id, status)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    
-    order_service.update_status(order_id, status)
     return {"message": f"Order status updated to {status}"}
\ No newline at end of file
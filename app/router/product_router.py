@@ -1,10 +1,15 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
-from app.schemas.product_schema import Product, ProductCreate, ProductUpdate
+from app.schemas.product_schema import Product, ProductCreate, ProductUpdate, ProductForViewer, ProductDetail
+from app.dependencies import get_optional_user, get_review_service, get_viewer_state_service
+from app.services.review_service import ReviewService
+from app.services.viewer_state_service import ViewerStateService
+from app.utils.tokens import TokenUser
+from app.utils.pagination import set_next_cursor, set_total_count
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
 
@@ -20,30 +25,58 @@ def get_product_service(db: Session = Depends(get_db)) -> ProductService:
     product_repository = ProductRepository(db)
     return ProductService(product_repository)
 
-@router.get("/", response_model=List[Product])
+@router.get("/", response_model=List[ProductForViewer])
 def get_products(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
     active_only: bool = True,
-    product_service: ProductService = Depends(get_product_service)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    product_service: ProductService = Depends(get_product_service),
+    viewer_state_service: ViewerStateService = Depends(get_viewer_state_service),
+    viewer: Optional[TokenUser] = Depends(get_optional_user)
 ):
+    filters = {}
     if category:
-        return product_service.get_by_category(category, skip, limit)
+        filters["category"] = category
     elif active_only:
-        return product_service.get_active_products(skip, limit)
+        filters["is_active"] = True
+    
+    # include_total=true добавляет COUNT(*) по тем же фильтрам в заголовок X-Total-Count
+    if include_total:
+        set_total_count(response, product_service.count(**filters))
+    
+    # Передайте cursor (пустой для первой страницы), чтобы включить keyset-пагинацию;
+    # курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    if cursor is not None:
+        products, next_cursor = product_service.get_page(cursor, limit, **filters)
+        set_next_cursor(response, next_cursor)
+    elif category:
+        products = product_service.get_by_category(category, skip, limit)
+    elif active_only:
+        products = product_service.get_active_products(skip, limit)
     else:
-        return product_service.get_all(skip, limit)
+        products = product_service.get_all(skip, limit)
+    
+    # С токеном доступа к каждому товару добавляются is_favorited/in_cart его владельца
+    if viewer is not None:
+        return viewer_state_service.annotate(viewer.id, "product", products, ProductForViewer)
+    return products
 
-@router.get("/{product_id}", response_model=Product)
+@router.get("/{product_id}", response_model=ProductDetail)
 def get_product(
     product_id: int,
-    product_service: ProductService = Depends(get_product_service)
+    product_service: ProductService = Depends(get_product_service),
+    review_service: ReviewService = Depends(get_review_service)
 ):
     product = product_service.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return ProductDetail.model_validate(product, from_attributes=True).model_copy(
+        update={"rating_summary": review_service.get_rating_summary("product", product_id)}
+    )
 
 @router.post("/", response_model=Product)
 def create_product(
@@ -58,18 +91,17 @@ def update_product(
     product_data: ProductUpdate,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    product = product_service.update_returning(product_id, product_data.dict(exclude_unset=True))
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    return product_service.update(product_id, product_data.dict(exclude_unset=True))
+    return product
 
 @router.delete("/{product_id}")
 def delete_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    success = product_service.delete(product_id)
+    success = product_service.delete_returning(product_id)
     if not success:
         raise HTTPException(status_code=404, detail="Product not found")
     return {"message": "Product deleted successfully"}
@@ -79,12 +111,10 @@ def activate_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    # ИСПРАВЛЕНО: is_acctive → is_active
+    product = product_service.update_returning(product_id, {"is_active": True})
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    # ИСПРАВЛЕНО: is_acctive → is_active
-    product_service.update(product_id, {"is_active": True})
     return {"message": "Product activated successfully"}
 
 @router.patch("/{product_id}/deactivate")
@@ -92,10 +122,8 @@ def deactivate_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    # ИСПРАВЛЕНО: is_acctive → is_active
+    product = product_service.update_returning(product_id, {"is_active": False})
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    # ИСПРАВЛЕНО: is_acctive → is_active
-    product_service.update(product_id, {"is_active": False})
     return {"message": "Product deactivated successfully"}
\ No newline at end of file
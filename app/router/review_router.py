@@ -1,136 +1,106 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.schemas.favorite_schema import Favorite, FavoriteCreate
-from app.services.favorite_service import FavoriteService
-from app.repositories.favorite_repository import FavoriteRepository
-from app.exceptions.favorite_exceptions import (
-    FavoriteNotFoundException,
-    FavoriteAlreadyExistsException,
-    FavoriteValidationException
-)
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from app.dependencies import get_review_service
+from app.schemas.review_schema import RatingSummary, Review, ReviewCreate, ReviewUpdate
+from app.services.review_service import ReviewService
+from app.utils.pagination import set_next_cursor
+from app.exceptions.review_exceptions import ReviewNotFoundException
 
-# Создаем роутер - обратите внимание на переменную 'router' (не 'Router')
-router = APIRouter(prefix="/favorites", tags=["favorites"])
+router = APIRouter(prefix="/reviews", tags=["reviews"])
 
-def get_favorite_service(db: Session = Depends(get_db)) -> FavoriteService:
-    favorite_repository = FavoriteRepository(db)
-    return FavoriteService(favorite_repository)
+RATING_COUNT_HEADER = "X-Rating-Count"
+RATING_AVERAGE_HEADER = "X-Rating-Average"
+RATING_HISTOGRAM_HEADER = "X-Rating-Histogram"
+RATING_HEADERS = [RATING_COUNT_HEADER, RATING_AVERAGE_HEADER, RATING_HISTOGRAM_HEADER]
 
-@router.get("/user/{user_id}", response_model=List[Favorite])
-def get_user_favorites(
+
+def set_rating_summary(response: Response, summary: RatingSummary) -> None:
+    """Сводка товара в заголовках ленты: X-Rating-Histogram вида "1=0;2=1;3=0;4=2;5=7" """
+    response.headers[RATING_COUNT_HEADER] = str(summary.count)
+    response.headers[RATING_AVERAGE_HEADER] = str(summary.average)
+    response.headers[RATING_HISTOGRAM_HEADER] = ";".join(
+        f"{rating}={count}" for rating, count in summary.histogram.items()
+    )
+
+@router.get("/user/{user_id}", response_model=List[Review])
+def get_user_reviews(
     user_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=500),
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    """
-    Получить все избранные товары пользователя с пагинацией.
-    """
-    try:
-        return favorite_service.get_user_favorites(user_id, skip, limit)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Отзывы пользователя, новые первыми. Следующая страница - по заголовку X-Next-Cursor"""
+    reviews, next_cursor = review_service.get_user_reviews_page(user_id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return reviews
 
-@router.get("/user/{user_id}/count")
-def get_user_favorites_count(
-    user_id: int,
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+@router.get("/{item_type}/{item_id}", response_model=List[Review])
+def get_item_reviews(
+    item_type: str,
+    item_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    verified_only: bool = False,
+    min_rating: int = Query(1, ge=1, le=5),
+    max_rating: int = Query(5, ge=1, le=5),
+    review_service: ReviewService = Depends(get_review_service)
 ):
     """
-    Получить количество избранных товаров пользователя.
+    Лента отзывов товара/объявления (item_type: product, listing, author_listing),
+    новые первыми, keyset по (created_at, id). Фильтры verified_only и
+    min_rating/max_rating идут по составным индексам ленты.
+    Заголовки: X-Next-Cursor и сводка по всем отзывам товара (X-Rating-*) из rating_summary.
     """
-    try:
-        favorites = favorite_service.get_user_favorites(user_id, 0, 1000)
-        return {"user_id": user_id, "count": len(favorites)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    reviews, next_cursor = review_service.get_item_reviews_page(
+        item_type, item_id, cursor, limit, verified_only, min_rating, max_rating
+    )
+    set_next_cursor(response, next_cursor)
+    set_rating_summary(response, review_service.get_rating_summary(item_type, item_id))
+    return reviews
 
-@router.post("/", response_model=Favorite)
-def add_to_favorites(
-    favorite_data: FavoriteCreate,
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+@router.get("/{item_type}/{item_id}/summary", response_model=RatingSummary)
+def get_item_rating_summary(
+    item_type: str,
+    item_id: int,
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    try:
-        # Проверяем, что указан хотя бы один тип товара
-        if not any([favorite_data.products_id, favorite_data.listing_id, favorite_data.author_listing_id]):
-            raise HTTPException(
-                status_code=400, 
-                detail="At least one of products_id, listing_id, or author_listing_id must be provided"
-            )
-        
-        # Проверяем, не добавлен ли уже товар в избранное
-        filters = {}
-        if favorite_data.products_id:
-            filters["products_id"] = favorite_data.products_id
-        if favorite_data.listing_id:
-            filters["listing_id"] = favorite_data.listing_id
-        if favorite_data.author_listing_id:
-            filters["author_listing_id"] = favorite_data.author_listing_id
-        
-        if favorite_service.is_item_favorited(favorite_data.user_id, **filters):
-            raise FavoriteAlreadyExistsException(
-                user_id=favorite_data.user_id,
-                item_type="product" if favorite_data.products_id else "listing",
-                item_id=favorite_data.products_id or favorite_data.listing_id or favorite_data.author_listing_id
-            )
-        
-        return favorite_service.add_to_favorites(favorite_data.user_id, favorite_data.dict())
-    except FavoriteAlreadyExistsException as e:
-        raise e
-    except Exception as e:
-        raise FavoriteValidationException(detail=str(e))
+    return review_service.get_rating_summary(item_type, item_id)
 
-@router.delete("/{favorite_id}")
-def remove_from_favorites(
-    favorite_id: int,
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+@router.get("/{review_id}", response_model=Review)
+def get_review(
+    review_id: int,
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    try:
-        success = favorite_service.delete(favorite_id)
-        return {"message": "Removed from favorites"}
-    except FavoriteNotFoundException as e:
-        raise e
+    review = review_service.get(review_id)
+    if not review:
+        raise ReviewNotFoundException(review_id)
+    return review
 
-@router.get("/check/{user_id}")
-def check_if_favorited(
-    user_id: int,
-    product_id: int = Query(None),
-    listing_id: int = Query(None),
-    author_listing_id: int = Query(None),
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+@router.post("/", response_model=Review)
+def create_review(
+    review_data: ReviewCreate,
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    """
-    Проверить, добавлен ли товар в избранное у пользователя.
-    """
-    filters = {}
-    if product_id is not None:
-        filters["products_id"] = product_id
-    if listing_id is not None:
-        filters["listing_id"] = listing_id
-    if author_listing_id is not None:
-        filters["author_listing_id"] = author_listing_id
-    
-    if not filters:
-        raise HTTPException(
-            status_code=400,
-            detail="At least one of product_id, listing_id, or author_listing_id must be provided"
-        )
-    
-    is_favorited = favorite_service.is_item_favorited(user_id, **filters)
-    return {"is_favorited": is_favorited}
+    return review_service.create(review_data.dict())
 
-@router.get("/user/{user_id}/exists")
-def check_user_favorites_exist(
-    user_id: int,
-    favorite_service: FavoriteService = Depends(get_favorite_service)
+@router.put("/{review_id}", response_model=Review)
+def update_review(
+    review_id: int,
+    review_data: ReviewUpdate,
+    review_service: ReviewService = Depends(get_review_service)
 ):
-    """
-    Проверить, есть ли у пользователя избранные товары.
-    """
-    try:
-        favorites = favorite_service.get_user_favorites(user_id, 0, 1)
-        return {"user_id": user_id, "has_favorites": len(favorites) > 0}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    review = review_service.update(review_id, review_data.dict(exclude_unset=True))
+    if not review:
+        raise ReviewNotFoundException(review_id)
+    return review
+
+@router.delete("/{review_id}")
+def delete_review(
+    review_id: int,
+    review_service: ReviewService = Depends(get_review_service)
+):
+    if not review_service.delete(review_id):
+        raise ReviewNotFoundException(review_id)
+    return {"message": "Review deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,11 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.database.database import get_db  # Теперь импорт работает
 from app.schemas.role_schema import Role, RoleCreate, RoleUpdate
 from app.services.role_service import RoleService
 from app.repositories.role_repository import RoleRepository
+from app.utils.role_registry import role_registry
 from app.exceptions.role_exceptions import (
     RoleNotFoundException,
     RoleAlreadyExistsException,
@@ -19,21 +20,28 @@ def get_role_service(db: Session = Depends(get_db)) -> RoleService:
 
 @router.get("/", response_model=List[Role])
 def get_roles(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
-    role_service: RoleService = Depends(get_role_service)
+    limit: int = 100
 ):
-    return role_service.get_all(skip, limit)
+    """
+    Роли из справочника в памяти, без запроса к БД. ETag меняется при любой записи
+    в /roles; повторный запрос с If-None-Match получает 304 без тела.
+    """
+    etag = role_registry.etag
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return role_registry.roles()[skip:skip + limit]
 
 @router.get("/{role_id}", response_model=Role)
-def get_role(
-    role_id: int,
-    role_service: RoleService = Depends(get_role_service)
-):
-    try:
-        return role_service.get(role_id)
-    except RoleNotFoundException as e:
-        raise e
+def get_role(role_id: int):
+    role = role_registry.get(role_id)
+    if role is None:
+        raise RoleNotFoundException(role_id=role_id)
+    return role
 
 @router.post("/", response_model=Role)
 def create_role(
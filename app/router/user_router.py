@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.schemas.user_schema import User, UserCreate, UserUpdate
@@ -8,8 +8,11 @@ from app.repositories.user_repository import UserRepository
 from app.exceptions.user_exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
-    InvalidCredentialsException
+    InvalidCredentialsException,
+    TooManyLoginAttemptsException
 )
+from app.config import settings
+from app.utils.rate_limit import login_throttle
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -46,23 +49,23 @@ def get_user_by_email(
     return user
 
 @router.post("/", response_model=User)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return user_service.create_user(user_data)
+        return await user_service.create_user(user_data)
     except UserAlreadyExistsException as e:
         raise e
 
 @router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return user_service.update_user(user_id, user_data.dict(exclude_unset=True))
+        return await user_service.update_user(user_id, user_data.dict(exclude_unset=True))
     except UserNotFoundException as e:
         raise e
     except UserAlreadyExistsException as e:
@@ -80,18 +83,31 @@ def delete_user(
         raise e
 
 @router.post("/authenticate")
-def authenticate(
+async def authenticate(
     email: str,
     password: str,
+    request: Request,
     user_service: UserService = Depends(get_user_service)
 ):
+    """
+    Проверка пароля и выдача токена доступа (access_token передаётся в заголовке
+    Authorization: Bearer). Попытки ограничены по email и IP (429 с Retry-After) до
+    обращения к bcrypt; при заполненной очереди пула хеширования - 503.
+    """
+    retry_after = login_throttle.check(email, request.client.host if request.client else None)
+    if retry_after:
+        raise TooManyLoginAttemptsException(retry_after)
     try:
-        user = user_service.authenticate_user(email, password)
+        user = await user_service.authenticate_user(email, password)
         return {
             "message": "Authenticated successfully", 
             "user_id": user.id,
             "name": user.name,
-            "email": user.email
+            "email": user.email,
+            "role": user_service.get_role_name(user),
+            "access_token": user_service.create_access_token(user),
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         }
     except InvalidCredentialsException as e:
         raise e
\ No newline at end of file
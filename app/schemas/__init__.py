@@ -8,13 +8,13 @@ from .role_schema import Role, RoleCreate, RoleUpdate
 from .user_schema import User, UserCreate, UserUpdate
 
 # Product schemas
-from .product_schema import Product, ProductCreate, ProductUpdate
+from .product_schema import Product, ProductCreate, ProductUpdate, ProductForViewer, ProductDetail
 
 # Listing schemas
-from .listing_schema import Listing, ListingCreate, ListingUpdate
+from .listing_schema import Listing, ListingCreate, ListingUpdate, ListingForViewer, ListingDetail
 
 # Author Listing schemas
-from .author_listing_schema import AuthorListing, AuthorListingCreate, AuthorListingUpdate
+from .author_listing_schema import AuthorListing, AuthorListingCreate, AuthorListingUpdate, AuthorListingForViewer, AuthorListingDetail
 
 # Order schemas
 from .order_schema import Order, OrderCreate, OrderUpdate
@@ -29,7 +29,7 @@ from .cart_item_schema import CartItem, CartItemCreate, CartItemUpdate
 from .favorite_schema import Favorite, FavoriteCreate
 
 # Review schemas
-from .review_schema import Review, ReviewCreate, ReviewUpdate
+from .review_schema import Review, ReviewCreate, ReviewUpdate, RatingSummary
 
 # Order Item schemas
 from .order_item_schema import OrderItem, OrderItemCreate, OrderItemUpdate
@@ -45,13 +45,13 @@ __all__ = [
     "User", "UserCreate", "UserUpdate",
     
     # Product
-    "Product", "ProductCreate", "ProductUpdate",
+    "Product", "ProductCreate", "ProductUpdate", "ProductForViewer", "ProductDetail",
     
     # Listing
-    "Listing", "ListingCreate", "ListingUpdate",
+    "Listing", "ListingCreate", "ListingUpdate", "ListingForViewer", "ListingDetail",
     
     # Author Listing
-    "AuthorListing", "AuthorListingCreate", "AuthorListingUpdate",
+    "AuthorListing", "AuthorListingCreate", "AuthorListingUpdate", "AuthorListingForViewer", "AuthorListingDetail",
     
     # Order
     "Order", "OrderCreate", "OrderUpdate",
@@ -66,7 +66,7 @@ __all__ = [
     "Favorite", "FavoriteCreate",
     
     # Review
-    "Review", "ReviewCreate", "ReviewUpdate",
+    "Review", "ReviewCreate", "ReviewUpdate", "RatingSummary",
     
     # Order Item
     "OrderItem", "OrderItemCreate", "OrderItemUpdate",
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 class ItemType(str, Enum):
@@ -51,6 +51,25 @@ class Cart(CartBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    total: float = 0.0
+    item_count: int = 0
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Пакетное изменение корзины: /carts/my/items/bulk
+class CartItemQuantityChange(BaseModel):
+    id: int
+    quantity: int  # 0 или меньше - удалить позицию
+
+
+class CartBulkUpdate(BaseModel):
+    add: List[CartItemCreate] = []
+    update: List[CartItemQuantityChange] = []
+    remove: List[int] = []
+
+
+class CartState(BaseModel):
+    cart: Cart
+    items: List[CartItem]
\ No newline at end of file
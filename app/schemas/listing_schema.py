@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional
 from decimal import Decimal
 from datetime import datetime
+from .review_schema import RatingSummary
 
 
 class ListingBase(BaseModel):
@@ -30,4 +31,15 @@ class Listing(ListingBase):
     create_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ListingForViewer(Listing):
+    """Listing с флагами зрителя (владельца токена доступа); без токена флаги равны None"""
+    is_favorited: Optional[bool] = None
+    in_cart: Optional[bool] = None
+
+
+class ListingDetail(Listing):
+    """Listing для страницы товара: со сводкой отзывов из rating_summary"""
+    rating_summary: RatingSummary = RatingSummary()
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, List, Optional
 from decimal import Decimal
+from .review_schema import RatingSummary
 
 
 class ProductBase(BaseModel):
@@ -31,4 +32,31 @@ class Product(ProductBase):
     id: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ProductForViewer(Product):
+    """Product с флагами зрителя (владельца токена доступа); без токена флаги равны None"""
+    is_favorited: Optional[bool] = None
+    in_cart: Optional[bool] = None
+
+
+class ProductDetail(Product):
+    """Product для страницы товара: со сводкой отзывов из rating_summary"""
+    rating_summary: RatingSummary = RatingSummary()
+
+
+class ProductBulkUpdate(ProductUpdate):
+    id: int
+
+
+class BulkRowError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Any
+
+
+class ProductBulkResult(BaseModel):
+    processed: int
+    ids: List[int] = []
+    errors: List[BulkRowError] = []
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 
@@ -28,4 +28,10 @@ class Review(ReviewBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RatingSummary(BaseModel):
+    count: int = 0
+    average: float = 0.0
+    histogram: Dict[int, int] = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}  # оценка -> число отзывов
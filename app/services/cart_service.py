@@ -1,42 +1,73 @@
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.repositories.cart_repository import CartRepository
 from app.repositories.cart_item_repository import CartItemRepository
-from app.services.service import BaseService
+from app.config import settings
+from app.services.service import AsyncBaseService
+from app.utils.cache import LRUMapping
 from app.models.carts import CartModel
 from app.models.cart_items import CartItemModel
-from app.exceptions.cart_exceptions import CartNotFoundException, CartItemNotFoundException
+from app.exceptions.cart_exceptions import (
+    CartNotFoundException,
+    CartItemConflictException,
+    CartItemNotFoundException,
+    CartValidationException
+)
 
+# Попыток записи позиции при параллельных изменениях (add_item_to_cart,
+# update_cart_item_quantity), после них - 409
+CART_ITEM_UPDATE_ATTEMPTS = 5
 
-class CartService(BaseService[CartModel]):
+# user_id -> cart_id: корзина пользователя не меняется, поэтому кэш живёт без TTL
+user_cart_ids = LRUMapping(settings.CART_ID_CACHE_SIZE)
+
+
+class CartService(AsyncBaseService[CartModel]):
     def __init__(self, cart_repository: CartRepository, cart_item_repository: CartItemRepository):
         super().__init__(cart_repository)
         self.cart_repository = cart_repository
         self.cart_item_repository = cart_item_repository
     
-    def get_or_create_user_cart(self, user_id: int) -> CartModel:
-        """Получаем корзину пользователя или создаем новую"""
-        cart = self.cart_repository.get_by_user(user_id)
-        if not cart:
-            # Создаем новую корзину
-            cart_data = {"user_id": user_id}
-            cart = self.cart_repository.create(cart_data)
+    async def get_or_create_user_cart(self, user_id: int) -> CartModel:
+        """Получаем корзину пользователя или создаем новую (upsert, без дубликатов)"""
+        cart_id = user_cart_ids.get(user_id)
+        if cart_id is not None:
+            cart = await self.get(cart_id)
+            if cart:
+                return cart
+            user_cart_ids.pop(user_id)
+        
+        cart = await self.cart_repository.get_or_create_by_user(user_id)
+        user_cart_ids.set(user_id, cart.id)
         return cart
     
-    def get_cart_items(self, cart_id: int, skip: int = 0, limit: int = 100) -> list:
-        """Получаем элементы корзины"""
-        cart = self.get(cart_id)
-        if not cart:
+    async def get_user_cart_id(self, user_id: int) -> int:
+        """id корзины пользователя; при попадании в кэш - без запросов к БД"""
+        cart_id = user_cart_ids.get(user_id)
+        if cart_id is None:
+            cart_id = (await self.get_or_create_user_cart(user_id)).id
+        return cart_id
+    
+    def _ensure_cart(self, cart: Optional[CartModel], cart_id: int) -> CartModel:
+        """UPDATE carts ... RETURNING не вернул строку: корзины нет, запись кэша устарела"""
+        if cart is None:
+            user_cart_ids.discard_value(cart_id)
             raise CartNotFoundException(cart_id=cart_id)
-        
-        return self.cart_item_repository.get_by_cart_id(cart_id, skip, limit)
+        return cart
     
-    def add_item_to_cart(self, cart_id: int, item_data: Dict[str, Any]) -> CartItemModel:
+    async def delete(self, id: int) -> bool:
+        user_cart_ids.discard_value(id)
+        return await super().delete(id)
+    
+    async def get_cart_items(self, cart_id: int, skip: int = 0, limit: int = 100) -> list:
+        """Получаем элементы корзины"""
+        return await self.cart_item_repository.get_by_cart_id(cart_id, skip, limit)
+    
+    async def get_cart_items_detailed(self, cart_id: int, skip: int = 0, limit: int = 100) -> list:
+        """Получаем элементы корзины с подгруженными товарами/публикациями"""
+        return await self.cart_item_repository.get_by_cart_id_detailed(cart_id, skip, limit)
+    
+    async def add_item_to_cart(self, cart_id: int, item_data: Dict[str, Any]) -> CartItemModel:
         """Добавляем товар в корзину"""
-        cart = self.get(cart_id)
-        if not cart:
-            raise CartNotFoundException(cart_id=cart_id)
-        
         # Определяем тип товара
         item_type = item_data.get('item_type')
         if not item_type:
@@ -53,66 +84,169 @@ class CartService(BaseService[CartModel]):
             else:
                 raise ValueError("Item type cannot be determined")
         else:
+            item_type = getattr(item_type, "value", item_type)
             item_id = item_data.get(f'{item_type}_id')
         
-        # Проверяем, есть ли уже такой товар в корзине
-        existing_item = self.cart_item_repository.get_by_cart_and_item(cart_id, item_type, item_id)
+        if not item_id:
+            raise CartValidationException(detail=f"{item_type}_id is required for item_type '{item_type}'")
+        
+        quantity = item_data.get('quantity', 1)
+        if quantity < 1:
+            raise CartValidationException(detail="quantity must be at least 1")
         
-        if existing_item:
-            # Обновляем количество
-            existing_item.quantity += item_data.get('quantity', 1)
-            existing_item.price = item_data.get('price', existing_item.price)
-            self.db.commit()
-            self.db.refresh(existing_item)
-            return existing_item
+        # Вставка или quantity = quantity + :quantity; создана ли позиция - из самой записи
+        for _ in range(CART_ITEM_UPDATE_ATTEMPTS):
+            added = await self.cart_item_repository.add_quantity(
+                cart_id, item_type, item_id, quantity, item_data.get('price', 0)
+            )
+            if added is not None:
+                break
         else:
-            # Создаем новый элемент
-            cart_item_data = {
-                "cart_id": cart_id,
-                "item_type": item_type,
-                f"{item_type}_id": item_id,
-                "quantity": item_data.get('quantity', 1),
-                "price": item_data.get('price', 0)
-            }
-            return self.cart_item_repository.create(cart_item_data)
-    
-    def update_cart_item_quantity(self, item_id: int, quantity: int) -> Optional[CartItemModel]:
-        """Обновляем количество товара в корзине"""
-        item = self.cart_item_repository.get(item_id)
-        if not item:
-            raise CartItemNotFoundException(item_id)
+            raise CartItemConflictException(CART_ITEM_UPDATE_ATTEMPTS)
         
-        if quantity <= 0:
-            # Удаляем товар если количество 0 или меньше
-            self.cart_item_repository.delete(item_id)
-            return None
+        cart_item, created = added
+        self._ensure_cart(
+            await self.cart_repository.add_to_totals(cart_id, cart_item.price * quantity, 1 if created else 0),
+            cart_id
+        )
+        return cart_item
+    
+    async def update_cart_item_quantity(self, item_id: int, quantity: int) -> Optional[CartItemModel]:
+        """
+        Обновляем количество товара в корзине. Запись количества - сравнение с обменом
+        (UPDATE ... WHERE quantity = прочитанное): если параллельный запрос успел изменить
+        строку, перечитываем её и повторяем, поэтому разница для итогов корзины всегда
+        считается от количества, которое реально заменили. Итоги сдвигаются в той же транзакции.
+        После CART_ITEM_UPDATE_ATTEMPTS неудачных попыток - CartItemConflictException (409).
+        """
+        for _ in range(CART_ITEM_UPDATE_ATTEMPTS):
+            item = await self.cart_item_repository.get_fresh(item_id)
+            if not item:
+                raise CartItemNotFoundException(item_id)
+            
+            if quantity <= 0:
+                # Удаляем товар если количество 0 или меньше
+                await self.remove_item_from_cart(item_id)
+                return None
+            
+            previous = item.quantity
+            cart_item = await self.cart_item_repository.set_quantity_if(item_id, quantity, previous)
+            if cart_item is not None:
+                break
+        else:
+            raise CartItemConflictException(CART_ITEM_UPDATE_ATTEMPTS, item_id)
         
-        update_data = {"quantity": quantity}
-        return self.cart_item_repository.update(item_id, update_data)
+        await self.cart_repository.add_to_totals(cart_item.cart_id, cart_item.price * (quantity - previous))
+        return cart_item
     
-    def remove_item_from_cart(self, item_id: int) -> bool:
-        """Удаляем товар из корзины"""
-        return self.cart_item_repository.delete(item_id)
+    async def remove_item_from_cart(self, item_id: int) -> bool:
+        """Удаляем товар из корзины; сумма для итогов - из самой удаляемой строки (DELETE ... RETURNING)"""
+        deleted = await self.cart_item_repository.delete_returning_amount(item_id)
+        if deleted is None:
+            return False
+        
+        cart_id, amount = deleted
+        await self.cart_repository.add_to_totals(cart_id, -amount, -1)
+        return True
     
-    def clear_cart(self, cart_id: int) -> bool:
+    async def clear_cart(self, cart_id: int) -> bool:
         """Очищаем корзину"""
-        cart = self.get(cart_id)
+        # Удаляем все элементы корзины одним DELETE
+        await self.cart_item_repository.delete_by_cart(cart_id)
+        
+        # Обнуляем итоги и обновляем время изменения корзины
+        self._ensure_cart(await self.cart_repository.set_totals(cart_id, 0, 0), cart_id)
+        return True
+    
+    async def apply_bulk_changes(
+        self,
+        cart_id: int,
+        additions: List[Dict[str, Any]],
+        updates: List[Dict[str, Any]],
+        removals: List[int]
+    ) -> Dict[str, Any]:
+        """
+        Применить пачку изменений корзины в одной транзакции:
+        один INSERT на новые позиции, один UPDATE executemany на количества,
+        один DELETE ... WHERE id IN (...) и пересчёт итогов одним SUM().
+        Чужой или несуществующий id отменяет всю пачку.
+        Возвращает {"cart": корзина с итогами, "items": элементы}.
+        """
+        items = {
+            item.id: item
+            for item in await self.cart_item_repository.get_by_cart_id(cart_id, 0, None)
+        }
+        for item_id in removals + [change["id"] for change in updates]:
+            if item_id not in items:
+                raise CartItemNotFoundException(item_id)
+        
+        removed = set(removals)
+        quantities = {}
+        for change in updates:
+            if change["id"] in removed:
+                continue
+            if change["quantity"] <= 0:
+                removed.add(change["id"])
+            else:
+                quantities[change["id"]] = change["quantity"]
+        
+        # Добавление уже лежащего в корзине товара увеличивает его количество
+        by_ref = {
+            (item.item_type, getattr(item, f"{item.item_type}_id")): item
+            for item in items.values() if item.id not in removed
+        }
+        new_rows = {}
+        for data in additions:
+            item_type = getattr(data["item_type"], "value", data["item_type"])
+            item_id = data.get(f"{item_type}_id")
+            if not item_id:
+                raise CartValidationException(detail=f"{item_type}_id is required for item_type '{item_type}'")
+            
+            existing = by_ref.get((item_type, item_id))
+            if existing is not None:
+                quantities[existing.id] = quantities.get(existing.id, existing.quantity) + data["quantity"]
+            elif (item_type, item_id) in new_rows:
+                new_rows[(item_type, item_id)]["quantity"] += data["quantity"]
+            else:
+                new_rows[(item_type, item_id)] = {
+                    "cart_id": cart_id,
+                    "item_type": item_type,
+                    "product_id": None,
+                    "listing_id": None,
+                    "author_listing_id": None,
+                    f"{item_type}_id": item_id,
+                    "quantity": data["quantity"],
+                    "price": data["price"]
+                }
+        
+        await self.cart_item_repository.bulk_delete(list(removed))
+        await self.cart_item_repository.bulk_update(
+            [{"id": id, "quantity": quantity} for id, quantity in quantities.items()]
+        )
+        await self.cart_item_repository.bulk_create(list(new_rows.values()))
+        cart = self._ensure_cart(await self.recalculate_totals(cart_id), cart_id)
+        
+        items = await self.cart_item_repository.get_by_cart_id(cart_id, 0, None, refresh=True)
+        return {"cart": cart, "items": items}
+    
+    async def get_cart_total(self, cart_id: int, cart: Optional[CartModel] = None) -> Dict[str, Any]:
+        """
+        Общая стоимость и число позиций корзины.
+        С CART_DENORMALIZED_TOTALS - готовые carts.total/item_count (O(1)),
+        иначе один SELECT SUM() по cart_items. Уже загруженную корзину можно передать в cart.
+        """
+        if cart is None:
+            cart = await self.get(cart_id)
         if not cart:
             raise CartNotFoundException(cart_id=cart_id)
         
-        # Удаляем все элементы корзины
-        items = self.cart_item_repository.get_by_cart_id(cart_id)
-        for item in items:
-            self.cart_item_repository.delete(item.id)
+        if settings.CART_DENORMALIZED_TOTALS:
+            return {"total": round(cart.total, 2), "item_count": cart.item_count}
         
-        # Обновляем время изменения корзины
-        self.cart_repository.update(cart_id, {"updated_at": datetime.utcnow()})
-        return True
+        total, item_count = await self.cart_item_repository.get_totals(cart_id)
+        return {"total": total, "item_count": item_count}
     
-    def get_cart_total(self, cart_id: int) -> float:
-        """Получаем общую стоимость корзины"""
-        items = self.get_cart_items(cart_id)
-        total = 0.0
-        for item in items:
-            total += item.price * item.quantity
-        return total
\ No newline at end of file
+    async def recalculate_totals(self, cart_id: int) -> Optional[CartModel]:
+        """Пересчитать carts.total/item_count по cart_items (после ручных правок в БД)"""
+        total, item_count = await self.cart_item_repository.get_totals(cart_id)
+        return await self.cart_repository.set_totals(cart_id, total, item_count)
\ No newline at end of file
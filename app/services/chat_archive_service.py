@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.database.database import SessionLocal, unit_of_work
+from app.repositories.chat_archive_repository import ChatArchiveRepository, unpack_messages
+from app.repositories.chat_message_repository import ChatMessageRepository
+from app.exceptions.chat_exceptions import ChatArchiveConflictException
+
+logger = logging.getLogger(__name__)
+
+
+class ChatArchiveService:
+    """
+    Перенос старых сообщений чата из chat_massage в сжатые сегменты chat_archive.
+    Горячая таблица и её индексы остаются размером с "живые" диалоги; архив
+    читается по запросу с распаковкой сегментов (/chat/user/{id}/archive).
+    """
+
+    def __init__(self, chat_message_repository: ChatMessageRepository, chat_archive_repository: ChatArchiveRepository):
+        self.chat_message_repository = chat_message_repository
+        self.chat_archive_repository = chat_archive_repository
+
+    def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Одна транзакция: до batch_size самых старых сообщений одного диалога раньше
+        cutoff -> сегмент архива, DELETE из chat_massage. Возвращает число сообщений,
+        0 - архивировать нечего.
+        """
+        with unit_of_work(self.chat_message_repository.db):
+            user_id = self.chat_message_repository.get_oldest_user_before(cutoff)
+            if user_id is None:
+                return 0
+            messages = self.chat_message_repository.get_older_than(user_id, cutoff, batch_size)
+            self.chat_archive_repository.add_segment(user_id, messages)
+            deleted = self.chat_message_repository.delete_by_ids([message.id for message in messages])
+            if deleted != len(messages):
+                # Часть строк уже перенёс другой архиватор: откатываем, чтобы не задвоить архив
+                raise ChatArchiveConflictException(user_id, len(messages), deleted)
+        return len(messages)
+
+    def archive_older_than(
+        self,
+        days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> int:
+        """Архивировать все сообщения старше days дней пачками; возвращает число сообщений"""
+        cutoff = datetime.utcnow() - timedelta(days=days if days is not None else settings.CHAT_ARCHIVE_AFTER_DAYS)
+        batch_size = batch_size or settings.CHAT_ARCHIVE_BATCH_SIZE
+        archived = batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                moved = self.archive_batch(cutoff, batch_size)
+            except ChatArchiveConflictException as e:
+                # Пачку перехватил другой воркер или запись; остаток - в следующий запуск
+                logger.warning("Chat archive run stopped: %s", e.detail)
+                break
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+        return archived
+
+    def get_archived_messages(self, user_id: int, before_id: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Последние limit архивных сообщений диалога перед before_id, по возрастанию времени.
+        Распаковываются только сегменты, нужные для страницы.
+        """
+        collected: List[Dict[str, Any]] = []
+        for segment in self.chat_archive_repository.iter_segments(user_id, before_id):
+            messages = unpack_messages(segment.payload)
+            if before_id is not None:
+                messages = [message for message in messages if message["id"] < before_id]
+            collected = messages + collected
+            if len(collected) >= limit:
+                break
+        return collected[-limit:]
+
+
+def archive_chat_messages(days: Optional[int] = None) -> int:
+    """Архивация в отдельной сессии: фоновая задача приложения и python -m app.database.archive_chat"""
+    with SessionLocal() as db:
+        service = ChatArchiveService(ChatMessageRepository(db), ChatArchiveRepository(db))
+        return service.archive_older_than(days)
+
+
+async def run_chat_archiver(interval_seconds: int) -> None:
+    """Фоновая архивация раз в interval_seconds; запускается из lifespan приложения"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            archived = await asyncio.to_thread(archive_chat_messages)
+            if archived:
+                logger.info("Chat archive: %s messages moved to chat_archive", archived)
+        except Exception:
+            logger.exception("Chat archiving failed")
@@ -1,11 +1,16 @@
-from app.repositories.chat_message_repository import ChatMessageRepository
+from typing import List, Optional
+from app.repositories.chat_message_repository import ChatMessageRepository, MessageKey
 from app.services.service import BaseService
 from app.models.chat_massage import ChatMessageModel
+from app.schemas.chat_message_schema import ChatMessage
+from app.utils.chat_hub import ChatHub, chat_hub
+from app.exceptions.chat_exceptions import ChatMessageNotFoundException
 
 class ChatMessageService(BaseService[ChatMessageModel]):
-    def __init__(self, chat_message_repository: ChatMessageRepository):
+    def __init__(self, chat_message_repository: ChatMessageRepository, hub: Optional[ChatHub] = None):
         super().__init__(chat_message_repository)
         self.chat_message_repository = chat_message_repository
+        self.hub = hub if hub is not None else chat_hub
     
     def get_user_messages(self, user_id: int, skip: int = 0, limit: int = 100):
         return self.chat_message_repository.get_by_user(user_id, skip, limit)
@@ -13,5 +18,33 @@ class ChatMessageService(BaseService[ChatMessageModel]):
     def get_conversation(self, user_id: int, skip: int = 0, limit: int = 100):
         return self.chat_message_repository.get_conversation(user_id, skip, limit)
     
+    def get_conversation_page(self, user_id: int, cursor: str = None, limit: int = 100):
+        return self.chat_message_repository.get_page(cursor, limit, "sent_at", "asc", user_id=user_id)
+    
+    def get_conversation_window(
+        self,
+        user_id: int,
+        limit: int = 50,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None
+    ) -> List[ChatMessageModel]:
+        """
+        Сообщения после after_id (дочитка после переподключения), перед before_id
+        (прокрутка вверх) или, без них, последние limit сообщений диалога.
+        Страница короче limit - дальше сообщений нет.
+        """
+        after = self._message_key(user_id, after_id) if after_id is not None else None
+        before = self._message_key(user_id, before_id) if before_id is not None else None
+        return self.chat_message_repository.get_window(user_id, limit, after, before)
+    
     def send_message(self, user_id: int, message_data: dict) -> ChatMessageModel:
-        return self.chat_message_repository.create({**message_data, "user_id": user_id})
\ No newline at end of file
+        """Сохранить сообщение и разослать его подключённым /chat/ws/{user_id} после коммита"""
+        message = self.chat_message_repository.create({**message_data, "user_id": user_id})
+        self.hub.publish(user_id, ChatMessage.model_validate(message).model_dump_json())
+        return message
+    
+    def _message_key(self, user_id: int, message_id: int) -> MessageKey:
+        key = self.chat_message_repository.get_message_key(user_id, message_id)
+        if key is None:
+            raise ChatMessageNotFoundException(message_id)
+        return key
\ No newline at end of file
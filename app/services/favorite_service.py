@@ -1,33 +1,87 @@
+from typing import Dict, FrozenSet, Optional
+from app.config import settings
+from app.database.database import unit_of_work
 from app.repositories.favorite_repository import FavoriteRepository
 from app.services.service import BaseService
 from app.models.favorite import FavoriteModel
+from app.utils.cache import CacheBackend, favorite_set_cache
+
+FAVORITE_SETS_NAMESPACE = "favorite_sets"
 
 class FavoriteService(BaseService[FavoriteModel]):
-    def __init__(self, favorite_repository: FavoriteRepository):
+    def __init__(self, favorite_repository: FavoriteRepository, cache: Optional[CacheBackend] = None):
         super().__init__(favorite_repository)
         self.favorite_repository = favorite_repository
+        self.cache = cache if cache is not None else favorite_set_cache
     
     def get_user_favorites(self, user_id: int, skip: int = 0, limit: int = 100):
         """Получить избранное пользователя с пагинацией"""
         return self.favorite_repository.get_by_user(user_id, skip, limit)
     
+    def get_user_favorites_page(self, user_id: int, cursor: str = None, limit: int = 100):
+        """Получить избранное пользователя с keyset-пагинацией (новые первыми)"""
+        return self.favorite_repository.get_page(cursor, limit, "added_at", "desc", user_id=user_id)
+    
     def add_to_favorites(self, user_id: int, favorite_data: dict) -> FavoriteModel:
         """Добавить товар в избранное пользователя"""
-        return self.favorite_repository.create({**favorite_data, "user_id": user_id})
+        with unit_of_work(self.favorite_repository.db):
+            favorite = self.favorite_repository.create({**favorite_data, "user_id": user_id})
+            if settings.FAVORITES_COUNTER_TABLE:
+                self.favorite_repository.add_to_user_count(user_id, 1)
+        self.cache.invalidate_namespace(FAVORITE_SETS_NAMESPACE, user_id)
+        return favorite
+    
+    def get_favorite_refs(self, user_id: int) -> Dict[str, FrozenSet[int]]:
+        """id избранного пользователя по типам ("product", "listing", "author_listing") через кэш"""
+        return self.cache.get_or_load(
+            (FAVORITE_SETS_NAMESPACE, "detail", user_id),
+            lambda: {
+                item_type: frozenset(ids)
+                for item_type, ids in self.favorite_repository.get_item_refs(user_id).items()
+            }
+        )
     
     def is_item_favorited(self, user_id: int, **filters) -> bool:
         """Проверить, добавлен ли товар в избранное у пользователя"""
-        favorite = self.favorite_repository.get_one_by(user_id=user_id, **filters)
-        return favorite is not None
+        return self.favorite_repository.exists_by(user_id=user_id, **filters)
     
     def get_user_favorites_count(self, user_id: int) -> int:
         """Получить количество избранных товаров пользователя"""
-        favorites = self.favorite_repository.get_by_user(user_id, 0, 1000)
-        return len(favorites)
+        if settings.FAVORITES_COUNTER_TABLE:
+            return self.favorite_repository.get_user_count(user_id)
+        return self.favorite_repository.count_by_user(user_id)
+    
+    def user_has_favorites(self, user_id: int) -> bool:
+        """Есть ли у пользователя избранное"""
+        if settings.FAVORITES_COUNTER_TABLE:
+            return self.favorite_repository.get_user_count(user_id) > 0
+        return self.favorite_repository.user_has_favorites(user_id)
+    
+    def recalculate_user_count(self, user_id: int) -> int:
+        """Пересчитать user_favorite_counts по таблице favorite (после ручных правок в БД)"""
+        count = self.favorite_repository.count_by_user(user_id)
+        self.favorite_repository.set_user_count(user_id, count)
+        return count
+    
+    def rebuild_user_counts(self) -> int:
+        """Пересобрать user_favorite_counts по всей таблице favorite (бэкфилл)"""
+        with unit_of_work(self.favorite_repository.db):
+            return self.favorite_repository.rebuild_user_counts()
+    
+    def delete(self, id: int) -> bool:
+        """Удалить запись избранного по id вместе со сдвигом счётчика"""
+        with unit_of_work(self.favorite_repository.db):
+            user_id = self.favorite_repository.delete_returning_user_id(id)
+            if user_id is None:
+                return False
+            if settings.FAVORITES_COUNTER_TABLE:
+                self.favorite_repository.add_to_user_count(user_id, -1)
+        self.cache.invalidate_namespace(FAVORITE_SETS_NAMESPACE, user_id)
+        return True
     
     def remove_from_favorites(self, user_id: int, **filters) -> bool:
         """Удалить товар из избранного пользователя"""
         favorite = self.favorite_repository.get_one_by(user_id=user_id, **filters)
         if favorite:
-            return self.favorite_repository.delete(favorite.id)
+            return self.delete(favorite.id)
         return False
\ No newline at end of file
@@ -14,4 +14,4 @@ class OrderService(BaseService[OrderModel]):
         return self.order_repository.get_by_status(status, skip, limit)
     
     def update_status(self, order_id: int, status: str) -> OrderModel:
-        return self.order_repository.update(order_id, {"status": status})
\ No newline at end of file
+        return self.order_repository.update_returning(order_id, {"status": status})
\ No newline at end of file
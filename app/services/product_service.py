@@ -1,18 +1,154 @@
 # app/services/product_service.py
 
-from app.repositories.product_repository import ProductRepository
-from app.services.service import BaseService
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from app.database.database import async_unit_of_work
+from app.repositories.product_repository import AsyncProductRepository, ProductRepository
+from app.services.service import AsyncBaseService, CachedBaseService
 from app.models.products import ProductModel
+from app.schemas.product_schema import Product
+from app.utils.cache import catalog_cache
 
 
-class ProductService(BaseService[ProductModel]):
+class ProductService(CachedBaseService[ProductModel]):
+    cache_namespace = "products"
+    cache_schema = Product
+    
     def __init__(self, product_repository: ProductRepository):
         super().__init__(product_repository)
         self.product_repository = product_repository
     
     def get_by_category(self, category: str, skip: int = 0, limit: int = 100):
-        return self.product_repository.get_by_category(category, skip, limit)
+        return self._cached_list(
+            ("category", category, skip, limit),
+            lambda: self.product_repository.get_by_category(category, skip, limit)
+        )
     
     def get_active_products(self, skip: int = 0, limit: int = 100):
         # ИСПРАВЛЕНО: is_acctive → is_active
-        return self.product_repository.filter_by(is_active=True)
\ No newline at end of file
+        return self.filter_page(skip, limit, is_active=True)
+
+
+# Строка пакетной операции: (номер строки во входных данных, данные)
+BulkRow = Tuple[int, Any]
+
+
+class AsyncProductService(AsyncBaseService[ProductModel]):
+    """
+    Сервис админки: читает мимо кэша, но каждая запись инвалидирует
+    кэш каталога товаров, который использует ProductService.
+    """
+    def __init__(self, product_repository: AsyncProductRepository):
+        super().__init__(product_repository)
+        self.product_repository = product_repository
+    
+    def invalidate(self, *ids: int) -> None:
+        catalog_cache.invalidate_namespace(ProductService.cache_namespace, *ids)
+    
+    async def create(self, obj_in: Dict[str, Any]) -> ProductModel:
+        product = await super().create(obj_in)
+        self.invalidate(product.id)
+        return product
+    
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ProductModel]:
+        product = await super().update(id, obj_in)
+        if product:
+            self.invalidate(id)
+        return product
+    
+    async def delete(self, id: int) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            self.invalidate(id)
+        return deleted
+    
+    async def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ProductModel]:
+        product = await super().update_returning(id, obj_in)
+        if product:
+            self.invalidate(id)
+        return product
+    
+    async def delete_returning(self, id: int) -> bool:
+        deleted = await super().delete_returning(id)
+        if deleted:
+            self.invalidate(id)
+        return deleted
+    
+    async def bulk_create(self, rows: List[BulkRow], chunk_size: int = 500) -> Dict[str, Any]:
+        """Создать товары пачками: один INSERT executemany и один commit на пачку"""
+        async def apply(chunk: List[BulkRow]):
+            ids = await self.product_repository.bulk_create([data for _, data in chunk])
+            return ids, []
+        
+        return await self._run_chunked(rows, chunk_size, apply)
+    
+    async def bulk_update(self, rows: List[BulkRow], chunk_size: int = 500) -> Dict[str, Any]:
+        """Обновить товары пачками по id; отсутствующие id попадают в errors"""
+        async def apply(chunk: List[BulkRow]):
+            existing = set(await self.product_repository.existing_ids([data["id"] for _, data in chunk]))
+            found = [(index, data) for index, data in chunk if data["id"] in existing]
+            errors = [
+                {"index": index, "id": data["id"], "error": "Product not found"}
+                for index, data in chunk if data["id"] not in existing
+            ]
+            await self.product_repository.bulk_update([data for _, data in found])
+            return [data["id"] for _, data in found], errors
+        
+        return await self._run_chunked(rows, chunk_size, apply)
+    
+    async def bulk_delete(self, rows: List[BulkRow], chunk_size: int = 500) -> Dict[str, Any]:
+        """Удалить товары пачками одним DELETE ... WHERE id IN (...) на пачку"""
+        async def apply(chunk: List[BulkRow]):
+            existing = set(await self.product_repository.existing_ids([id for _, id in chunk]))
+            errors = [
+                {"index": index, "id": id, "error": "Product not found"}
+                for index, id in chunk if id not in existing
+            ]
+            deleted = [id for _, id in chunk if id in existing]
+            await self.product_repository.bulk_delete(deleted)
+            return deleted, errors
+        
+        return await self._run_chunked(rows, chunk_size, apply)
+    
+    async def _run_chunked(
+        self,
+        rows: List[BulkRow],
+        chunk_size: int,
+        apply: Callable[[List[BulkRow]], Awaitable[Tuple[List[int], List[dict]]]]
+    ) -> Dict[str, Any]:
+        """
+        Выполняет apply для каждой пачки в отдельной транзакции.
+        Если пачка падает на уровне БД, она откатывается и повторяется построчно,
+        чтобы вернуть ошибку конкретной строки, не теряя остальные.
+        """
+        result = {"processed": 0, "ids": [], "errors": []}
+        db = self.product_repository.db
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                async with async_unit_of_work(db):
+                    ids, errors = await apply(chunk)
+            except SQLAlchemyError:
+                ids, errors = [], []
+                for row in chunk:
+                    try:
+                        async with async_unit_of_work(db):
+                            row_ids, row_errors = await apply([row])
+                    except SQLAlchemyError as e:
+                        index, data = row
+                        errors.append({
+                            "index": index,
+                            "id": data.get("id") if isinstance(data, dict) else data,
+                            "error": str(getattr(e, "orig", e))
+                        })
+                        continue
+                    ids.extend(row_ids)
+                    errors.extend(row_errors)
+            
+            self.invalidate(*ids)
+            result["processed"] += len(ids)
+            result["ids"].extend(ids)
+            result["errors"].extend(errors)
+        
+        return result
\ No newline at end of file
@@ -1,11 +1,17 @@
+from typing import Any, Dict, List, Optional, Tuple
+from app.database.database import unit_of_work
+from app.repositories.rating_summary_repository import REVIEW_TARGET_COLUMNS, RatingSummaryRepository
 from app.repositories.review_repository import ReviewRepository
 from app.services.service import BaseService
 from app.models.review import ReviewModel
+from app.schemas.review_schema import RatingSummary
+from app.exceptions.review_exceptions import ReviewRatingException, ReviewValidationException
 
 class ReviewService(BaseService[ReviewModel]):
-    def __init__(self, review_repository: ReviewRepository):
+    def __init__(self, review_repository: ReviewRepository, rating_summary_repository: RatingSummaryRepository):
         super().__init__(review_repository)
         self.review_repository = review_repository
+        self.rating_summary_repository = rating_summary_repository
     
     def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
         return self.review_repository.get_by_user(user_id, skip, limit)
@@ -17,12 +23,121 @@ class ReviewService(BaseService[ReviewModel]):
         return self.review_repository.get_by_rating(min_rating, max_rating, skip, limit)
     
     def get_verified_reviews(self, skip: int = 0, limit: int = 100):
-        return self.review_repository.filter_by(is_verified=True)
+        return self.review_repository.filter_page(skip, limit, is_verified=True)
+    
+    def get_item_reviews_page(
+        self,
+        item_type: str,
+        item_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        verified_only: bool = False,
+        min_rating: int = 1,
+        max_rating: int = 5
+    ) -> Tuple[List[ReviewModel], Optional[str]]:
+        column = self._target_column(item_type)
+        if min_rating > max_rating:
+            raise ReviewValidationException(detail="min_rating must not be greater than max_rating")
+        return self.review_repository.get_item_page(
+            column, item_id, cursor, limit,
+            verified_only, min_rating, max_rating
+        )
+    
+    def get_user_reviews_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[ReviewModel], Optional[str]]:
+        """Отзывы пользователя, новые первыми: keyset по id (индекс ix_review_user_id_id)"""
+        return self.review_repository.get_page(cursor, limit, "id", "desc", user_id=user_id)
     
     def calculate_average_rating(self, **filters) -> float:
-        reviews = self.review_repository.filter_by(**filters)
-        if not reviews:
-            return 0.0
-        
-        total_rating = sum(review.rating for review in reviews)
-        return total_rating / len(reviews)
\ No newline at end of file
+        """Средняя оценка: из rating_summary для одного товара, иначе SELECT AVG(rating)"""
+        if len(filters) == 1:
+            column, item_id = next(iter(filters.items()))
+            for item_type, target_column in REVIEW_TARGET_COLUMNS.items():
+                if column == target_column:
+                    return self.get_rating_summary(item_type, item_id).average
+        return self.review_repository.average_rating(**filters)
+    
+    def get_rating_summary(self, item_type: str, item_id: int) -> RatingSummary:
+        """Число, средняя и гистограмма оценок - одна строка rating_summary по первичному ключу"""
+        self._target_column(item_type)
+        summary = self.rating_summary_repository.get_summary(item_type, item_id)
+        if summary is None:
+            return RatingSummary()
+        return RatingSummary(count=summary.count, average=summary.average, histogram=summary.histogram)
+    
+    def rebuild_rating_summaries(self) -> int:
+        """Пересобрать rating_summary по всем отзывам (бэкфилл, ручные правки в БД)"""
+        with unit_of_work(self.review_repository.db):
+            return self.rating_summary_repository.rebuild()
+    
+    def create(self, obj_in: Dict[str, Any]) -> ReviewModel:
+        self._validate_rating(obj_in.get("rating"))
+        if not any(obj_in.get(column) for column in REVIEW_TARGET_COLUMNS.values()):
+            raise ReviewValidationException(
+                detail="At least one of products_id, listing_id, or author_listing_id must be provided"
+            )
+        with unit_of_work(self.review_repository.db):
+            review = self.review_repository.create(obj_in)
+            self._apply_to_summaries(review, 1)
+        return review
+    
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ReviewModel]:
+        if "rating" in obj_in:
+            # Явный null не пропускаем: колонка NOT NULL, а сводка оценок ждёт число
+            if obj_in["rating"] is None:
+                raise ReviewValidationException(detail="rating cannot be null")
+            self._validate_rating(obj_in["rating"])
+        with unit_of_work(self.review_repository.db):
+            review = self.review_repository.get(id)
+            if not review:
+                return None
+            before = (review.rating, self._targets(review))
+            review = self.review_repository.update(id, obj_in)
+            if (review.rating, self._targets(review)) != before:
+                self._apply_targets(before[1], before[0], -1)
+                self._apply_to_summaries(review, 1)
+        return review
+    
+    def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ReviewModel]:
+        # Для сводки нужна старая оценка, поэтому обновление идёт через update()
+        return self.update(id, obj_in)
+    
+    def delete(self, id: int) -> bool:
+        with unit_of_work(self.review_repository.db):
+            review = self.review_repository.get(id)
+            if not review:
+                return False
+            self._apply_to_summaries(review, -1)
+            self.review_repository.delete(id)
+        return True
+    
+    def delete_returning(self, id: int) -> bool:
+        return self.delete(id)
+    
+    def _validate_rating(self, rating: Optional[int]) -> None:
+        if rating not in (1, 2, 3, 4, 5):
+            raise ReviewRatingException(rating)
+    
+    def _target_column(self, item_type: str) -> str:
+        if item_type not in REVIEW_TARGET_COLUMNS:
+            raise ReviewValidationException(detail=f"Unknown item type '{item_type}'")
+        return REVIEW_TARGET_COLUMNS[item_type]
+    
+    def _targets(self, review: ReviewModel) -> List[Tuple[str, int]]:
+        """(item_type, item_id) всех товаров/объявлений, на которые ссылается отзыв"""
+        return [
+            (item_type, getattr(review, column))
+            for item_type, column in REVIEW_TARGET_COLUMNS.items()
+            if getattr(review, column) is not None
+        ]
+    
+    def _apply_to_summaries(self, review: ReviewModel, sign: int) -> None:
+        self._apply_targets(self._targets(review), review.rating, sign)
+    
+    def _apply_targets(self, targets: List[Tuple[str, int]], rating: int, sign: int) -> None:
+        for item_type, item_id in targets:
+            self.rating_summary_repository.apply(item_type, item_id, rating, sign)
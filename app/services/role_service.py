@@ -1,13 +1,32 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from app.repositories.role_repository import RoleRepository
 from app.services.service import BaseService
 from app.models.roles import RoleModel
+from app.utils.role_registry import RoleRegistry, role_registry
 
 
 class RoleService(BaseService[RoleModel]):
-    def __init__(self, role_repository: RoleRepository):
+    def __init__(self, role_repository: RoleRepository, registry: RoleRegistry = role_registry):
         super().__init__(role_repository)
         self.role_repository = role_repository
+        self.registry = registry
     
     def get_by_name(self, name: str) -> Optional[RoleModel]:
-        return self.role_repository.get_by_name(name)
\ No newline at end of file
+        return self.role_repository.get_by_name(name)
+    
+    # Записи перечитывают справочник ролей процесса сразу после commit
+    
+    def create(self, obj_in: Dict[str, Any]) -> RoleModel:
+        role = super().create(obj_in)
+        self.registry.load(self.role_repository.db)
+        return role
+    
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[RoleModel]:
+        role = super().update(id, obj_in)
+        self.registry.load(self.role_repository.db)
+        return role
+    
+    def delete(self, id: int) -> bool:
+        deleted = super().delete(id)
+        self.registry.load(self.role_repository.db)
+        return deleted
\ No newline at end of file
@@ -1,5 +1,7 @@
-from typing import Generic, TypeVar, List, Optional, Dict, Any
-from app.repositories.repository import BaseRepository
+from typing import Callable, Generic, Type, TypeVar, List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel
+from app.repositories.repository import AsyncBaseRepository, BaseRepository
+from app.utils.cache import CacheBackend, catalog_cache
 
 ModelType = TypeVar("ModelType")
 
@@ -19,6 +21,16 @@ class BaseService(Generic[ModelType]):
     ) -> List[ModelType]:
         return self.repository.get_all(skip, limit, order_by, order_direction)
 
+    def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        return self.repository.get_page(cursor, limit, order_by, order_direction, **filters)
+
     def create(self, obj_in: Dict[str, Any]) -> ModelType:
         return self.repository.create(obj_in)
 
@@ -28,8 +40,179 @@ class BaseService(Generic[ModelType]):
     def delete(self, id: int) -> bool:
         return self.repository.delete(id)
 
+    def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        return self.repository.update_returning(id, obj_in)
+
+    def delete_returning(self, id: int) -> bool:
+        return self.repository.delete_returning(id)
+
     def filter_by(self, **filters) -> List[ModelType]:
         return self.repository.filter_by(**filters)
 
+    def filter_page(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelType]:
+        return self.repository.filter_page(skip, limit, **filters)
+
+    def count(self, **filters) -> int:
+        return self.repository.count(**filters)
+
     def get_one_by(self, **filters) -> Optional[ModelType]:
-        return self.repository.get_one_by(**filters)
\ No newline at end of file
+        return self.repository.get_one_by(**filters)
+
+
+class CachedBaseService(BaseService[ModelType]):
+    """
+    BaseService с read-through кэшем чтений (app/utils/cache.py).
+    В кэше лежат снимки cache_schema, а не ORM-объекты: они не привязаны к сессии
+    запроса и безопасно отдаются из других потоков. Каждая запись через сервис
+    инвалидирует detail-ключ изменённого id и все списки cache_namespace.
+    """
+    cache_namespace: str
+    cache_schema: Type[BaseModel]
+
+    def __init__(self, repository: BaseRepository[ModelType], cache: Optional[CacheBackend] = None):
+        super().__init__(repository)
+        self.cache = cache if cache is not None else catalog_cache
+
+    def _snapshot(self, obj):
+        return None if obj is None else self.cache_schema.model_validate(obj)
+
+    def _cached_detail(self, id: int, loader: Callable[[], Any]):
+        return self.cache.get_or_load(
+            (self.cache_namespace, "detail", id),
+            lambda: self._snapshot(loader())
+        )
+
+    def _cached_list(self, key: Tuple, loader: Callable[[], List[Any]]):
+        return self.cache.get_or_load(
+            (self.cache_namespace, "list", *key),
+            lambda: [self._snapshot(obj) for obj in loader()]
+        )
+
+    def invalidate(self, *ids: int) -> None:
+        self.cache.invalidate_namespace(self.cache_namespace, *ids)
+
+    def get(self, id: int):
+        return self._cached_detail(id, lambda: self.repository.get(id))
+
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        order_direction: str = "asc"
+    ):
+        return self._cached_list(
+            ("all", skip, limit, order_by, order_direction),
+            lambda: self.repository.get_all(skip, limit, order_by, order_direction)
+        )
+
+    def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ):
+        def load():
+            items, next_cursor = self.repository.get_page(cursor, limit, order_by, order_direction, **filters)
+            return [self._snapshot(obj) for obj in items], next_cursor
+
+        key = ("page", cursor, limit, order_by, order_direction, tuple(sorted(filters.items())))
+        return self.cache.get_or_load((self.cache_namespace, "list", *key), load)
+
+    def filter_page(self, skip: int = 0, limit: int = 100, **filters):
+        return self._cached_list(
+            ("filter", skip, limit, tuple(sorted(filters.items()))),
+            lambda: self.repository.filter_page(skip, limit, **filters)
+        )
+
+    def count(self, **filters) -> int:
+        # Счётчик тоже list-ключ: его сбрасывает любая запись в namespace
+        return self.cache.get_or_load(
+            (self.cache_namespace, "list", "count", tuple(sorted(filters.items()))),
+            lambda: self.repository.count(**filters)
+        )
+
+    def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        db_obj = super().create(obj_in)
+        self.invalidate(db_obj.id)
+        return db_obj
+
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = super().update(id, obj_in)
+        if db_obj:
+            self.invalidate(id)
+        return db_obj
+
+    def delete(self, id: int) -> bool:
+        deleted = super().delete(id)
+        if deleted:
+            self.invalidate(id)
+        return deleted
+
+    def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = super().update_returning(id, obj_in)
+        if db_obj:
+            self.invalidate(id)
+        return db_obj
+
+    def delete_returning(self, id: int) -> bool:
+        deleted = super().delete_returning(id)
+        if deleted:
+            self.invalidate(id)
+        return deleted
+
+
+class AsyncBaseService(Generic[ModelType]):
+    def __init__(self, repository: AsyncBaseRepository[ModelType]):
+        self.repository = repository
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self.repository.get(id)
+
+    async def get_all(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        order_direction: str = "asc"
+    ) -> List[ModelType]:
+        return await self.repository.get_all(skip, limit, order_by, order_direction)
+
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        return await self.repository.get_page(cursor, limit, order_by, order_direction, **filters)
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        return await self.repository.create(obj_in)
+
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        return await self.repository.update(id, obj_in)
+
+    async def delete(self, id: int) -> bool:
+        return await self.repository.delete(id)
+
+    async def update_returning(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        return await self.repository.update_returning(id, obj_in)
+
+    async def delete_returning(self, id: int) -> bool:
+        return await self.repository.delete_returning(id)
+
+    async def filter_by(self, **filters) -> List[ModelType]:
+        return await self.repository.filter_by(**filters)
+
+    async def filter_page(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelType]:
+        return await self.repository.filter_page(skip, limit, **filters)
+
+    async def count(self, **filters) -> int:
+        return await self.repository.count(**filters)
+
+    async def get_one_by(self, **filters) -> Optional[ModelType]:
+        return await self.repository.get_one_by(**filters)
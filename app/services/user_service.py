@@ -1,17 +1,20 @@
 from typing import Optional
-from passlib.context import CryptContext
+from fastapi.concurrency import run_in_threadpool
+from app.database.database import unit_of_work
 from app.repositories.user_repository import UserRepository
+from app.services.cart_service import user_cart_ids
 from app.services.service import BaseService
 from app.models.users import UserModel
 from app.schemas.user_schema import UserCreate
+from app.utils.password_hasher import password_hasher
+from app.utils.role_registry import role_registry
+from app.utils.tokens import create_access_token
 from app.exceptions.user_exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
     InvalidCredentialsException
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class UserService(BaseService[UserModel]):
     def __init__(self, user_repository: UserRepository):
         super().__init__(user_repository)
@@ -26,45 +29,59 @@ class UserService(BaseService[UserModel]):
     def get_by_email(self, email: str) -> Optional[UserModel]:
         return self.user_repository.get_by_email(email)
     
-    def create_user(self, user_data: UserCreate) -> UserModel:
-        existing_user = self.get_by_email(user_data.email)
+    # bcrypt выполняется в пуле процессов (password_hasher), запросы к БД - в пуле потоков:
+    # поток занят только на время SELECT/INSERT, а не на время хеширования
+    
+    async def create_user(self, user_data: UserCreate) -> UserModel:
+        existing_user = await run_in_threadpool(self.get_by_email, user_data.email)
         if existing_user:
             raise UserAlreadyExistsException(email=user_data.email)
         
-        
-        hashed_password = pwd_context.hash(user_data.password)
         user_dict = user_data.dict(exclude={"password"})
-        user_dict["hashed_password"] = hashed_password
+        user_dict["hashed_password"] = await password_hasher.hash(user_data.password)
         
-        return self.user_repository.create(user_dict)
+        return await run_in_threadpool(self.user_repository.create, user_dict)
     
-    def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
-        user = self.get_by_email(email)
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        user = await run_in_threadpool(self.get_by_email, email)
         if not user:
             raise InvalidCredentialsException()
         
-        if not pwd_context.verify(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsException()
         
         return user
     
-    def update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
-        # Проверяем существование пользователя
-        self.get(user_id)
-        
-        # Проверяем, не используется ли email другим пользователем
-        if "email" in update_data:
-            existing_user = self.get_by_email(update_data["email"])
-            if existing_user and existing_user.id != user_id:
-                raise UserAlreadyExistsException(email=update_data["email"])
-        
-        # Хешируем пароль, если он предоставлен
+    def create_access_token(self, user: UserModel) -> str:
+        return create_access_token(user.id, user.role_id, self.get_role_name(user))
+    
+    def get_role_name(self, user: UserModel) -> str:
+        return role_registry.name(user.role_id) or ""
+    
+    async def update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
+        # Хешируем пароль, если он предоставлен, - до транзакции, а не внутри неё
         if "password" in update_data:
-            update_data["hashed_password"] = pwd_context.hash(update_data.pop("password"))
-        
-        return self.user_repository.update(user_id, update_data)
+            update_data["hashed_password"] = await password_hasher.hash(update_data.pop("password"))
+        return await run_in_threadpool(self._update_user, user_id, update_data)
+    
+    def _update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
+        with unit_of_work(self.user_repository.db):
+            # Проверяем существование пользователя
+            self.get(user_id)
+            
+            # Проверяем, не используется ли email другим пользователем
+            if "email" in update_data:
+                existing_user = self.get_by_email(update_data["email"])
+                if existing_user and existing_user.id != user_id:
+                    raise UserAlreadyExistsException(email=update_data["email"])
+            
+            return self.user_repository.update(user_id, update_data)
     
     def delete(self, id: int) -> bool:
-        # Проверяем существование пользователя
-        self.get(id)
-        return super().delete(id)
\ No newline at end of file
+        with unit_of_work(self.user_repository.db):
+            # Проверяем существование пользователя
+            self.get(id)
+            deleted = super().delete(id)
+        # Корзина удалена вместе с пользователем - кэшированный id больше не действителен
+        user_cart_ids.pop(id)
+        return deleted
\ No newline at end of file
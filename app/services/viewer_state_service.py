@@ -0,0 +1,42 @@
+from typing import Any, List, Type, TypeVar
+from pydantic import BaseModel
+from app.repositories.cart_item_repository import SyncCartItemRepository
+from app.services.favorite_service import FavoriteService
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+class ViewerStateService:
+    """
+    Флаги is_favorited/in_cart для страницы каталога, чтобы витрина рисовала
+    сердечки и корзину одним запросом. Избранное берётся из кэша множеств
+    пользователя (FavoriteService.get_favorite_refs), корзина - одним
+    SELECT ... IN по id страницы.
+    """
+
+    def __init__(self, favorite_service: FavoriteService, cart_item_repository: SyncCartItemRepository):
+        self.favorite_service = favorite_service
+        self.cart_item_repository = cart_item_repository
+
+    def annotate(
+        self,
+        viewer_id: int,
+        item_type: str,
+        items: List[Any],
+        schema: Type[SchemaType]
+    ) -> List[SchemaType]:
+        """Элементы страницы (ORM-объекты или снимки схем) в schema с флагами зрителя"""
+        if not items:
+            return []
+
+        favorite_ids = self.favorite_service.get_favorite_refs(viewer_id)[item_type]
+        in_cart_ids = self.cart_item_repository.get_in_cart_ids(
+            viewer_id, item_type, [item.id for item in items]
+        )
+        return [
+            schema.model_validate(item, from_attributes=True).model_copy(update={
+                "is_favorited": item.id in favorite_ids,
+                "in_cart": item.id in in_cart_ids,
+            })
+            for item in items
+        ]
@@ -401,7 +401,7 @@ async function addItemToCartAPI(item, itemType) {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        'X-User-Id': user.id.toString()
+        'Authorization': `Bearer ${user.access_token}`
       },
       body: JSON.stringify(requestData)
     });
@@ -505,7 +505,7 @@ async function updateCartItemQuantityAPI(cartItemId, newQty) {
       method: 'PUT',
       headers: {
         'Content-Type': 'application/json',
-        'X-User-Id': user.id.toString()
+        'Authorization': `Bearer ${user.access_token}`
       },
       body: JSON.stringify({ quantity: newQty })
     });
@@ -552,7 +552,7 @@ async function removeItemFromCartAPI(cartItemId) {
     const response = await fetch(`${API_BASE_URL}/carts/my/items/${cartItem.api_id}`, {
       method: 'DELETE',
       headers: {
-        'X-User-Id': user.id.toString()
+        'Authorization': `Bearer ${user.access_token}`
       }
     });
     
@@ -585,7 +585,7 @@ async function clearCartAPI() {
     const response = await fetch(`${API_BASE_URL}/carts/my/clear`, {
       method: 'DELETE',
       headers: {
-        'X-User-Id': user.id.toString()
+        'Authorization': `Bearer ${user.access_token}`
       }
     });
     
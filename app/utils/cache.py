@@ -0,0 +1,254 @@
+"""
+Read-through кэш для каталога (товары, объявления, авторские объявления).
+
+Бэкенд подключаемый: сервисы работают с интерфейсом CacheBackend, по умолчанию
+используется InMemoryLRUCache - LRU в памяти процесса с TTL и ограничением размера.
+
+Ключи - кортежи вида (namespace, "detail", id) или (namespace, "list", ...).
+Запись в namespace (create/update/delete/status) удаляет detail-ключ конкретного id
+и все list-ключи namespace: в списке может оказаться любая изменённая строка.
+
+Stale-while-revalidate: просроченная запись "горячего" ключа (не меньше
+CACHE_HOT_HITS попаданий) ещё CACHE_STALE_TTL секунд отдаётся остальным запросам,
+пока один запрос перечитывает её из БД.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from app.config import settings
+
+CacheKey = Tuple[Hashable, ...]
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    hits: int = 0
+    refreshing: bool = False
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class CacheBackend:
+    """Интерфейс кэша, который используют сервисы"""
+
+    def get_or_load(self, key: CacheKey, loader: Callable[[], Any]) -> Any:
+        raise NotImplementedError
+
+    def invalidate(self, key: CacheKey) -> None:
+        raise NotImplementedError
+
+    def invalidate_namespace(self, namespace: str, *ids: int) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Кэш-заглушка: всегда читает из БД (CACHE_ENABLED=False)"""
+
+    def get_or_load(self, key: CacheKey, loader: Callable[[], Any]) -> Any:
+        return loader()
+
+    def invalidate(self, key: CacheKey) -> None:
+        pass
+
+    def invalidate_namespace(self, namespace: str, *ids: int) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+class InMemoryLRUCache(CacheBackend):
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 60,
+        stale_ttl: float = 30,
+        hot_hits: int = 3
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hot_hits = hot_hits
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        # Поколение namespace растёт при каждой инвалидации; загрузка, начатая
+        # до инвалидации, не должна записать в кэш устаревшее значение
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get_or_load(self, key: CacheKey, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.expires_at:
+                    self._touch(key, entry)
+                    self._stats.hits += 1
+                    return entry.value
+                if now < entry.stale_until and entry.hits >= self.hot_hits:
+                    if entry.refreshing:
+                        self._touch(key, entry)
+                        self._stats.stale_hits += 1
+                        return entry.value
+                    entry.refreshing = True
+            self._stats.misses += 1
+            generation = self._generations.get(key[0], 0)
+
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                if entry is not None:
+                    entry.refreshing = False
+            raise
+
+        self._store(key, value, generation)
+        return value
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self._generations[key[0]] = self._generations.get(key[0], 0) + 1
+            if self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
+
+    def invalidate_namespace(self, namespace: str, *ids: int) -> None:
+        """Удаляет detail-ключи переданных id и все list-ключи namespace"""
+        detail_keys = {(namespace, "detail", id) for id in ids}
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            stale = [
+                key for key in self._entries
+                if key in detail_keys or (key[0] == namespace and key[1] == "list")
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._stats.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in {key[0] for key in self._entries}:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                **self._stats.as_dict(),
+            }
+
+    def _touch(self, key: CacheKey, entry: CacheEntry) -> None:
+        entry.hits += 1
+        self._entries.move_to_end(key)
+
+    def _store(self, key: CacheKey, value: Any, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            previous = self._entries.pop(key, None)
+            now = time.monotonic()
+            self._entries[key] = CacheEntry(
+                value=value,
+                expires_at=now + self.ttl,
+                stale_until=now + self.ttl + self.stale_ttl,
+                hits=previous.hits if previous is not None else 0,
+            )
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+
+class LRUMapping:
+    """
+    Потокобезопасный словарь с ограничением размера и вытеснением LRU, без TTL.
+    Для неизменяемых соответствий вроде user_id -> cart_id.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def discard_value(self, value: Any) -> None:
+        """Удаляет все ключи с данным значением (редкий путь, O(n))"""
+        with self._lock:
+            for key in [key for key, stored in self._data.items() if stored == value]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def create_cache(**overrides: Any) -> CacheBackend:
+    """Кэш с параметрами CACHE_* из настроек; overrides заменяет отдельные параметры"""
+    if not settings.CACHE_ENABLED:
+        return NullCache()
+    options = {
+        "max_size": settings.CACHE_MAX_SIZE,
+        "ttl": settings.CACHE_TTL,
+        "stale_ttl": settings.CACHE_STALE_TTL,
+        "hot_hits": settings.CACHE_HOT_HITS,
+    }
+    return InMemoryLRUCache(**{**options, **overrides})
+
+
+# Общий кэш каталога процесса; namespace разделяет товары и объявления
+catalog_cache: CacheBackend = create_cache()
+
+# user_id -> id избранного по типам; без stale-while-revalidate, чтобы сердечко
+# не отставало от только что нажатой кнопки
+favorite_set_cache: CacheBackend = create_cache(
+    max_size=settings.FAVORITE_SET_CACHE_SIZE,
+    ttl=settings.FAVORITE_SET_CACHE_TTL,
+    stale_ttl=0,
+)
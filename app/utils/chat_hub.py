@@ -0,0 +1,92 @@
+"""
+Pub/sub чата поддержки в памяти процесса: канал на пользователя (user_id диалога).
+
+Каждое подключение /chat/ws/{user_id} - подписка с ограниченной очередью
+CHAT_WS_QUEUE_SIZE. publish() можно вызывать из любого потока (синхронные
+обработчики FastAPI работают в пуле потоков): сообщение сериализуется один раз
+и раскладывается в очереди подписчиков через loop.call_soon_threadsafe.
+Подписчик, не успевающий забирать сообщения, отключается (очередь переполнена):
+клиент переподключается и дочитывает историю через REST.
+
+Рассылка работает только внутри одного процесса: при нескольких воркерах uvicorn
+подписчик получает сообщения, отправленные через тот же воркер.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+from app.config import settings
+
+
+class ChatSubscription:
+    """Подписка одного WebSocket-подключения на канал пользователя"""
+
+    __slots__ = ("user_id", "loop", "queue", "overflowed")
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, payload: str) -> None:
+        """Выполняется в цикле событий подписчика"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Медленный клиент: вместо накопления сообщений закрываем подключение
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[str]:
+        """Следующее сообщение; None - подписка переполнена и должна быть закрыта"""
+        return await self.queue.get()
+
+
+class ChatHub:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._channels: Dict[int, Set[ChatSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> ChatSubscription:
+        """Вызывается из корутины подключения"""
+        subscription = ChatSubscription(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._channels.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChatSubscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.user_id)
+            if channel is None:
+                return
+            channel.discard(subscription)
+            if not channel:
+                del self._channels[subscription.user_id]
+
+    def publish(self, user_id: int, payload: str) -> int:
+        """Разослать payload подписчикам канала user_id; возвращает число подписчиков"""
+        with self._lock:
+            subscribers = list(self._channels.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, payload)
+            except RuntimeError:
+                # Цикл событий подписчика уже закрыт (остановка сервера)
+                self.unsubscribe(subscription)
+        return len(subscribers)
+
+    def subscriber_count(self, user_id: Optional[int] = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._channels.get(user_id, ()))
+            return sum(len(channel) for channel in self._channels.values())
+
+
+chat_hub = ChatHub(settings.CHAT_WS_QUEUE_SIZE)
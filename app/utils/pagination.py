@@ -0,0 +1,100 @@
+"""
+Keyset (cursor) пагинация по паре (колонка сортировки, id).
+
+Курсор - непрозрачная base64-строка с последними значениями ключа страницы.
+Следующая страница выбирается условием `(col, id) > (value, last_id)` вместо
+OFFSET, поэтому стоимость запроса не зависит от глубины страницы.
+"""
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy import Select, asc, desc, tuple_
+
+from app.exceptions.pagination_exceptions import InvalidCursorException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(value: Any, id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    raw = json.dumps([value, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, column) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if value is not None:
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+        return value, int(id)
+    except (ValueError, TypeError, ArithmeticError, NotImplementedError):
+        raise InvalidCursorException()
+
+
+def get_sort_column(model, order_by: str):
+    column = getattr(model, order_by, None)
+    if column is None or not hasattr(column, "type"):
+        raise InvalidCursorException(detail=f"Сортировка по полю '{order_by}' не поддерживается")
+    return column
+
+
+def apply_cursor(
+    query: Select,
+    model,
+    cursor: Optional[str],
+    limit: int,
+    order_by: str = "id",
+    order_direction: str = "asc"
+) -> Select:
+    """Добавляет к select() условие курсора, сортировку (col, id) и LIMIT limit + 1"""
+    column = get_sort_column(model, order_by)
+    descending = order_direction.lower() == "desc"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, column)
+        if order_by == "id":
+            query = query.where(model.id < last_id if descending else model.id > last_id)
+        else:
+            key = tuple_(column, model.id)
+            query = query.where(key < (value, last_id) if descending else key > (value, last_id))
+
+    direction = desc if descending else asc
+    if order_by == "id":
+        query = query.order_by(direction(model.id))
+    else:
+        query = query.order_by(direction(column), direction(model.id))
+
+    # Запрашиваем на одну строку больше, чтобы узнать, есть ли следующая страница
+    return query.limit(limit + 1)
+
+
+def build_page(items: List[Any], limit: int, order_by: str = "id") -> Tuple[List[Any], Optional[str]]:
+    """Обрезает лишнюю строку и формирует next_cursor по последнему элементу"""
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, order_by), last.id)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def set_total_count(response: Response, total: int) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
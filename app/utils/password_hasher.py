@@ -0,0 +1,145 @@
+"""
+Хеширование и проверка паролей (bcrypt) в отдельном пуле процессов.
+
+Вызов bcrypt - десятки-сотни миллисекунд CPU. Выполняясь в обработчике, он занимал
+поток пула anyio, нужный всем синхронным маршрутам, и держал GIL: всплеск входов
+останавливал чтение каталога. Методы PasswordHasher асинхронные: обработчик ждёт
+результат в цикле событий, не занимая поток, а работу выполняют PASSWORD_HASH_WORKERS
+процессов.
+
+Одновременно выполняется не больше PASSWORD_HASH_WORKERS вызовов, остальные ждут
+в очереди длиной до PASSWORD_HASH_MAX_QUEUE; сверх неё - PasswordHashingBusyException
+(503), а не бесконечное ожидание. stats() - глубина очереди и задержки
+(GET /admin/password-hashing/stats).
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.exceptions.user_exceptions import PasswordHashingBusyException
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Выполняются в процессах пула
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+@dataclass
+class HashingStats:
+    completed: int = 0
+    rejected: int = 0
+    queued: int = 0  # сейчас ждут свободного процесса
+    in_flight: int = 0  # сейчас выполняются
+    max_queued: int = 0
+    wait_seconds: float = 0.0  # суммарно по completed
+    hash_seconds: float = 0.0
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._stats = HashingStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._stats
+        completed = stats.completed or 1
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": stats.queued,
+            "in_flight": stats.in_flight,
+            "max_queued": stats.max_queued,
+            "completed": stats.completed,
+            "rejected": stats.rejected,
+            "avg_wait_ms": round(stats.wait_seconds / completed * 1000, 2),
+            "avg_hash_ms": round(stats.hash_seconds / completed * 1000, 2),
+        }
+
+    def start(self) -> None:
+        """Поднять процессы заранее (lifespan), чтобы первый вход не ждал их запуска"""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(time.sleep, 0)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    async def _run(self, function: Callable, *args) -> Any:
+        stats = self._stats
+        slots = self._get_slots()
+        if slots.locked() and stats.queued >= self.max_queue:
+            stats.rejected += 1
+            raise PasswordHashingBusyException()
+
+        queued_at = time.perf_counter()
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        try:
+            await slots.acquire()
+        finally:
+            stats.queued -= 1
+
+        started_at = time.perf_counter()
+        stats.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), function, *args)
+        except BrokenProcessPool:
+            # Процесс пула упал: следующий вызов создаст пул заново
+            self.shutdown()
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.completed += 1
+            stats.wait_seconds += started_at - queued_at
+            stats.hash_seconds += time.perf_counter() - started_at
+            slots.release()
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Семафор привязан к циклу событий; новый цикл (перезапуск, TestClient) - новый семафор
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: дочерние процессы не наследуют потоки и соединения с БД родителя
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
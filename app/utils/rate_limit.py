@@ -0,0 +1,75 @@
+"""
+Ограничение частоты попыток входа (POST /users/authenticate) в памяти процесса.
+
+Каждая попытка, в том числе неудачная, проверяется по двум скользящим окнам:
+не больше LOGIN_ATTEMPTS_PER_EMAIL на email и LOGIN_ATTEMPTS_PER_IP на IP-адрес
+за LOGIN_THROTTLE_WINDOW секунд. Отклонённая попытка не доходит до bcrypt
+и не занимает очередь пула хеширования.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Hashable, Optional
+
+from app.config import settings
+
+
+class SlidingWindowLimiter:
+    """
+    Не больше limit событий на ключ за window секунд. Потокобезопасный;
+    число ключей ограничено max_keys, давно не встречавшиеся вытесняются (LRU).
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._events: "OrderedDict[Hashable, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: Hashable) -> float:
+        """Учесть событие; 0 - разрешено, иначе через сколько секунд повторить"""
+        now = time.monotonic()
+        with self._lock:
+            events = self._events.get(key)
+            if events is None:
+                events = self._events[key] = deque()
+            self._events.move_to_end(key)
+            while events and events[0] <= now - self.window:
+                events.popleft()
+            if len(events) >= self.limit:
+                return events[0] + self.window - now
+            events.append(now)
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+            return 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+class LoginThrottle:
+    def __init__(self, per_email: int, per_ip: int, window: float):
+        self.by_email = SlidingWindowLimiter(per_email, window)
+        self.by_ip = SlidingWindowLimiter(per_ip, window)
+
+    def check(self, email: str, ip: Optional[str]) -> float:
+        """0 - попытку можно выполнять, иначе секунды до следующей разрешённой"""
+        if ip is not None:
+            retry_after = self.by_ip.hit(ip)
+            if retry_after:
+                return retry_after
+        return self.by_email.hit(email.strip().lower())
+
+    def clear(self) -> None:
+        self.by_email.clear()
+        self.by_ip.clear()
+
+
+login_throttle = LoginThrottle(
+    settings.LOGIN_ATTEMPTS_PER_EMAIL,
+    settings.LOGIN_ATTEMPTS_PER_IP,
+    settings.LOGIN_THROTTLE_WINDOW
+)
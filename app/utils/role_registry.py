@@ -0,0 +1,96 @@
+"""
+Справочник ролей в памяти процесса: id -> имя.
+
+Ролей единицы и меняются они редко, поэтому проверки прав (check_admin,
+require_admin), имя роли в токене и в ответах админки, а также GET /roles/
+берутся отсюда, а не из БД на каждый запрос. Справочник загружается в lifespan
+и перечитывается после каждой записи через /roles (RoleService). При нескольких
+воркерах запись видна остальным после фонового перечитывания раз в
+ROLE_REGISTRY_REFRESH_INTERVAL секунд.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.roles import RoleModel
+
+logger = logging.getLogger(__name__)
+
+ADMIN_ROLE = "admin"
+
+
+class RoleRegistry:
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._roles: List[Dict[str, object]] = []
+        self._etag = ""
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        """Перечитать роли в сессии db; после записи - уже после commit"""
+        rows = db.execute(select(RoleModel.id, RoleModel.name).order_by(RoleModel.id)).all()
+        roles = [{"id": row.id, "name": row.name} for row in rows]
+        etag = hashlib.sha1(json.dumps(roles, ensure_ascii=False).encode()).hexdigest()[:16]
+        with self._lock:
+            self._roles = roles
+            self._names = {role["id"]: role["name"] for role in roles}
+            self._ids = {role["name"].lower(): role["id"] for role in roles}
+            self._etag = f'"roles-{etag}"'
+            self._loaded = True
+
+    def refresh(self) -> None:
+        with SessionLocal() as db:
+            self.load(db)
+
+    def roles(self) -> List[Dict[str, object]]:
+        self._ensure_loaded()
+        return self._roles
+
+    @property
+    def etag(self) -> str:
+        self._ensure_loaded()
+        return self._etag
+
+    def get(self, role_id: int) -> Optional[Dict[str, object]]:
+        name = self.name(role_id)
+        return None if name is None else {"id": role_id, "name": name}
+
+    def name(self, role_id: int) -> Optional[str]:
+        self._ensure_loaded()
+        return self._names.get(role_id)
+
+    def id_by_name(self, name: str) -> Optional[int]:
+        self._ensure_loaded()
+        return self._ids.get(name.lower())
+
+    def is_admin(self, role_id: int) -> bool:
+        name = self.name(role_id)
+        return name is not None and name.lower() == ADMIN_ROLE
+
+    def _ensure_loaded(self) -> None:
+        # Вне приложения (скрипты, shell) справочник читается при первом обращении
+        if not self._loaded:
+            self.refresh()
+
+
+role_registry = RoleRegistry()
+
+
+async def run_role_registry_refresher(interval_seconds: int) -> None:
+    """Фоновое перечитывание ролей; подхватывает записи, сделанные другими воркерами"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(role_registry.refresh)
+        except Exception:
+            logger.exception("Role registry refresh failed")
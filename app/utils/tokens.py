@@ -0,0 +1,72 @@
+"""
+Токены доступа (JWT, подпись SECRET_KEY алгоритмом ALGORITHM).
+
+POST /users/authenticate выдаёт токен с id пользователя и его ролью; зависимости
+аутентификации (get_current_user, check_admin, get_current_user_id) проверяют подпись
+и срок действия в процессе и не обращаются к БД. Роль в токене - на момент входа:
+назначение пользователю другой роли или его удаление вступает в силу не позже чем через
+ACCESS_TOKEN_EXPIRE_MINUTES. Права роли (is_admin) определяются по role_id через
+справочник ролей и меняются сразу при записи в /roles.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+from fastapi import Request
+
+from app.config import settings
+from app.exceptions.user_exceptions import InvalidTokenException
+from app.utils.role_registry import role_registry
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """Пользователь из проверенного токена"""
+    id: int
+    role_id: int
+    role: str  # имя роли на момент входа - для клиента; права проверяются по role_id
+
+    @property
+    def is_admin(self) -> bool:
+        return role_registry.is_admin(self.role_id)
+
+
+def create_access_token(user_id: int, role_id: int, role: str, expires_minutes: Optional[int] = None) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": str(user_id),
+        "role_id": role_id,
+        "role": role.lower(),
+        "iat": now,
+        "exp": now + timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> TokenUser:
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["sub", "exp"]}
+        )
+        return TokenUser(id=int(payload["sub"]), role_id=int(payload["role_id"]), role=str(payload["role"]))
+    except jwt.ExpiredSignatureError:
+        raise InvalidTokenException("Срок действия токена истёк")
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        raise InvalidTokenException("Недействительный токен")
+
+
+def get_bearer_token(request: Request) -> str:
+    """Токен из заголовка Authorization: Bearer <token>"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise InvalidTokenException()
+    return token.strip()
+
+
+def get_token_user(request: Request) -> TokenUser:
+    return decode_access_token(get_bearer_token(request))
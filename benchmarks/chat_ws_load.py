@@ -0,0 +1,173 @@
+"""
+Нагрузочная проверка /chat/ws/{user_id}: тысячи простаивающих WebSocket-подключений
+к настоящему uvicorn (с теми же параметрами WebSocket, что и в main.py) во временной
+SQLite-базе. Измеряет прирост RSS процесса сервера на одно подключение и задержку
+рассылки: по одному сообщению в каждый диалог через POST /chat/ должно дойти до всех
+подключений этого диалога. RSS читается из /proc (Linux).
+Запуск: python -m benchmarks.chat_ws_load [подключений] [диалогов]
+"""
+
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BATCH = 200  # одновременных рукопожатий
+SETTLE_SECONDS = 2
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS не найден")
+
+
+def raise_fd_limit(needed: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def wait_for_server(base_url: str, server: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn завершился с кодом {server.returncode}")
+        try:
+            urllib.request.urlopen(f"{base_url}/docs", timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn не запустился")
+
+
+def post_message(base_url: str, user_id: int) -> None:
+    request = urllib.request.Request(
+        f"{base_url}/chat/",
+        data=json.dumps({
+            "user_id": user_id,
+            "massage_text": "load test",
+            "massage_type": "support",
+            "is_from_user": False,
+        }).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    urllib.request.urlopen(request, timeout=30).close()
+
+
+async def run_clients(base_url: str, ws_url: str, pid: int, connections: int, users: int) -> list:
+    import websockets
+    from app.utils.tokens import create_access_token
+
+    problems = []
+    baseline = rss_kib(pid)
+    sockets = []
+    for start in range(0, connections, BATCH):
+        batch = range(start, min(start + BATCH, connections))
+        sockets += await asyncio.gather(*(
+            websockets.connect(
+                f"{ws_url}/chat/ws/{i % users + 1}?token={create_access_token(i % users + 1, 1, 'user')}",
+                ping_interval=None, max_queue=4
+            )
+            for i in batch
+        ))
+    await asyncio.sleep(SETTLE_SECONDS)
+    connected = rss_kib(pid)
+    per_connection = (connected - baseline) * 1024 / connections
+    print(f"{connections} подключений к {users} диалогам: RSS сервера {baseline} -> {connected} KiB, "
+          f"~{per_connection / 1024:.1f} KiB на подключение")
+
+    # Задержка - от начала POST в диалог до получения сообщения подключением
+    posted_at = {}
+    latencies = []
+
+    async def receive(websocket) -> None:
+        message = json.loads(await asyncio.wait_for(websocket.recv(), timeout=30))
+        latencies.append(time.monotonic() - posted_at[message["user_id"]])
+        if message.get("is_from_user") is not False:
+            problems.append(f"неожиданное сообщение: {message}")
+
+    def post_all() -> None:
+        for user_id in range(1, users + 1):
+            posted_at[user_id] = time.monotonic()
+            post_message(base_url, user_id)
+
+    receivers = [asyncio.create_task(receive(websocket)) for websocket in sockets]
+    await asyncio.to_thread(post_all)
+    results = await asyncio.gather(*receivers, return_exceptions=True)
+    lost = sum(isinstance(result, BaseException) for result in results)
+    if lost:
+        problems.append(f"{lost} из {connections} подключений не получили сообщение")
+    if latencies:
+        latencies.sort()
+        print(f"рассылка {users} сообщений: доставлено {len(latencies)}/{connections}, "
+              f"p50 {latencies[len(latencies) // 2] * 1000:.0f} мс, "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f} мс, "
+              f"max {latencies[-1] * 1000:.0f} мс")
+
+    await asyncio.gather(*(websocket.close() for websocket in sockets), return_exceptions=True)
+    return problems
+
+
+def main(connections: int = 2000, users: int = 100) -> int:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    raise_fd_limit(connections * 2 + 256)
+
+    from app.database.database import SessionLocal, create_tables, engine
+    from app.models.roles import RoleModel
+    from app.models.users import UserModel
+
+    create_tables()
+    with SessionLocal() as db:
+        db.add(RoleModel(id=1, name="user"))
+        db.add_all(
+            UserModel(id=i, name=f"u{i}", email=f"u{i}@example.com", hashed_password="x", role_id=1)
+            for i in range(1, users + 1)
+        )
+        db.commit()
+    engine.dispose()
+
+    port = free_port()
+    base_url, ws_url = f"http://127.0.0.1:{port}", f"ws://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--ws-per-message-deflate", "false"],
+        env=os.environ.copy(),
+    )
+    try:
+        wait_for_server(base_url, server)
+        problems = asyncio.run(run_clients(base_url, ws_url, server.pid, connections, users))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("ok")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:3])))
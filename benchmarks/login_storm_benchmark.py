@@ -0,0 +1,138 @@
+"""
+Задержка чтения каталога во время волны входов: настоящий uvicorn во временной
+SQLite-базе, CATALOG_CLIENTS клиентов читают GET /products/, сначала одни,
+затем одновременно с LOGIN_CLIENTS клиентами POST /users/authenticate (пароль
+верный, bcrypt на каждый запрос). Ограничение попыток входа на время замера
+снято через переменные окружения, чтобы до bcrypt доходил каждый запрос.
+Печатает p50/p99 каталога в обоих режимах и метрики пула хеширования.
+Запуск: python -m benchmarks.login_storm_benchmark [секунд] [клиентов входа]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.chat_ws_load import free_port, wait_for_server
+
+CATALOG_CLIENTS = 4
+PASSWORD = "benchmark-password"
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def request(url: str, method: str = "GET") -> int:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method=method), timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run_clients(url: str, method: str, clients: int, stop: threading.Event) -> tuple:
+    """clients потоков шлют запросы до stop; возвращает (задержки, коды ответов)"""
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def client() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            status = request(url, method)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    with ThreadPoolExecutor(clients) as pool:
+        for _ in range(clients):
+            pool.submit(client)
+    return latencies, statuses
+
+
+def measure(base_url: str, seconds: float, login_clients: int) -> tuple:
+    stop = threading.Event()
+    query = urllib.parse.urlencode({"email": "storm@example.com", "password": PASSWORD})
+    with ThreadPoolExecutor(2) as runner:
+        catalog = runner.submit(run_clients, f"{base_url}/products/?limit=20", "GET", CATALOG_CLIENTS, stop)
+        logins = None
+        if login_clients:
+            logins = runner.submit(run_clients, f"{base_url}/users/authenticate?{query}", "POST", login_clients, stop)
+        time.sleep(seconds)
+        stop.set()
+        return catalog.result(), logins.result() if logins else None
+
+
+def report(title: str, latencies: list, statuses: dict, seconds: float) -> None:
+    print(f"{title}: {len(latencies)} запросов ({len(latencies) / seconds:.0f}/с), коды {statuses}, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.0f} мс, p99 {percentile(latencies, 0.99) * 1000:.0f} мс")
+
+
+def main(seconds: int = 10, login_clients: int = 32) -> int:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["LOGIN_ATTEMPTS_PER_EMAIL"] = os.environ["LOGIN_ATTEMPTS_PER_IP"] = "1000000000"
+
+    from passlib.context import CryptContext
+    from app.database.database import SessionLocal, create_tables, engine
+    from app.models.products import ProductModel
+    from app.models.roles import RoleModel
+    from app.models.users import UserModel
+    from app.utils.tokens import create_access_token
+
+    create_tables()
+    with SessionLocal() as db:
+        db.add_all([RoleModel(id=1, name="user"), RoleModel(id=2, name="admin")])
+        db.add(UserModel(id=1, name="admin", email="admin@example.com", hashed_password="x", role_id=2))
+        db.add(UserModel(
+            name="storm", email="storm@example.com", role_id=1,
+            hashed_password=CryptContext(schemes=["bcrypt"]).hash(PASSWORD)
+        ))
+        db.add_all(
+            ProductModel(title=f"product {i}", price=100 + i, category="benchmark", is_active=True)
+            for i in range(200)
+        )
+        db.commit()
+    engine.dispose()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        wait_for_server(base_url, server)
+        (catalog, statuses), _ = measure(base_url, seconds, 0)
+        report("каталог без нагрузки", catalog, statuses, seconds)
+        (catalog, statuses), (logins, login_statuses) = measure(base_url, seconds, login_clients)
+        report(f"каталог во время {login_clients} клиентов входа", catalog, statuses, seconds)
+        report("вход", logins, login_statuses, seconds)
+        stats = urllib.request.Request(
+            f"{base_url}/admin/password-hashing/stats",
+            headers={"Authorization": f"Bearer {create_access_token(1, 2, 'admin')}"}
+        )
+        with urllib.request.urlopen(stats, timeout=10) as response:
+            print(f"пул хеширования: {json.loads(response.read())}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:3])))
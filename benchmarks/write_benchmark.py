@@ -0,0 +1,94 @@
+"""
+Бенчмарк конкурентной записи в SQLite: профиль по умолчанию против PRAGMA-профиля из настроек.
+Запуск: python -m benchmarks.write_benchmark [потоков] [записей_на_поток]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database.database import apply_sqlite_pragmas
+
+
+def run_profile(use_pragmas: bool, threads: int, writes_per_thread: int) -> dict:
+    """Запускает конкурентные вставки (по коммиту на запись) и возвращает статистику"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    engine_options = dict(settings.engine_options)
+    engine_options.update(pool_size=threads, max_overflow=0)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        **engine_options
+    )
+    if use_pragmas:
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE chat_massage ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+            "massage_text TEXT NOT NULL, sent_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+
+    stats = {"ok": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def worker(user_id: int):
+        ok = locked = 0
+        for i in range(writes_per_thread):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO chat_massage (user_id, massage_text) VALUES (:u, :t)"),
+                        {"u": user_id, "t": f"message {i}"}
+                    )
+                ok += 1
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+        with lock:
+            stats["ok"] += ok
+            stats["locked"] += locked
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    stats["elapsed"] = elapsed
+    stats["writes_per_sec"] = stats["ok"] / elapsed if elapsed else 0.0
+    return stats
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    writes_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"Потоков: {threads}, записей на поток: {writes_per_thread}")
+    for title, use_pragmas in (("default", False), ("pragmas", True)):
+        stats = run_profile(use_pragmas, threads, writes_per_thread)
+        print(
+            f"{title:>8}: {stats['ok']} записей за {stats['elapsed']:.2f} с "
+            f"({stats['writes_per_sec']:.0f} зап/с), database is locked: {stats['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
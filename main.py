@@ -3,7 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
-from app.database.database import engine, Base, create_tables
+from app.database.database import engine, async_engine, Base, create_tables
+from app.database.backfill import backfill_counter_tables
 from app.router import (
     role_router,
     user_router,
@@ -18,6 +19,13 @@ from app.router import (
     admin_router  # НОВЫЙ ИМПОРТ
 )
 from app.exceptions.handler import setup_exception_handlers
+from app.config import settings
+from app.services.chat_archive_service import run_chat_archiver
+from app.utils.password_hasher import password_hasher
+from app.utils.role_registry import role_registry, run_role_registry_refresher
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.router.review_router import RATING_HEADERS
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
@@ -57,12 +65,31 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to create database tables: {e}")
         raise
     
+    try:
+        # Таблицы счётчиков, созданные create_all, пусты - заполняем из исходных данных
+        backfill_counter_tables()
+    except Exception as e:
+        # Параллельно стартующий воркер мог заполнить их сам
+        logger.warning(f"⚠️ Counter tables backfill failed: {e}")
+    
     logger.info(f"📊 Database URL: {os.getenv('DATABASE_URL', 'sqlite:///./app.db')}")
     logger.info("✅ Application started successfully")
     
+    role_registry.refresh()
+    role_refresher = asyncio.create_task(run_role_registry_refresher(settings.ROLE_REGISTRY_REFRESH_INTERVAL))
+    password_hasher.start()
+    chat_archiver = None
+    if settings.CHAT_ARCHIVE_ENABLED:
+        chat_archiver = asyncio.create_task(run_chat_archiver(settings.CHAT_ARCHIVE_INTERVAL))
+    
     yield 
     
     logger.info("🛑 Shutting down E-Commerce API...")
+    if chat_archiver is not None:
+        chat_archiver.cancel()
+    role_refresher.cancel()
+    password_hasher.shutdown()
+    await async_engine.dispose()
     logger.info("👋 Application stopped successfully")
 
 
@@ -87,6 +114,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, *RATING_HEADERS],
 )
 
 setup_exception_handlers(app)
@@ -142,4 +170,6 @@ def health_check():
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run("main:app")
+    # Сообщения чата короткие: сжатие не даёт выигрыша, а контексты zlib занимают
+    # ~90 KiB на каждое WebSocket-подключение (python -m benchmarks.chat_ws_load)
+    uvicorn.run("main:app", ws_per_message_deflate=False)
@@ -23,6 +23,8 @@ from app.models.carts import CartModel
 from app.models.cart_items import CartItemModel
 from app.models.author_listing import AuthorListingModel
 from app.models.listing import ListingModel
+from app.models.rating_summary import RatingSummaryModel
+from app.models.chat_archive import ChatArchiveSegmentModel
 
 
 
@@ -0,0 +1,61 @@
+"""Add rating_summary
+
+Revision ID: 0a7d3e6c1b24
+Revises: f1c3a8d52e90
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7d3e6c1b24'
+down_revision: Union[str, None] = 'f1c3a8d52e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REVIEW_TARGET_COLUMNS = {
+    'product': 'products_id',
+    'listing': 'listing_id',
+    'author_listing': 'author_listing_id',
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rating_summary',
+        sa.Column('item_type', sa.String(length=20), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_1', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_2', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_3', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_4', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_5', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('item_type', 'item_id')
+    )
+    # get_verified_reviews: WHERE is_verified ORDER BY id LIMIT
+    op.create_index('ix_review_is_verified_id', 'review', ['is_verified', 'id'])
+    # Бэкфилл: то же, что python -m app.database.rebuild_rating_summary
+    for item_type, column in REVIEW_TARGET_COLUMNS.items():
+        op.execute(f"""
+            INSERT INTO rating_summary
+                (item_type, item_id, count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5)
+            SELECT '{item_type}', {column}, COUNT(*), SUM(rating),
+                SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END)
+            FROM review WHERE {column} IS NOT NULL
+            GROUP BY {column}
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_review_is_verified_id', table_name='review')
+    op.drop_table('rating_summary')
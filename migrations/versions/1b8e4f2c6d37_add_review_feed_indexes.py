@@ -0,0 +1,47 @@
+"""Add review feed indexes
+
+Revision ID: 1b8e4f2c6d37
+Revises: 0a7d3e6c1b24
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b8e4f2c6d37'
+down_revision: Union[str, None] = '0a7d3e6c1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REVIEW_TARGET_COLUMNS = ('products_id', 'listing_id', 'author_listing_id')
+
+
+def upgrade() -> None:
+    # Лента /reviews/{item_type}/{item_id}: (ссылка[, is_verified], created_at, id, rating)
+    op.drop_index('ix_review_products_id_created_at', table_name='review')
+    for column in REVIEW_TARGET_COLUMNS:
+        where = sa.text(f'{column} IS NOT NULL')
+        op.create_index(
+            f'ix_review_{column}_created_at', 'review', [column, 'created_at', 'id', 'rating'],
+            sqlite_where=where, postgresql_where=where
+        )
+        op.create_index(
+            f'ix_review_{column}_verified_created_at', 'review',
+            [column, 'is_verified', 'created_at', 'id', 'rating'],
+            sqlite_where=where, postgresql_where=where
+        )
+
+
+def downgrade() -> None:
+    for column in REVIEW_TARGET_COLUMNS:
+        op.drop_index(f'ix_review_{column}_verified_created_at', table_name='review')
+        op.drop_index(f'ix_review_{column}_created_at', table_name='review')
+    op.create_index(
+        'ix_review_products_id_created_at', 'review', ['products_id', 'created_at'],
+        sqlite_where=sa.text('products_id IS NOT NULL'),
+        postgresql_where=sa.text('products_id IS NOT NULL')
+    )
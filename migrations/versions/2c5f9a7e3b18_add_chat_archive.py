@@ -0,0 +1,44 @@
+"""Add chat_archive
+
+Revision ID: 2c5f9a7e3b18
+Revises: 1b8e4f2c6d37
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c5f9a7e3b18'
+down_revision: Union[str, None] = '1b8e4f2c6d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_archive',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('first_message_id', sa.Integer(), nullable=False),
+        sa.Column('last_message_id', sa.Integer(), nullable=False),
+        sa.Column('first_sent_at', sa.DateTime(), nullable=False),
+        sa.Column('last_sent_at', sa.DateTime(), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chat_archive_user_id_last_message_id', 'chat_archive', ['user_id', 'last_message_id'])
+    # Архиватор ищет самые старые сообщения по всем диалогам
+    op.create_index('ix_chat_massage_sent_at', 'chat_massage', ['sent_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_massage_sent_at', table_name='chat_massage')
+    op.drop_index('ix_chat_archive_user_id_last_message_id', table_name='chat_archive')
+    op.drop_table('chat_archive')
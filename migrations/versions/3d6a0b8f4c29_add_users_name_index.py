@@ -0,0 +1,27 @@
+"""Add users name index
+
+Revision ID: 3d6a0b8f4c29
+Revises: 2c5f9a7e3b18
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d6a0b8f4c29'
+down_revision: Union[str, None] = '2c5f9a7e3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Поиск пользователей по префиксу имени в админке: keyset по (name, id)
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_name_id', table_name='users')
@@ -0,0 +1,77 @@
+"""Add indexes for foreign keys and hot filter columns
+
+Revision ID: 7c2e5b9d41a0
+Revises: 4f0dfaed07e3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5b9d41a0'
+down_revision: Union[str, None] = '4f0dfaed07e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Каталог: фильтр + ORDER BY id для OFFSET/keyset пагинации
+    op.create_index('ix_products_category_id', 'products', ['category', 'id'])
+    op.create_index(
+        'ix_products_active_id', 'products', ['id'],
+        sqlite_where=sa.text('is_active = 1'),
+        postgresql_where=sa.text('is_active')
+    )
+    op.create_index('ix_listing_status_id', 'listing', ['status', 'id'])
+    op.create_index('ix_listing_game_topic_id', 'listing', ['game_topic', 'id'])
+    op.create_index('ix_listing_user_id_id', 'listing', ['user_id', 'id'])
+    op.create_index('ix_author_listing_status_id', 'author_listing', ['status', 'id'])
+    op.create_index('ix_author_listing_topics_games_id', 'author_listing', ['topics_games', 'id'])
+    op.create_index('ix_author_listing_user_id_id', 'author_listing', ['user_id', 'id'])
+
+    # Корзина
+    op.create_index('ix_carts_user_id', 'carts', ['user_id'])
+    op.create_index('ix_cart_items_cart_id', 'cart_items', ['cart_id'])
+
+    # Лента избранного и чат: фильтр по пользователю + сортировка по времени
+    op.create_index('ix_favorite_user_id_added_at', 'favorite', ['user_id', 'added_at', 'id'])
+    op.create_index('ix_chat_massage_user_id_sent_at', 'chat_massage', ['user_id', 'sent_at', 'id'])
+
+    # Отзывы
+    op.create_index('ix_review_user_id_id', 'review', ['user_id', 'id'])
+    op.create_index('ix_review_rating_id', 'review', ['rating', 'id'])
+    op.create_index(
+        'ix_review_products_id_created_at', 'review', ['products_id', 'created_at'],
+        sqlite_where=sa.text('products_id IS NOT NULL'),
+        postgresql_where=sa.text('products_id IS NOT NULL')
+    )
+
+    # Заказы
+    op.create_index('ix_orders_user_id_id', 'orders', ['user_id', 'id'])
+    op.create_index('ix_orders_status_id', 'orders', ['status', 'id'])
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_status_id', table_name='orders')
+    op.drop_index('ix_orders_user_id_id', table_name='orders')
+    op.drop_index('ix_review_products_id_created_at', table_name='review')
+    op.drop_index('ix_review_rating_id', table_name='review')
+    op.drop_index('ix_review_user_id_id', table_name='review')
+    op.drop_index('ix_chat_massage_user_id_sent_at', table_name='chat_massage')
+    op.drop_index('ix_favorite_user_id_added_at', table_name='favorite')
+    op.drop_index('ix_cart_items_cart_id', table_name='cart_items')
+    op.drop_index('ix_carts_user_id', table_name='carts')
+    op.drop_index('ix_author_listing_user_id_id', table_name='author_listing')
+    op.drop_index('ix_author_listing_topics_games_id', table_name='author_listing')
+    op.drop_index('ix_author_listing_status_id', table_name='author_listing')
+    op.drop_index('ix_listing_user_id_id', table_name='listing')
+    op.drop_index('ix_listing_game_topic_id', table_name='listing')
+    op.drop_index('ix_listing_status_id', table_name='listing')
+    op.drop_index('ix_products_active_id', table_name='products')
+    op.drop_index('ix_products_category_id', table_name='products')
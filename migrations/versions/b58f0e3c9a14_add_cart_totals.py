@@ -0,0 +1,41 @@
+"""Add denormalized carts.total and carts.item_count
+
+Revision ID: b58f0e3c9a14
+Revises: 7c2e5b9d41a0
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58f0e3c9a14'
+down_revision: Union[str, None] = '7c2e5b9d41a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('carts', sa.Column('total', sa.Float(), server_default='0', nullable=False))
+    op.add_column('carts', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Заполняем итоги для уже существующих корзин
+    op.execute("""
+        UPDATE carts SET
+            total = (
+                SELECT COALESCE(ROUND(SUM(cart_items.price * cart_items.quantity), 2), 0)
+                FROM cart_items WHERE cart_items.cart_id = carts.id
+            ),
+            item_count = (
+                SELECT COUNT(*) FROM cart_items WHERE cart_items.cart_id = carts.id
+            )
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('carts') as batch_op:
+        batch_op.drop_column('item_count')
+        batch_op.drop_column('total')
@@ -0,0 +1,49 @@
+"""Make carts.user_id unique
+
+Revision ID: d4a7c1e8f203
+Revises: b58f0e3c9a14
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c1e8f203'
+down_revision: Union[str, None] = 'b58f0e3c9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Дубликаты от параллельных первых запросов: элементы переносим в самую
+    # раннюю корзину пользователя, остальные корзины удаляем
+    op.execute("""
+        UPDATE cart_items SET cart_id = (
+            SELECT MIN(keeper.id) FROM carts AS keeper
+            WHERE keeper.user_id = (SELECT user_id FROM carts WHERE carts.id = cart_items.cart_id)
+        )
+        WHERE cart_id NOT IN (SELECT MIN(id) FROM carts GROUP BY user_id)
+    """)
+    op.execute("DELETE FROM carts WHERE id NOT IN (SELECT MIN(id) FROM carts GROUP BY user_id)")
+    op.execute("""
+        UPDATE carts SET
+            total = (
+                SELECT COALESCE(ROUND(SUM(cart_items.price * cart_items.quantity), 2), 0)
+                FROM cart_items WHERE cart_items.cart_id = carts.id
+            ),
+            item_count = (
+                SELECT COUNT(*) FROM cart_items WHERE cart_items.cart_id = carts.id
+            )
+    """)
+
+    op.drop_index('ix_carts_user_id', table_name='carts')
+    op.create_index('ix_carts_user_id', 'carts', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_carts_user_id', table_name='carts')
+    op.create_index('ix_carts_user_id', 'carts', ['user_id'])
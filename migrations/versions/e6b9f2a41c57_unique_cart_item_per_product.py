@@ -0,0 +1,64 @@
+"""One cart_items row per product in a cart
+
+Revision ID: e6b9f2a41c57
+Revises: d4a7c1e8f203
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b9f2a41c57'
+down_revision: Union[str, None] = 'd4a7c1e8f203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_COLUMNS = ('product_id', 'listing_id', 'author_listing_id')
+
+
+def upgrade() -> None:
+    # Дубликаты от гонки read-modify-write: количество складываем в самую
+    # раннюю строку товара в корзине, остальные строки удаляем
+    for column in ITEM_COLUMNS:
+        op.execute(f"""
+            UPDATE cart_items SET quantity = (
+                SELECT SUM(same.quantity) FROM cart_items AS same
+                WHERE same.cart_id = cart_items.cart_id AND same.{column} = cart_items.{column}
+            )
+            WHERE {column} IS NOT NULL AND id IN (
+                SELECT MIN(id) FROM cart_items WHERE {column} IS NOT NULL GROUP BY cart_id, {column}
+            )
+        """)
+        op.execute(f"""
+            DELETE FROM cart_items
+            WHERE {column} IS NOT NULL AND id NOT IN (
+                SELECT MIN(id) FROM cart_items WHERE {column} IS NOT NULL GROUP BY cart_id, {column}
+            )
+        """)
+    op.execute("""
+        UPDATE carts SET
+            total = (
+                SELECT COALESCE(ROUND(SUM(cart_items.price * cart_items.quantity), 2), 0)
+                FROM cart_items WHERE cart_items.cart_id = carts.id
+            ),
+            item_count = (
+                SELECT COUNT(*) FROM cart_items WHERE cart_items.cart_id = carts.id
+            )
+    """)
+
+    for column in ITEM_COLUMNS:
+        op.create_index(
+            f'ux_cart_items_cart_{column[:-3]}', 'cart_items', ['cart_id', column],
+            unique=True,
+            sqlite_where=sa.text(f'{column} IS NOT NULL'),
+            postgresql_where=sa.text(f'{column} IS NOT NULL')
+        )
+
+
+def downgrade() -> None:
+    for column in ITEM_COLUMNS:
+        op.drop_index(f'ux_cart_items_cart_{column[:-3]}', table_name='cart_items')
@@ -0,0 +1,36 @@
+"""Add user_favorite_counts
+
+Revision ID: f1c3a8d52e90
+Revises: e6b9f2a41c57
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3a8d52e90'
+down_revision: Union[str, None] = 'e6b9f2a41c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_favorite_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("""
+        INSERT INTO user_favorite_counts (user_id, count)
+        SELECT user_id, COUNT(*) FROM favorite GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_favorite_counts')
@@ -0,0 +1,51 @@
+"""
+Общие настройки тестов. Движок в app.database.database создаётся при импорте модуля
+из DATABASE_URL, поэтому временная SQLite-база подставляется до импорта приложения -
+тесты не трогают test.db.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_fd, DB_PATH = tempfile.mkstemp(suffix=".db")
+os.close(_fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    from app.database.database import engine
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+
+
+@pytest.fixture
+def database():
+    """Пустая база с ролями user (id 1) и admin (id 2)"""
+    import main  # noqa: F401 - регистрирует все модели в Base.metadata
+    from app.database.database import SessionLocal, create_tables, drop_tables
+    from app.models.roles import RoleModel
+    from app.services.cart_service import user_cart_ids
+
+    drop_tables()
+    create_tables()
+    # user_id -> cart_id из прошлого теста указывал бы на корзину удалённой базы
+    user_cart_ids.clear()
+    with SessionLocal() as db:
+        db.add_all([RoleModel(id=1, name="user"), RoleModel(id=2, name="admin")])
+        db.commit()
+
+
+@pytest.fixture
+def client(database):
+    """TestClient приложения с выполненным lifespan; ошибки сервера приходят ответом 500"""
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+
+    with TestClient(app_main.app, raise_server_exceptions=False) as client:
+        yield client
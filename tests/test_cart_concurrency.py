@@ -0,0 +1,131 @@
+"""
+Конкурентные запросы к одной корзине: все потоки работают с корзиной одного пользователя.
+POST не теряет добавлений и не создаёт дубликатов строк, а после PUT, DELETE и POST
+вперемешку денормализованные carts.total/item_count совпадают с SUM/COUNT по cart_items.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database.database import SessionLocal
+from app.models.cart_items import CartItemModel
+from app.models.carts import CartModel
+from app.models.products import ProductModel
+from app.models.users import UserModel
+from app.utils.tokens import create_access_token
+
+THREADS = 16
+REQUESTS_PER_THREAD = 25
+PRODUCTS = 3
+PRICE = 2.5
+
+
+@pytest.fixture
+def headers(client) -> dict:
+    """Пользователь с id 1 и PRODUCTS товаров; заголовок с его токеном доступа"""
+    with SessionLocal() as db:
+        db.add(UserModel(id=1, name="stress", email="stress@example.com", hashed_password="x", role_id=1))
+        db.add_all(ProductModel(title=f"p{i}", price=PRICE, category="games") for i in range(PRODUCTS))
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token(1, 1, 'user')}"}
+
+
+def run(action) -> list:
+    """action(thread, i) -> код ответа; REQUESTS_PER_THREAD запросов в каждом из THREADS потоков"""
+    def hammer(thread: int) -> list:
+        return [action(thread, i) for i in range(REQUESTS_PER_THREAD)]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return [status for result in pool.map(hammer, range(THREADS)) for status in result]
+
+
+def add(client, headers: dict, thread: int, i: int) -> int:
+    return client.post("/carts/my/items", headers=headers, json={
+        "item_type": "product",
+        "product_id": (thread + i) % PRODUCTS + 1,
+        "quantity": 1,
+        "price": PRICE
+    }).status_code
+
+
+def item_ids() -> list:
+    with SessionLocal() as db:
+        return list(db.scalars(select(CartItemModel.id).order_by(CartItemModel.id)).all())
+
+
+def assert_cart_totals() -> None:
+    with SessionLocal() as db:
+        total, rows = db.execute(
+            select(
+                func.coalesce(func.sum(CartItemModel.price * CartItemModel.quantity), 0),
+                func.count(CartItemModel.id)
+            )
+        ).one()
+        carts = db.scalars(select(CartModel)).all()
+
+    assert len(carts) == 1, f"корзин у пользователя: {len(carts)}, ожидалась 1"
+    cart = carts[0]
+    assert (cart.item_count, round(cart.total, 2)) == (rows, round(total, 2)), \
+        f"итоги корзины total={cart.total}, item_count={cart.item_count}, по cart_items total={total}, строк {rows}"
+
+
+def fill_cart(client, headers: dict) -> None:
+    """По одной позиции каждого товара"""
+    for product in range(PRODUCTS):
+        assert add(client, headers, product, 0) == 200
+
+
+def test_concurrent_add_keeps_every_item(client, headers):
+    statuses = run(lambda thread, i: add(client, headers, thread, i))
+
+    assert [status for status in statuses if status != 200] == []
+    with SessionLocal() as db:
+        rows, quantity = db.execute(
+            select(func.count(CartItemModel.id), func.coalesce(func.sum(CartItemModel.quantity), 0))
+        ).one()
+    assert rows == PRODUCTS
+    assert quantity == len(statuses)
+    assert_cart_totals()
+
+
+def test_concurrent_update_keeps_totals(client, headers):
+    fill_cart(client, headers)
+    ids = item_ids()
+
+    def put(thread: int, i: int) -> int:
+        return client.put(
+            f"/carts/my/items/{ids[(thread + i) % len(ids)]}", headers=headers,
+            json={"quantity": (thread * 7 + i) % 5 + 1}
+        ).status_code
+
+    statuses = run(put)
+
+    # 409 - позиция не далась за CART_ITEM_UPDATE_ATTEMPTS попыток, клиент повторит запрос
+    assert set(statuses) <= {200, 409}
+    assert_cart_totals()
+
+
+def test_concurrent_update_delete_add_keeps_totals(client, headers):
+    fill_cart(client, headers)
+
+    # Удалённую позицию параллельные PUT/DELETE видят как 404 - это ожидаемо
+    def churn(thread: int, i: int) -> int:
+        action = (thread + i) % 3
+        if action == 0:
+            return add(client, headers, thread, i)
+        current = item_ids()
+        if not current:
+            return add(client, headers, thread, i)
+        item_id = current[(thread * 7 + i) % len(current)]
+        if action == 1:
+            return client.put(
+                f"/carts/my/items/{item_id}", headers=headers, json={"quantity": i % 4 + 1}
+            ).status_code
+        return client.delete(f"/carts/my/items/{item_id}", headers=headers).status_code
+
+    statuses = run(churn)
+
+    assert set(statuses) <= {200, 404, 409}
+    assert_cart_totals()
@@ -0,0 +1,182 @@
+"""
+Проверка индексов: каждый запрос с фильтром из app/repositories/* должен идти по индексу.
+Запросы выполняются настоящими методами репозиториев на пустой временной SQLite-базе,
+перехваченный SQL прогоняется через EXPLAIN QUERY PLAN. Ошибка, если в плане есть
+полный проход таблицы ("SCAN <table>" без индекса) или сортировка во временном B-дереве.
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.models.users import UserModel
+from app.models.roles import RoleModel
+from app.models.products import ProductModel
+from app.models.favorite import FavoriteModel
+from app.models.chat_massage import ChatMessageModel
+from app.models.review import ReviewModel
+from app.models.orders import OrderModel
+from app.models.order_items import OrderItemModel
+from app.models.carts import CartModel
+from app.models.cart_items import CartItemModel
+from app.models.author_listing import AuthorListingModel
+from app.models.listing import ListingModel
+from app.repositories.author_listing_repository import AuthorListingRepository
+from app.repositories.cart_item_repository import CartItemRepository, SyncCartItemRepository
+from app.repositories.cart_repository import CartRepository
+from app.repositories.chat_archive_repository import ChatArchiveRepository
+from app.repositories.chat_message_repository import ChatMessageRepository
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.listing_repository import ListingRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.rating_summary_repository import RatingSummaryRepository
+from app.repositories.review_repository import ReviewRepository
+from app.repositories.user_repository import AsyncUserRepository
+from app.utils.pagination import encode_cursor
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+SYNC_CASES: List[Tuple[str, Callable[[Session], object]]] = [
+    ("products.get_by_category", lambda db: ProductRepository(db).get_by_category("games")),
+    ("products.filter_page(is_active)", lambda db: ProductRepository(db).filter_page(0, 20, is_active=True)),
+    ("products.count(is_active)", lambda db: ProductRepository(db).count(is_active=True)),
+    ("products.get_page(is_active)", lambda db: ProductRepository(db).get_page("", 20, is_active=True)),
+    ("products.get_page(category)", lambda db: ProductRepository(db).get_page("", 20, category="games")),
+    ("listing.get_by_user", lambda db: ListingRepository(db).get_by_user(1)),
+    ("listing.get_by_game_topic", lambda db: ListingRepository(db).get_by_game_topic("rpg")),
+    ("listing.filter_page(status)", lambda db: ListingRepository(db).filter_page(0, 20, status="active")),
+    ("listing.count(status)", lambda db: ListingRepository(db).count(status="active")),
+    ("author_listing.get_by_user", lambda db: AuthorListingRepository(db).get_by_user(1)),
+    ("author_listing.get_by_topic", lambda db: AuthorListingRepository(db).get_by_topic("rpg")),
+    ("author_listing.filter_page(status)", lambda db: AuthorListingRepository(db).filter_page(0, 20, status="active")),
+    ("favorite.get_by_user", lambda db: FavoriteRepository(db).get_by_user(1)),
+    ("favorite.get_by_user_and_item", lambda db: FavoriteRepository(db).get_by_user_and_item(1, "product", 1)),
+    ("favorite.exists_by", lambda db: FavoriteRepository(db).exists_by(1, products_id=1)),
+    ("favorite.count_by_user", lambda db: FavoriteRepository(db).count_by_user(1)),
+    ("favorite.get_user_count", lambda db: FavoriteRepository(db).get_user_count(1)),
+    ("favorite.get_item_refs", lambda db: FavoriteRepository(db).get_item_refs(1)),
+    ("cart_items.get_in_cart_ids", lambda db: SyncCartItemRepository(db).get_in_cart_ids(1, "listing", [1, 2, 3])),
+    ("favorite.get_page", lambda db: FavoriteRepository(db).get_page("", 20, "added_at", "desc", user_id=1)),
+    ("review.get_by_user", lambda db: ReviewRepository(db).get_by_user(1)),
+    ("review.get_by_product", lambda db: ReviewRepository(db).get_by_product(1)),
+    ("review.get_by_rating", lambda db: ReviewRepository(db).get_by_rating(4, 5)),
+    ("review.get_item_page", lambda db: ReviewRepository(db).get_item_page("products_id", 1)),
+    ("review.get_item_page(cursor)", lambda db: ReviewRepository(db).get_item_page(
+        "listing_id", 1, encode_cursor(datetime(2026, 1, 1), 10))),
+    ("review.get_item_page(verified)", lambda db: ReviewRepository(db).get_item_page("products_id", 1, verified_only=True)),
+    ("review.get_item_page(rating)", lambda db: ReviewRepository(db).get_item_page("author_listing_id", 1, min_rating=4)),
+    ("review.get_item_page(verified,rating)", lambda db: ReviewRepository(db).get_item_page(
+        "products_id", 1, verified_only=True, min_rating=1, max_rating=2)),
+    ("review.get_page(user_id)", lambda db: ReviewRepository(db).get_page("", 20, "id", "desc", user_id=1)),
+    ("review.get_verified(filter_page)", lambda db: ReviewRepository(db).filter_page(0, 20, is_verified=True)),
+    ("rating_summary.get_summary", lambda db: RatingSummaryRepository(db).get_summary("product", 1)),
+    ("chat.get_by_user", lambda db: ChatMessageRepository(db).get_by_user(1)),
+    ("chat.get_conversation", lambda db: ChatMessageRepository(db).get_conversation(1)),
+    ("chat.get_message_key", lambda db: ChatMessageRepository(db).get_message_key(1, 10)),
+    ("chat.get_window(tail)", lambda db: ChatMessageRepository(db).get_window(1, 50)),
+    ("chat.get_window(after)", lambda db: ChatMessageRepository(db).get_window(1, 50, after=(datetime(2026, 1, 1), 10))),
+    ("chat.get_window(before)", lambda db: ChatMessageRepository(db).get_window(1, 50, before=(datetime(2026, 1, 1), 10))),
+    ("chat.get_oldest_user_before", lambda db: ChatMessageRepository(db).get_oldest_user_before(datetime(2026, 1, 1))),
+    ("chat.get_older_than", lambda db: ChatMessageRepository(db).get_older_than(1, datetime(2026, 1, 1), 500)),
+    ("chat_archive.iter_segments", lambda db: list(ChatArchiveRepository(db).iter_segments(1, 100))),
+    ("chat.get_page", lambda db: ChatMessageRepository(db).get_page("", 20, "sent_at", "asc", user_id=1)),
+    ("orders.get_by_user", lambda db: OrderRepository(db).get_by_user(1)),
+    ("orders.get_by_status", lambda db: OrderRepository(db).get_by_status("pending")),
+    ("order_items.get_by_order", lambda db: OrderItemRepository(db).get_by_order(1)),
+]
+
+ASYNC_CASES = [
+    ("carts.get_by_user", lambda db: CartRepository(db).get_by_user(1)),
+    ("cart_items.get_by_cart_id", lambda db: CartItemRepository(db).get_by_cart_id(1)),
+    ("cart_items.get_by_cart_and_item", lambda db: CartItemRepository(db).get_by_cart_and_item(1, "product", 1)),
+    ("users.search_page", lambda db: AsyncUserRepository(db).search_page(encode_cursor(10, 10), 50)),
+    ("users.search_page(email)", lambda db: AsyncUserRepository(db).search_page(None, 50, email_prefix="adm")),
+    ("users.search_page(email,cursor)", lambda db: AsyncUserRepository(db).search_page(
+        encode_cursor("admin@example.com", 1), 50, email_prefix="adm")),
+    ("users.search_page(name,cursor)", lambda db: AsyncUserRepository(db).search_page(
+        encode_cursor("Ivan", 7), 50, name_prefix="Iv")),
+    ("users.search_page(email,name)", lambda db: AsyncUserRepository(db).search_page(None, 50, "adm", "Ad")),
+]
+
+
+def capture(engine, collected: list, current: dict):
+    """Записывает каждый SELECT как (имя текущего случая, SQL, параметры)"""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            collected.append((current["name"], statement, parameters))
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(dbapi_connection, statement: str, parameters) -> List[str]:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def check_plan(plan: List[str]) -> List[str]:
+    problems = []
+    for detail in plan:
+        if FULL_SCAN.match(detail):
+            problems.append(f"full table scan: {detail}")
+        if "USE TEMP B-TREE" in detail:
+            problems.append(f"sort without index: {detail}")
+    return problems
+
+
+def collect(path: str) -> List[Tuple[str, str, object]]:
+    """Выполняет все случаи и возвращает (имя, SQL, параметры) для каждого SELECT"""
+    collected, current = [], {}
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    capture(engine, collected, current)
+    for current["name"], run in SYNC_CASES:
+        with Session(engine) as db:
+            run(db)
+    engine.dispose()
+
+    async def run_async():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        capture(async_engine.sync_engine, collected, current)
+        for current["name"], run in ASYNC_CASES:
+            async with AsyncSession(async_engine) as db:
+                await run(db)
+        await async_engine.dispose()
+
+    asyncio.run(run_async())
+    return collected
+
+
+@pytest.fixture(scope="module")
+def plans(tmp_path_factory) -> Dict[str, List[Tuple[str, List[str]]]]:
+    """Имя случая -> [(SQL, план запроса)] для каждого его SELECT"""
+    path = str(tmp_path_factory.mktemp("index_check") / "index_check.db")
+    result = {}
+    collected = collect(path)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        dbapi_connection = conn.connection.dbapi_connection
+        for name, statement, parameters in collected:
+            result.setdefault(name, []).append((statement, explain(dbapi_connection, statement, parameters)))
+    engine.dispose()
+    return result
+
+
+@pytest.mark.parametrize("name", [name for name, _ in SYNC_CASES + ASYNC_CASES])
+def test_query_uses_index(plans, name):
+    assert plans.get(name), f"{name}: не выполнено ни одного SELECT"
+    for statement, plan in plans[name]:
+        problems = check_plan(plan)
+        assert not problems, f"{name}: {'; '.join(problems)}\n{statement}\n{' | '.join(plan)}"
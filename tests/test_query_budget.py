@@ -0,0 +1,166 @@
+"""
+Бюджет SQL-запросов на эндпоинт: число SELECT не должно расти вместе с размером данных.
+Каждый эндпоинт вызывается на маленьком и большом наборе данных во временной SQLite-базе;
+проверка падает, если SELECT больше бюджета или их число зависит от размера.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.database.database import SessionLocal, async_engine, engine
+from app.models.users import UserModel
+from app.utils.tokens import create_access_token
+
+
+def seed_cart(db, user_id: int, size: int) -> None:
+    """Корзина пользователя из size элементов всех трёх типов"""
+    from app.models.author_listing import AuthorListingModel
+    from app.models.cart_items import CartItemModel
+    from app.models.carts import CartModel
+    from app.models.listing import ListingModel
+    from app.models.products import ProductModel
+
+    cart = CartModel(user_id=user_id)
+    db.add(cart)
+    db.flush()
+    for i in range(size):
+        kind = ("product", "listing", "author_listing")[i % 3]
+        if kind == "product":
+            target = ProductModel(title=f"p{i}", price=10, category="games")
+        elif kind == "listing":
+            target = ListingModel(title=f"l{i}", price=10, game_topic="rpg", user_id=user_id)
+        else:
+            target = AuthorListingModel(title=f"a{i}", prise=10, topics_games="rpg", user_id=user_id)
+        db.add(target)
+        db.flush()
+        db.add(CartItemModel(cart_id=cart.id, item_type=kind, price=10, **{f"{kind}_id": target.id}))
+
+
+def seed_favorites(db, user_id: int, size: int) -> None:
+    """size товаров в избранном пользователя, добавленных через сервис (ведёт счётчик)"""
+    from app.models.products import ProductModel
+    from app.repositories.favorite_repository import FavoriteRepository
+    from app.services.favorite_service import FavoriteService
+
+    service = FavoriteService(FavoriteRepository(db))
+    for i in range(size):
+        product = ProductModel(title=f"f{i}", price=10, category="games")
+        db.add(product)
+        db.flush()
+        service.add_to_favorites(user_id, {"products_id": product.id})
+
+
+def seed_reviews(db, user_id: int, size: int) -> int:
+    """Товар с size отзывами пользователя, созданными через сервис (ведёт rating_summary)"""
+    from app.models.products import ProductModel
+    from app.repositories.rating_summary_repository import RatingSummaryRepository
+    from app.repositories.review_repository import ReviewRepository
+    from app.services.review_service import ReviewService
+
+    service = ReviewService(ReviewRepository(db), RatingSummaryRepository(db))
+    product = ProductModel(title=f"r{user_id}", price=10, category="games")
+    db.add(product)
+    db.flush()
+    for i in range(size):
+        service.create({
+            "user_id": user_id, "products_id": product.id,
+            "rating": i % 5 + 1, "is_verified": i % 2 == 0,
+        })
+    return product.id
+
+
+def seed_chat(db, user_id: int, size: int) -> int:
+    """Диалог из size сообщений; возвращает id первого - опору для after_id"""
+    from app.models.chat_massage import ChatMessageModel
+
+    messages = [
+        ChatMessageModel(user_id=user_id, massage_text=f"m{i}", massage_type="text", is_from_user=i % 2 == 0)
+        for i in range(size)
+    ]
+    db.add_all(messages)
+    db.flush()
+    return messages[0].id
+
+
+def seed_nothing(db, user_id: int, size: int) -> None:
+    return None
+
+
+def seed_users(db, user_id: int, size: int) -> None:
+    from app.models.users import UserModel
+
+    # id вне диапазона пользователей проверки: те создаются с явными id по порядку
+    db.add_all(
+        UserModel(
+            id=100000 + user_id * 1000 + i, name=f"search {user_id} {i}",
+            email=f"search{user_id}.{i}@example.com", hashed_password="x", role_id=1 + i % 2
+        )
+        for i in range(size)
+    )
+
+
+# (эндпоинт, функция наполнения, максимум SELECT); в путь подставляются {user_id}
+# и {item_id} - значение, которое вернула функция наполнения. Запросы идут с токеном
+# доступа пользователя (для /admin - с ролью admin); проверка токена не стоит SELECT
+BUDGETS = [
+    ("/carts/my/items/detailed", seed_cart, 5),
+    ("/carts/my/total", seed_cart, 1),
+    ("/favorites/user/{user_id}/count", seed_favorites, 1),
+    ("/favorites/user/{user_id}/exists", seed_favorites, 1),
+    ("/reviews/product/{item_id}", seed_reviews, 2),
+    ("/reviews/product/{item_id}?verified_only=true&min_rating=4", seed_reviews, 2),
+    ("/reviews/user/{user_id}", seed_reviews, 1),
+    ("/chat/user/{user_id}/conversation?tail=true&limit=20", seed_chat, 1),
+    ("/chat/user/{user_id}/conversation?after_id={item_id}&limit=20", seed_chat, 2),
+    ("/admin/password-hashing/stats", seed_nothing, 0),
+    ("/roles/", seed_nothing, 0),
+    ("/admin/users?limit=1000", seed_users, 1),
+    ("/admin/users?email=search{user_id}.&limit=1000", seed_users, 1),
+    ("/admin/users?name=search&limit=20", seed_users, 1),
+]
+
+SIZES = (3, 60)
+
+
+@pytest.fixture
+def selects():
+    """SQL каждого SELECT, выполненного синхронным и асинхронным движком"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    targets = (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    for target in targets:
+        event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("url, seed, budget", BUDGETS, ids=[url for url, _, _ in BUDGETS])
+def test_select_budget(client, selects, url, seed, budget):
+    counts = []
+    for user_id, size in enumerate(SIZES, start=1):
+        with SessionLocal() as db:
+            db.add(UserModel(
+                id=user_id, name=f"u{user_id}", email=f"u{user_id}@example.com",
+                hashed_password="x", role_id=1
+            ))
+            item_id = seed(db, user_id, size)
+            db.commit()
+
+        role_id, role = (2, "admin") if url.startswith("/admin") else (1, "user")
+        token = create_access_token(user_id, role_id, role)
+        selects.clear()
+        response = client.get(
+            url.format(user_id=user_id, item_id=item_id),
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200, response.text
+        counts.append(len(selects))
+
+    sizes = ", ".join(f"{size} строк: {count}" for size, count in zip(SIZES, counts))
+    assert max(counts) <= budget, f"SELECT ({sizes}), бюджет {budget}"
+    assert len(set(counts)) == 1, f"число SELECT зависит от размера данных ({sizes})"